@@ -1,13 +1,88 @@
 __author__ = "Rishiraj0100"
 __version__ = "2.0.4.5"
-import discord
 
-if not discord.__version__.startswith("2.0"):
-  raise RuntimeError(f"This module requires dpy v2.0 not {discord.__version__}")
+import importlib
 
-from .cog import *
-from .core import *
-from .enums import *
-from .client import *
+# The public names of the submodules, they are imported on first access
+# so the command line tools don't pay for discord.py. Keep in sync with
+# the __all__ of the submodules. typing isn't imported here either
+_lazy_exports = {
+    "cog": ("Cog", "CogMeta"),
+    "core": (
+        "BaseCommand",
+        "blacklist_roles",
+        "cache_response",
+        "check",
+        "blacklist_users",
+        "Choice",
+        "command",
+        "cooldown",
+        "InteractionContext",
+        "InteractionData",
+        "max_concurrency",
+        "MessageCommand",
+        "messagecommand",
+        "middleware",
+        "Option",
+        "ResponseMessage",
+        "single_flight",
+        "SlashCommand",
+        "slashcommand",
+        "slashgroup",
+        "SubCommandGroup",
+        "UserCommand",
+        "usercommand",
+        "whitelist_roles",
+        "whitelist_users"
+    ),
+    "enums": ("OptionType", "PermissionType"),
+    "converters": ("ChoiceConverter", "get_converter", "OptionConverter", "register_converter"),
+    "errors": (
+        "AppCommandError",
+        "CheckFailure",
+        "CommandNotAllowed",
+        "CommandOnCooldown",
+        "CommandSchemaError",
+        "InteractionExpired",
+        "InvalidOptionValue",
+        "MaxConcurrencyReached"
+    ),
+    "client": ("AutoShardedBot", "Bot"),
+    "replay": ("InteractionRecorder", "InteractionReplayer", "read_recording"),
+    "cache": ("ResponseCache", "SingleFlight", "TTLCache"),
+    "followup": ("FollowupQueue", "ResponseBatch"),
+    "cooldowns": ("Cooldown", "MaxConcurrency"),
+    "checks": ("Check",),
+    "pipeline": ("Middleware",),
+    "permissions": ("CommandPermissions",),
+    "sync": ("SyncSummary",),
+    "autocomplete": ("CompletionIndex",),
+    "serialization": ("canonical_bytes",),
+    "validation": ("SchemaViolation", "validate_command", "validate_commands"),
+    "utils": ("ALL_GUILDS", "MISSING", "missing")
+}
 
-from .utils import ALL_GUILDS
+_lazy_names = {
+    name: module for module, names in _lazy_exports.items() for name in names
+}
+
+__all__ = tuple(_lazy_names)
+
+
+def __getattr__(name):
+    if name in _lazy_exports:
+        # appcommands.core and the like, importing sets the attribute
+        return importlib.import_module(f".{name}", __name__)
+
+    try:
+        module = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | set(_lazy_exports))
@@ -3,10 +3,19 @@ import sys,os
 from pathlib import Path
 
 
-import appcommands, discord
-import pkg_resources
-import aiohttp
+import appcommands
 import platform
+import importlib
+
+
+def _distribution_version(name, module):
+    # read from the installed metadata, importing discord.py takes most of the startup
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return importlib.import_module(module).__version__
 
 
 def show_version():
@@ -14,10 +23,9 @@ def show_version():
     entries.append('- Python v{0.major}.{0.minor}.{0.micro}-{0.releaselevel}'.format(sys.version_info))
     version_info = appcommands.__version__
     entries.append('- dpy-appcommands v{0}'.format(version_info))
-    version_info = discord.version_info
-    entries.append('- discord.py v{0.major}.{0.minor}.{0.micro}-{0.releaselevel}'.format(version_info))
+    entries.append('- discord.py v{0}'.format(_distribution_version('discord.py', 'discord')))
 
-    entries.append(f'- aiohttp v{aiohttp.__version__}')
+    entries.append(f'- aiohttp v{_distribution_version("aiohttp", "aiohttp")}')
     uname = platform.uname()
     entries.append('- system info: {0.system} {0.release} {0.version}'.format(uname))
     print('\n'.join(entries))
@@ -308,6 +316,37 @@ def run_appbot(parser,args):
     appbot.install(appbot.export())
     appbot.run(task=args.task)
 
+def check(parser, args):
+    sys.path.insert(0, str(Path.cwd()))
+    module, _, attribute = args.target.partition(':')
+    try:
+        obj = getattr(importlib.import_module(module), attribute or 'bot')
+    except (ImportError, AttributeError) as exc:
+        parser.error(f'could not load {args.target} ({exc})')
+
+    from appcommands.validation import validate_commands
+
+    if isinstance(obj, appcommands.BaseCommand):
+        commands = [obj]
+    elif hasattr(obj, 'to_register'):
+        commands = list(obj.to_register) + [
+            c for c in obj.appcommands.values() if getattr(c, 'parent', None) is None
+        ]
+    else:
+        commands = list(obj)
+
+    violations = validate_commands(commands)
+    for violation in violations:
+        print(violation)
+    if violations:
+        sys.exit(f'{len(violations)} problem(s) in {len(commands)} command(s)')
+    print(f'{len(commands)} command(s) are valid')
+
+def add_check_args(subparser):
+    parser = subparser.add_parser('check', help='checks application commands against the limits of discord')
+    parser.set_defaults(func=check)
+    parser.add_argument('target', help='the bot, a command or a list of commands as module:attribute (default attribute: bot)')
+
 def add_appbot_args(subparser):
     parser = subparser.add_parser('appbot', help='run appbot')
     parser.set_defaults(func=run_appbot)
@@ -324,6 +363,7 @@ def parse_args():
     add_appbot_args(subparser)
     add_newbot_args(subparser)
     add_newcog_args(subparser)
+    add_check_args(subparser)
     return parser, parser.parse_args()
 
 def main():
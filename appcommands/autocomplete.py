@@ -0,0 +1,231 @@
+import time
+import heapq
+import asyncio
+import inspect
+import traceback
+import collections
+
+from .core import Choice, InteractionContext, to_choice
+
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Union
+
+__all__ = (
+    "CompletionIndex",
+)
+
+Candidates = Iterable[Union[str, Choice, tuple, dict]]
+
+# How long the first completion waits for the first refresh, discord
+# gives 3 seconds to respond
+FIRST_REFRESH_TIMEOUT = 1.0
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Indexes(NamedTuple):
+    choices: List[Choice]
+    keys: List[str]   # casefolded names, sorted
+    order: List[int]  # index of the choice of every key
+    trigrams: Dict[str, List[int]]
+
+
+def _build(candidates: Candidates, fuzzy: bool) -> _Indexes:
+    # CPU bound, refreshes run it in an executor
+    choices = [to_choice(c) for c in candidates]
+    names = [c.name.casefold() for c in choices]
+    keyed = sorted(zip(names, range(len(names))))
+
+    trigrams: Dict[str, List[int]] = {}
+    if fuzzy:
+        for i, name in enumerate(names):
+            for trigram in _trigrams(name):
+                trigrams.setdefault(trigram, []).append(i)
+
+    return _Indexes(choices, [k for k, _ in keyed], [i for _, i in keyed], trigrams)
+
+
+class CompletionIndex:
+    """An in-memory completion source for autocomplete options
+
+    Candidates starting with the typed text come first, in
+    alphabetical order, found by a binary search over the sorted
+    names. The rest is filled with the candidates sharing the most
+    trigrams with it, so typos and infixes still match.
+
+    It can be passed to :meth:`appcommands.SlashCommand.autocomplete`
+    as it is.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    candidates: Iterable[Union[:class:`~str`, :class:`appcommands.Choice`]]
+        The initial candidates, ``(name, value)`` tuples are accepted as well
+    refresh: Optional[Callable[[], Union[Iterable, Awaitable[Iterable]]]]
+        Returns a fresh set of candidates, called on the first completion
+        if given, in the default executor of the loop unless it's a
+        coroutine function. The first completion waits for it up to one second and
+        is answered from the initial candidates after that
+    refresh_interval: Optional[:class:`~float`]
+        Seconds after which the candidates are refreshed. Refreshes run in
+        the background and the indexes are built in the default executor
+        of the loop, completions keep using the old ones meanwhile
+    fuzzy: :class:`~bool`
+        Whether to build the trigram index, (default: ``True``)
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        tags = appcommands.CompletionIndex(refresh=fetch_tag_names, refresh_interval=300)
+
+        @bot.slashcommand(name="tag", description="Show a tag")
+        async def tag(ctx, name: str):
+            ...
+
+        tag.autocomplete("name")(tags)
+    """
+    def __init__(
+        self,
+        candidates: Candidates = (),
+        *,
+        refresh: Optional[Callable[[], Union[Candidates, Awaitable[Candidates]]]] = None,
+        refresh_interval: Optional[float] = None,
+        fuzzy: bool = True
+    ) -> None:
+        self.refresh: Optional[Callable[[], Union[Candidates, Awaitable[Candidates]]]] = refresh
+        self.refresh_interval: Optional[float] = refresh_interval
+        self.fuzzy: bool = fuzzy
+        self._refreshed: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._indexes: _Indexes = _build(candidates, fuzzy)
+
+    def update(self, candidates: Candidates) -> None:
+        """Replaces the candidates and rebuilds the indexes, on the
+        calling thread. Use :meth:`update_async` for large sets on a
+        running loop
+
+        Parameters
+        -----------
+        candidates: Iterable[Union[:class:`~str`, :class:`appcommands.Choice`]]
+            The new candidates
+        """
+        self._indexes = _build(candidates, self.fuzzy)
+
+    async def update_async(self, candidates: Candidates) -> None:
+        """|coro|
+
+        Replaces the candidates, the indexes are built in the default
+        executor of the loop and swapped in at once when they are done
+
+        Parameters
+        -----------
+        candidates: Iterable[Union[:class:`~str`, :class:`appcommands.Choice`]]
+            The new candidates
+        """
+        # materialised here, generators of the caller aren't run in the executor
+        candidates = list(candidates)
+        loop = asyncio.get_running_loop()
+        self._indexes = await loop.run_in_executor(None, _build, candidates, self.fuzzy)
+
+    def __len__(self) -> int:
+        return len(self._indexes.choices)
+
+    def __contains__(self, name: Any) -> bool:
+        # by name, case insensitive, like the completions
+        if isinstance(name, Choice):
+            name = name.name
+        key = str(name).casefold()
+        keys = self._indexes.keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def complete(self, text: str, limit: int = 25) -> List[Choice]:
+        """Finds the candidates matching a text
+
+        Parameters
+        -----------
+        text: :class:`~str`
+            What the user typed so far
+        limit: :class:`~int`
+            The maximum number of candidates, (default: ``25``)
+
+        Returns
+        ---------
+        List[:class:`appcommands.Choice`]
+        """
+        text = str(text).casefold()
+        # read once, a refresh may swap them meanwhile
+        choices, keys, order, postings = self._indexes
+
+        found: List[int] = []
+        start = bisect_left(keys, text)
+        for i in range(start, min(start + limit, len(keys))):
+            if not keys[i].startswith(text):
+                break
+            found.append(order[i])
+
+        if text and len(found) < limit and postings:
+            counts: collections.Counter = collections.Counter()
+            for trigram in _trigrams(text):
+                counts.update(postings.get(trigram, ()))
+
+            seen = set(found)
+            for i in heapq.nlargest(limit + len(found), counts, key=counts.__getitem__):
+                if i not in seen:
+                    found.append(i)
+                    if len(found) >= limit:
+                        break
+
+        return [choices[i] for i in found]
+
+    async def refresh_now(self) -> None:
+        """|coro|
+
+        Refreshes the candidates with :attr:`refresh`, it's called in the
+        default executor of the loop unless it's a coroutine function"""
+        if inspect.iscoroutinefunction(self.refresh):
+            candidates = self.refresh()
+        else:
+            candidates = await asyncio.get_running_loop().run_in_executor(None, self.refresh)
+        if inspect.isawaitable(candidates):
+            candidates = await candidates
+        await self.update_async(candidates)
+        self._refreshed = time.monotonic()
+
+    async def _refresh(self) -> None:
+        # in a task, completions go on with the old candidates if it fails
+        try:
+            await self.refresh_now()
+        except Exception:
+            print(f"Failed to refresh the candidates of {self!r}")
+            traceback.print_exc()
+            if self._refreshed is None:
+                # the next completion tries again
+                self._task = None
+
+    async def __call__(self, ctx: InteractionContext, value: str) -> List[Choice]:
+        if self.refresh is not None:
+            if self._refreshed is None:
+                if self._task is None:
+                    self._task = asyncio.create_task(self._refresh())
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._task), FIRST_REFRESH_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+            elif (
+                self.refresh_interval is not None
+                and time.monotonic() - self._refreshed >= self.refresh_interval
+                and (self._task is None or self._task.done())
+            ):
+                self._task = asyncio.create_task(self._refresh())
+
+        return self.complete(value)
+
+    def __repr__(self) -> str:
+        return f"<CompletionIndex candidates={len(self)} fuzzy={self.fuzzy}>"
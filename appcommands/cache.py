@@ -0,0 +1,301 @@
+import time
+import asyncio
+import discord
+
+from .utils import MISSING
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+__all__ = (
+    "ResponseCache",
+    "SingleFlight",
+    "TTLCache"
+)
+
+
+class TTLCache:
+    """A mapping whose entries expire after some time,
+    evicting the least recently used ones when it is full
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    maxsize: :class:`~int`
+        The maximum number of entries, (default: ``1024``)
+    ttl: :class:`~float`
+        Seconds after which an entry expires, (default: ``5``)
+
+    Attributes
+    ------------
+    hits: :class:`~int`
+        The number of lookups which found a live entry
+    misses: :class:`~int`
+        The number of lookups which didn't
+    """
+    __slots__ = ("maxsize", "ttl", "hits", "misses", "_data")
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Gets a live entry, counting a hit or a miss
+
+        Parameters
+        -----------
+        key: Hashable
+            The key of the entry
+        default: Any
+            Returned when there is no live entry, (default: :data:`appcommands.utils.MISSING`)
+        """
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if expires <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Sets an entry
+
+        Parameters
+        -----------
+        key: Hashable
+            The key of the entry
+        value: Any
+            The value of the entry
+        ttl: Optional[:class:`~float`]
+            Overrides :attr:`ttl` for this entry
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    __setitem__ = set
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes an entry and returns its value"""
+        entry: Optional[Tuple[float, Any]] = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Removes every entry"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<TTLCache size={len(self._data)} maxsize={self.maxsize} ttl={self.ttl} hits={self.hits} misses={self.misses}>"
+
+
+# Keywords of a response which can be stored and sent again
+_PAYLOAD_KEYS = frozenset(("content", "embed", "embeds", "ephemeral", "tts", "allowed_mentions", "suppress_embeds"))
+SCOPES = ("global", "guild", "user")
+
+
+def invocation_key(ctx: Any, scope: Optional[str] = None) -> Tuple[Any, ...]:
+    # the command, its option values and who is in scope, from the raw data
+    if scope == "user":
+        scoped = ctx.interaction.user.id
+    elif scope == "guild":
+        scoped = ctx.interaction.guild_id
+    else:
+        scoped = None
+    options = tuple(sorted((o["name"], o.get("value")) for o in ctx.data.raw_options))
+    return (ctx.command.full_name, options, scoped)
+
+
+def _message_keywords(args: tuple, kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if len(args) > 1 or not _PAYLOAD_KEYS.issuperset(kwargs):
+        return None
+    ret = dict(kwargs)
+    if args:
+        ret["content"] = args[0]
+    return ret
+
+
+def response_payload(responses: List[Tuple[str, tuple, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    # the keywords to respond with what an invocation ended up showing,
+    # None if it can't be sent again like with files, views or follow-ups.
+    # A response or a defer can be followed by edits, a defer by the
+    # follow-up which replaces its "thinking..." message
+    if not responses:
+        return None
+
+    kind, args, kwargs = responses[0]
+    if kind == "respond":
+        payload = _message_keywords(args, kwargs)
+    elif kind == "defer" and not args and {"ephemeral", "thinking"}.issuperset(kwargs):
+        payload = {"ephemeral": kwargs.get("ephemeral", False)}
+    else:
+        return None
+
+    deferred = kind == "defer"
+    for kind, args, kwargs in responses[1:]:
+        if payload is None or not (kind == "edit" or (kind == "followup" and deferred)):
+            return None
+        deferred = False
+        changes = _message_keywords(args, kwargs)
+        if changes is None:
+            return None
+        if "embed" in changes or "embeds" in changes:
+            payload.pop("embed", None)
+            payload.pop("embeds", None)
+        payload.update((k, v) for k, v in changes.items() if k != "ephemeral")
+
+    if payload is None or not (payload.get("content") or payload.get("embed") or payload.get("embeds")):
+        return None
+    # copies, the callback may change its embeds later
+    if payload.get("embed") is not None:
+        payload["embed"] = discord.Embed.from_dict(payload["embed"].to_dict())
+    if payload.get("embeds"):
+        payload["embeds"] = [discord.Embed.from_dict(e.to_dict()) for e in payload["embeds"]]
+    return payload
+
+
+class ResponseCache:
+    """Caches the responses of a slash command by its option values,
+    set by :func:`appcommands.cache_response`
+
+    Only responses of text, embeds and their flags made through the
+    context are cached, like with :meth:`InteractionContext.respond` or
+    :meth:`InteractionContext.send` after :meth:`InteractionContext.defer`,
+    including later edits. The callback isn't called when a live one is
+    found.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    ttl: :class:`~float`
+        Seconds for which a response is reused, (default: ``60``)
+    maxsize: :class:`~int`
+        The maximum number of responses, the least recently used are
+        evicted first, (default: ``256``)
+    scope: :class:`~str`
+        ``"global"``, ``"guild"`` or ``"user"``, whether responses are
+        shared by everyone or only in a guild or by a user, (default: ``"global"``)
+    """
+    __slots__ = ("scope", "_cache")
+
+    def __init__(self, *, ttl: float = 60.0, maxsize: int = 256, scope: str = "global") -> None:
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}, not {scope!r}")
+        self.scope: str = scope
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def hits(self) -> int:
+        """:class:`~int`: The number of invocations answered from the cache"""
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """:class:`~int`: The number of invocations which called the callback"""
+        return self._cache.misses
+
+    def get(self, ctx: Any) -> Any:
+        """The cached response of an invocation, or :data:`appcommands.utils.MISSING`"""
+        return self._cache.get(invocation_key(ctx, self.scope))
+
+    def set(self, ctx: Any, payload: Dict[str, Any]) -> None:
+        """Caches the response of an invocation"""
+        self._cache.set(invocation_key(ctx, self.scope), payload)
+
+    def clear(self) -> None:
+        """Removes every response"""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __repr__(self) -> str:
+        return f"<ResponseCache scope={self.scope!r} size={len(self)} hits={self.hits} misses={self.misses}>"
+
+
+class SingleFlight:
+    """Shares one call of the callback of a slash command between the
+    invocations with the same option values while it runs, set by
+    :func:`appcommands.single_flight`
+
+    The first invocation calls the callback, the others wait for it and
+    respond with what it responded, see :class:`ResponseCache` for which
+    responses can be shared. If the first invocation fails, the error is
+    raised in every waiting one. If its response can't be shared, they
+    call the callback themselves.
+
+    A waiting interaction is deferred like the first one when it waits
+    longer than :attr:`defer_after`, as discord needs a response in 3 seconds.
+    If it calls the callback itself after that, the response it sends
+    replaces the deferred one.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    scope: :class:`~str`
+        ``"global"``, ``"guild"`` or ``"user"``, whether invocations are
+        shared by everyone or only in a guild or by a user, (default: ``"global"``)
+
+    Attributes
+    ------------
+    defer_after: :class:`~float`
+        Seconds after which a waiting interaction is deferred
+    shared: :class:`~int`
+        The number of invocations which didn't call the callback
+    """
+    __slots__ = ("scope", "defer_after", "shared", "_flights")
+
+    def __init__(self, *, scope: str = "global") -> None:
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}, not {scope!r}")
+        self.scope: str = scope
+        self.defer_after: float = 2.5
+        self.shared: int = 0
+        # key -> (future of the payload, context of the first invocation)
+        self._flights: Dict[Hashable, Tuple[asyncio.Future, Any]] = {}
+
+    def join(self, ctx: Any) -> Tuple[Hashable, Optional[Tuple[asyncio.Future, Any]]]:
+        """The key of an invocation and the flight running for it, if
+        there is none the invocation starts one and must :meth:`land` it"""
+        key = invocation_key(ctx, self.scope)
+        flight = self._flights.get(key)
+        if flight is None:
+            self._flights[key] = (asyncio.get_running_loop().create_future(), ctx)
+        return key, flight
+
+    def land(self, key: Hashable, payload: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None) -> None:
+        """Ends the flight of a key, giving the waiting invocations the
+        response or the error"""
+        future, _ = self._flights.pop(key)
+        if error is not None:
+            future.set_exception(error)
+            # retrieved by waiters only, it mustn't be logged without them
+            future.exception()
+        else:
+            future.set_result(payload)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __repr__(self) -> str:
+        return f"<SingleFlight scope={self.scope!r} running={len(self)} shared={self.shared}>"
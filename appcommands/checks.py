@@ -0,0 +1,94 @@
+import inspect
+
+from .cache import TTLCache
+from .utils import MISSING
+from .errors import CheckFailure
+
+from discord.ext import commands
+from typing import Any, Callable, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import BaseCommand, InteractionContext
+
+__all__ = (
+    "Check",
+)
+
+class Check:
+    """A predicate of an application command, called with the context
+    before the options are parsed. It returns whether the command can be
+    used and may be a coroutine function.
+
+    With ``cache_ttl`` its result is reused for the same user in the
+    same guild for that many seconds, for predicates which look roles
+    or a database up.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    predicate: Callable[[:class:`appcommands.InteractionContext`], Union[:class:`~bool`, Coroutine]]
+        The predicate
+    cache_ttl: Optional[:class:`~float`]
+        Seconds for which its result is reused, it isn't by default
+    maxsize: :class:`~int`
+        The number of results which are kept, (default: ``4096``)
+
+    Attributes
+    ------------
+    cache: Optional[:class:`appcommands.TTLCache`]
+        The results by user and guild id, if they are cached
+    """
+    __slots__ = ("predicate", "cache")
+
+    def __init__(self, predicate: Callable[..., Any], *, cache_ttl: Optional[float] = None, maxsize: int = 4096) -> None:
+        self.predicate: Callable[..., Any] = predicate
+        self.cache: Optional[TTLCache] = TTLCache(maxsize=maxsize, ttl=cache_ttl) if cache_ttl else None
+
+    async def __call__(self, ctx: 'InteractionContext') -> bool:
+        cache = self.cache
+        if cache is None:
+            result = self.predicate(ctx)
+            if inspect.isawaitable(result):
+                result = await result
+            return bool(result)
+
+        key = (ctx.interaction.user.id, ctx.interaction.guild_id)
+        result = cache.get(key)
+        if result is MISSING:
+            result = self.predicate(ctx)
+            if inspect.isawaitable(result):
+                result = await result
+            result = bool(result)
+            cache.set(key, result)
+        return result
+
+    def __repr__(self) -> str:
+        return f"<Check predicate={self.predicate!r} cache={self.cache!r}>"
+
+
+def compile_checks(bot: Any, cmd: 'BaseCommand') -> Tuple[Check, ...]:
+    # the checks of a command in the order they run: of the bot, of its
+    # cog, of its groups from the outermost one, then its own
+    chain = [Check(c) for c in (*getattr(bot, "_checks", ()), *getattr(bot, "_check_once", ()))]
+    if cmd.cog is not None:
+        cog_check = commands.Cog._get_overridden_method(cmd.cog.cog_check)
+        if cog_check is not None:
+            chain.append(Check(cog_check))
+
+    groups = []
+    parent = getattr(cmd, "parent", None)
+    while parent is not None:
+        groups.append(parent)
+        parent = parent.parent
+    for group in reversed(groups):
+        chain.extend(group.checks)
+    chain.extend(cmd.checks)
+
+    return tuple(chain)
+
+
+async def run_checks(ctx: 'InteractionContext', checks: Tuple[Check, ...]) -> None:
+    for check in checks:
+        if not await check(ctx):
+            raise CheckFailure(check)
@@ -1,14 +1,19 @@
 import sys
 import types
 import discord
-import secrets
 import importlib
 import traceback
 
 from .utils import *
+from .replay import InteractionRecorder
+from .validation import check_commands
+from .sync import PermissionSync, SyncSummary
+from .pipeline import Middleware
 from .core import (
+    _bump as _bump_compiled,
     command as _cmd,
     InteractionContext,
+    InteractionData,
     SubCommandGroup,
     messagecommand as _mcmd,
     usercommand as _ucmd,
@@ -30,12 +35,28 @@ __all__ = (
 )
 
 class ApplicationMixin:
-    """The mixin for appcommands module"""
+    """The mixin for appcommands module
+
+    Without ``command_prefix`` the bot runs in interactions-only mode,
+    :attr:`interactions_only` is set and messages are never parsed for
+    prefix commands. ``intents`` default to :meth:`interactions_intents`
+    and ``max_messages`` to ``None`` then, so no message is cached.
+
+    ``permission_state`` may be the path of a JSON file where the command
+    permissions applied in each guild are kept, so they aren't edited
+    again after a restart, see :meth:`register_commands`.
+    """
     def __init__(self, *args, **kwargs) -> None:
-        oldkwargs = kwargs.copy()
+        permission_state: Optional[str] = kwargs.pop("permission_state", None)
+        prefix = args[0] if args else kwargs.get('command_prefix')
+        self.interactions_only: bool = not prefix
 
-        if not kwargs.get('command_prefix'):
-            kwargs["command_prefix"] = " ".join(secrets.token_urlsafe(5000).split('_'))
+        if self.interactions_only:
+            # only a placeholder, messages never reach get_prefix
+            args = args[1:]
+            kwargs["command_prefix"] = commands.when_mentioned
+            kwargs.setdefault("intents", self.interactions_intents())
+            kwargs.setdefault("max_messages", None)
 
         def _do_nothing(*args, **kwargs) -> None:
             pass
@@ -47,7 +68,7 @@ class ApplicationMixin:
 
         super().__init__(*args, **kwargs)
 
-        if not oldkwargs.get('command_prefix'):
+        if self.interactions_only:
             self.remove_command('help')
             self.__command = self.command
             self.command = None_wrap
@@ -55,6 +76,9 @@ class ApplicationMixin:
             self.remove_command = _do_nothing
 
         self.__connected: bool = False
+        self._permission_sync: PermissionSync = PermissionSync(path=permission_state)
+        self.interaction_recorder: Optional[InteractionRecorder] = None
+        self._app_middleware: Tuple[Middleware, ...] = ()
 
         self.to_register: List[BaseCommand]                                   = []
         self.__appcommands: Dict[int, BaseCommand]                            = {}
@@ -66,6 +90,42 @@ class ApplicationMixin:
         self.add_listener(self.__connectlistener, "on_connect")
         self.add_listener(self.interaction_handler, "on_interaction")
 
+    @staticmethod
+    def interactions_intents() -> discord.Intents:
+        """The intents an interactions-only bot needs, only ``guilds``.
+
+        Interactions are received without any intents and carry their
+        user and options, the guilds are cached for :attr:`InteractionContext.guild`
+        and the like. Messages and members aren't received, which saves the
+        CPU and memory of busy shards. Users and members given as options
+        are built from the interaction instead of being fetched.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        :class:`discord.Intents`
+        """
+        return discord.Intents(guilds=True)
+
+    async def process_commands(self, message: discord.Message, /) -> None:
+        """|coro|
+
+        Processes the prefix commands of a message, does nothing in
+        interactions-only mode
+
+        .. versionchanged:: 2.0
+            Does nothing without ``command_prefix``
+        """
+        if self.interactions_only:
+            return
+        await super().process_commands(message)
+
+    async def on_message(self, message: discord.Message, /) -> None:
+        if self.interactions_only:
+            return
+        await super().on_message(message)
+
     def add_app_command(self, command: BaseCommand, *, on_discord: bool = False) -> Union[None, Awaitable]:
         """Adds a app command,
         usually used when subclassed
@@ -78,7 +138,15 @@ class ApplicationMixin:
             The command which is to be added
         on_discord: :class:`~bool`
             Whether to register all pending commands on discord
-            needs to be awaited when passed ``True`` (default: ``False``)"""
+            needs to be awaited when passed ``True`` (default: ``False``)
+
+        Raises
+        --------
+        :exc:`appcommands.CommandSchemaError`
+            The command would be rejected by discord"""
+        check_commands([command])
+        # compiled now, not on the first invocation
+        command._compile_tree(self)
         self.to_register.append(command)
         if on_discord:
             return self.register_commands()
@@ -105,6 +173,72 @@ class ApplicationMixin:
         if command.id in self.__messagecommands:
             self.__messagecommands.pop(command.id)
 
+    def add_check(self, func: Callable, /, *, call_once: bool = False) -> None:
+        """Adds a global check to the bot, it applies to application
+        commands as well, see :func:`appcommands.check`
+
+        .. versionchanged:: 2.0
+            It applies to application commands
+        """
+        super().add_check(func, call_once=call_once)
+        _bump_compiled()
+
+    def remove_check(self, func: Callable, /, *, call_once: bool = False) -> None:
+        """Removes a global check from the bot
+
+        .. versionchanged:: 2.0
+            It applies to application commands
+        """
+        super().remove_check(func, call_once=call_once)
+        _bump_compiled()
+
+    def add_app_middleware(self, func: Union[Middleware, Callable[..., Any]], /, *, kind: str = "around") -> None:
+        """Adds a middleware to every application command, it runs before
+        the ones of cogs, groups and commands, see :class:`appcommands.Middleware`
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        func: Union[:class:`appcommands.Middleware`, Callable]
+            The middleware or its function
+        kind: :class:`~str`
+            ``before``, ``after`` or ``around``, (default: ``around``)
+        """
+        if not isinstance(func, Middleware):
+            func = Middleware(func, kind=kind)
+        self._app_middleware = (*self._app_middleware, func)
+        _bump_compiled()
+
+    def remove_app_middleware(self, func: Union[Middleware, Callable[..., Any]], /) -> None:
+        """Removes a middleware added with :meth:`add_app_middleware`
+
+        .. versionadded:: 2.0
+        """
+        self._app_middleware = tuple(m for m in self._app_middleware if m is not func and m.func is not func)
+        _bump_compiled()
+
+    def app_middleware(self, *, kind: str = "around") -> Callable[[Callable], Callable]:
+        """A decorator which adds a middleware to every application command,
+        same as :meth:`add_app_middleware`
+
+        .. versionadded:: 2.0
+
+        Example
+        --------
+
+        .. code-block:: python3
+
+            @bot.app_middleware()
+            async def session(ctx, call_next):
+                async with db.session() as ctx.session:
+                    return await call_next(ctx)
+        """
+        def decorator(func: Callable) -> Callable:
+            self.add_app_middleware(func, kind=kind)
+            return func
+        return decorator
+
     def slashcommand(self, cls=MISSING, **kwargs) -> Callable[[Callable], SlashCommand]:
         r"""A decorator which adds a slash command to bot
         same as :meth:`appcommands.slashcommand`
@@ -129,7 +263,7 @@ class ApplicationMixin:
 
         .. code-block:: python3
 
-            @bot.slashcommand(name="Hi", description="Hello!")
+            @bot.slashcommand(name="hi", description="Hello!")
             async def some_func(ctx):
                 await ctx.send("Hello!")
 
@@ -263,20 +397,50 @@ class ApplicationMixin:
         self.add_app_command(sub_command_group)
         return sub_command_group
 
-    async def register_commands(self) -> None:
+    async def register_commands(self, *, permission_concurrency: int = 5) -> SyncSummary:
         r"""|coro|
 
         This function registers app commands
 
         .. versionadded:: 2.0
+
+        .. versionchanged:: 2.0
+            Command permissions are only edited in guilds where they changed
+            since they were last applied. Those of guilds not synced before
+            are fetched first and left alone if they already match, unless
+            they are known from the ``permission_state`` file of the bot.
+            ``guild_permissions_sync_fail`` is dispatched with the guild id
+            and the exception for guilds where editing them failed and
+            ``guild_command_register_fail`` with the guild id and the commands
+            for guilds whose commands could not be sent, their permissions
+            aren't touched then
+
+        Parameters
+        -----------
+        permission_concurrency: :class:`~int`
+            The number of guilds whose permissions are synced at once, (default: ``5``)
+
+        Raises
+        --------
+        :exc:`appcommands.CommandSchemaError`
+            Some commands would be rejected by discord, nothing is sent then
+
+        Returns
+        --------
+        :class:`appcommands.SyncSummary`
+            What was sent
         """
         commands = []
         perms = {}
-        registered_commands = await self.http.get_global_commands(self.user.id)
+        summary = {"guilds": 0, "failed_guilds": [], "permissions_edited": [], "permissions_unchanged": [], "permissions_failed": {}}
         self.to_register.extend([c for c in list(self.appcommands.values()) if ((isinstance(c,(SubCommandGroup,SlashCommand))) and (not bool(c.parent))) or (not isinstance(c,(SubCommandGroup,SlashCommand)))])
+        # Everything is checked before the first request
+        check_commands(self.to_register)
+        registered_commands = await self.http.get_global_commands(self.user.id)
 
         for command in [cmd for cmd in self.to_register if not cmd.guild_ids]:
-            json = command.to_dict()
+            # to_dict is cached, the id is set on a copy
+            json = dict(command.to_dict())
             if len(registered_commands) > 0:
                 matches = [
                     x
@@ -315,41 +479,25 @@ class ApplicationMixin:
             except Exception as e:
                 print(f"Failed to add guild commands for guild {guild_id}")
                 traceback.print_exc()
-                self.dispatch("on_guild_command_register_fail", guild_id, guild_commands[guild_id])
+                summary["failed_guilds"].append(guild_id)
+                # discord.py adds the on_ prefix
+                self.dispatch("guild_command_register_fail", guild_id, guild_commands[guild_id])
             else:
+                summary["guilds"] += 1
                 for i in cmds:
                     cmd = discord.utils.get(self.to_register, name=i["name"], description=i["description"], type=i['type'])
                     setattr(cmd, "id", int(i['id']))
-                    if cmd.__permissions__:
-                        perms[guild_id].append({"id": str(cmd.id), "permissions": cmd.__permissions__})
-
-                    if cmd.type == 1:
-                        self.__slashcommands[int(i.get('id'))] = cmd
-                    elif cmd.type == 2:
-                        self.__usercommands[int(i.get('id'))] = cmd
-                    else:
-                        self.__messagecommands[int(i.get('id'))] = cmd
-
-                    if isinstance(cmd, SubCommandGroup):
-                        self.__subcommands[int(i['id'])] = {}
-                        for subcommand in cmd.subcommands:
-                            if isinstance(subcommand, SubCommandGroup):
-                                for _subcmd in subcommand.subcommands:
-                                    self.__subcommands[int(i['id'])][_subcmd.name] = _subcmd
-                            else:
-                                self.__subcommands[int(i['id'])][subcommand.name] = subcommand
-
-                    self.__appcommands[int(i["id"])] = cmd
-
-        for guild_id, data in perms.items():
-            if not data:
-                continue
+                    if cmd.permissions:
+                        perms[guild_id].append({"id": str(cmd.id), "permissions": cmd.permissions.to_payload()})
 
-            await self.http.bulk_edit_guild_application_command_permissions(
-                self.user.id,
-                guild_id,
-                data
-            )
+                    self._store_app_command(int(i['id']), cmd)
+
+        # the commands, and so their permissions, of these guilds are unknown,
+        # what was applied before is left as it is
+        for guild_id in summary["failed_guilds"]:
+            perms.pop(guild_id, None)
+        self._permission_sync.limit = permission_concurrency
+        await self._permission_sync.sync(self, perms, summary)
 
         cmds = await self.http.bulk_upsert_global_commands(self.user.id, commands)
         for i in cmds:
@@ -360,26 +508,122 @@ class ApplicationMixin:
                 type=i["type"],
             )
             setattr(cmd, "id", int(i['id']))
+            self._store_app_command(int(i['id']), cmd)
+        self.to_register = []
+        return SyncSummary(global_commands=len(cmds), **summary)
 
-            if cmd.type == 1:
-                self.__slashcommands[int(i.get('id'))] = cmd
-            elif cmd.type == 2:
-                self.__usercommands[int(i.get('id'))] = cmd
-            else:
-                self.__messagecommands[int(i.get('id'))] = cmd
+    async def edit_app_command_permissions(self, command: BaseCommand, *, guild_ids: Optional[List[int]] = None) -> List[int]:
+        """|coro|
+
+        Sends the :attr:`~appcommands.BaseCommand.permissions` of a registered
+        guild command after they were changed, without sending the commands
+        again. Guilds where they were already applied are skipped.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        command: :class:`appcommands.BaseCommand`
+            The command
+        guild_ids: Optional[List[:class:`~int`]]
+            The guilds to edit them in, every guild of the command by default
+
+        Returns
+        --------
+        List[:class:`~int`]
+            The guilds where they were edited
+        """
+        payload = command.permissions.to_payload() if command.permissions is not None else []
+        edited = []
+        for guild_id in (guild_ids if guild_ids is not None else command.guild_ids or ()):
+            if await self._permission_sync.edit_command(self, guild_id, command.id, payload):
+                edited.append(guild_id)
+        return edited
+
+    def record_interactions(self, path: str, *, anonymise: bool = False) -> InteractionRecorder:
+        """Starts recording every incoming interaction to a
+        gzip compressed JSONL file, see :class:`appcommands.InteractionRecorder`
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        path: :class:`~str`
+            The file to append the interactions to
+        anonymise: :class:`~bool`
+            Whether to replace ids with stable pseudonyms, (default: ``False``)
 
-            
+        Returns
+        ---------
+        :class:`appcommands.InteractionRecorder`
+            The recorder, also set as :attr:`interaction_recorder`"""
+        if self.interaction_recorder is not None:
+            self.interaction_recorder.close()
+
+        self.interaction_recorder = InteractionRecorder(path, anonymise=anonymise)
+        return self.interaction_recorder
+
+    def startup_report(self) -> Dict[Optional[str], Tuple[int, float]]:
+        """The time spent analysing the callbacks of the slash commands,
+        their signatures and options, per cog
+
+        .. versionadded:: 2.0
+
+        Returns
+        ---------
+        Dict[Optional[:class:`~str`], Tuple[:class:`~int`, :class:`~float`]]
+            The number of commands and seconds, by the name of the cog,
+            ``None`` for commands not in a cog, slowest first"""
+        report: Dict[Optional[str], List[Union[int, float]]] = {}
+        seen = set()
+
+        def visit(cmd: BaseCommand) -> None:
+            if id(cmd) in seen:
+                return
+            seen.add(id(cmd))
             if isinstance(cmd, SubCommandGroup):
-                self.__subcommands[int(i['id'])] = {}
                 for subcommand in cmd.subcommands:
-                    if isinstance(subcommand, SubCommandGroup):
-                        for _subcmd in subcommand.subcommands:
-                            self.__subcommands[int(i['id'])][_subcmd.name] = _subcmd
-                    else:
-                        self.__subcommands[int(i['id'])][subcommand.name] = subcommand
+                    visit(subcommand)
+            elif isinstance(cmd, SlashCommand):
+                cog = cmd.cog.qualified_name if cmd.cog is not None else None
+                entry = report.setdefault(cog, [0, 0.0])
+                entry[0] += 1
+                entry[1] += cmd.analysis_time
+
+        for cmd in self.to_register:
+            visit(cmd)
+        for cmd in self.__appcommands.values():
+            visit(cmd)
+
+        ordered = sorted(report.items(), key=lambda item: item[1][1], reverse=True)
+        return {cog: (count, seconds) for cog, (count, seconds) in ordered}
+
+    async def close(self) -> None:
+        if self.interaction_recorder is not None:
+            self.interaction_recorder.close()
+
+        await super().close()
+
+    def _store_app_command(self, id: int, cmd: BaseCommand) -> None:
+        if cmd.type == 1:
+            self.__slashcommands[id] = cmd
+        elif cmd.type == 2:
+            self.__usercommands[id] = cmd
+        else:
+            self.__messagecommands[id] = cmd
+
+        if isinstance(cmd, SubCommandGroup):
+            self.__subcommands[id] = {}
+            for subcommand in cmd.subcommands:
+                if isinstance(subcommand, SubCommandGroup):
+                    for _subcmd in subcommand.subcommands:
+                        self.__subcommands[id][_subcmd.name] = _subcmd
+                else:
+                    self.__subcommands[id][subcommand.name] = subcommand
 
-            self.__appcommands[int(i["id"])] = cmd
-        self.to_register = []
+        # subcommands may have been added since it was added to the bot
+        cmd._compile_tree(self)
+        self.__appcommands[id] = cmd
 
     async def __connectlistener(self):
         if not self.__connected:
@@ -591,26 +835,90 @@ class ApplicationMixin:
         return InteractionContext(self, interaction)
 
     async def interaction_handler(self, interaction):
-        if interaction.type != InteractionType.application_command:
+        if self.interaction_recorder is not None:
+            self.interaction_recorder.record(interaction)
+
+        if interaction.type not in (InteractionType.application_command, InteractionType.autocomplete):
+            return
+
+        cmd = self._get_interaction_command(interaction)
+        if cmd is None:
             return
 
-        id = int(interaction.data['id'])
-        _data = interaction.data.copy()
         context = self.get_interaction_context(interaction)
-        if id in self.__subcommands:
-            _data = _data['options'][0]
-            while 'options' in _data and _data['type'] == 2:
-                if _data.get('options'):
-                    _data = _data.get('options')[0]
-                else:
-                    break
+        if interaction.type == InteractionType.autocomplete:
+            return await context.autocomplete(cmd)
+
+        try:
+            await context.invoke(cmd)
+        except Exception as error:
+            await self._dispatch_app_command_error(context, error)
+        else:
+            if self._listens_to_app_command_completion():
+                self.dispatch("app_command_completion", context)
+
+    def _listens_to_app_command_completion(self) -> bool:
+        # dispatch looks the event up through an AttributeError when
+        # nothing listens, which it usually doesn't
+        return bool(
+            self.extra_events.get("on_app_command_completion")
+            or self._listeners.get("app_command_completion")
+            or getattr(self, "on_app_command_completion", None)
+        )
+
+    async def _dispatch_app_command_error(self, context: InteractionContext, error: Exception) -> None:
+        cog = context.command.cog
+        handler = getattr(cog, "cog_app_command_error", None)
+        try:
+            if handler is not None and commands.Cog._get_overridden_method(handler) is not None:
+                await handler(context, error)
+        finally:
+            self.dispatch("app_command_error", context, error)
+
+    async def on_app_command_error(self, context: InteractionContext, error: Exception) -> None:
+        """|coro|
+
+        The default handler of errors raised while invoking application
+        commands, it prints the traceback to :data:`sys.stderr` unless
+        another ``on_app_command_error`` listener or a
+        ``cog_app_command_error`` of the cog handles it.
+
+        ``on_app_command_completion(context)`` is dispatched instead when
+        the invocation succeeded. :attr:`InteractionContext.command`,
+        :attr:`~InteractionContext.elapsed`, :attr:`~InteractionContext.resolved_in`
+        and :attr:`~InteractionContext.resolved_by` tell what ran and how long it took.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        context: :class:`appcommands.InteractionContext`
+            The context of the invocation
+        error: :class:`Exception`
+            The error raised
+        """
+        if self.extra_events.get("on_app_command_error"):
+            return
 
-            if (_data['name'] in self.__subcommands[id]):
-                return await context.invoke(self.__subcommands[id][_data['name']])
+        cog = context.command.cog
+        handler = getattr(cog, "cog_app_command_error", None)
+        if handler is not None and commands.Cog._get_overridden_method(handler) is not None:
+            return
 
-        if int(interaction.data['id']) in self.__appcommands:
-            context = self.get_interaction_context(interaction)
-            await context.invoke(self.__appcommands[id])
+        print(f"Ignoring exception in application command {context.command.name}:", file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+
+    def _get_interaction_command(self, interaction) -> Optional[BaseCommand]:
+        cmd = self.__appcommands.get(int(interaction.data['id']))
+        if isinstance(cmd, SubCommandGroup):
+            for name in InteractionData(interaction.data).path[1:]:
+                for subcommand in cmd.subcommands:
+                    if subcommand.name == name:
+                        cmd = subcommand
+                        break
+                else:
+                    return None
+        return cmd
 
 class Bot(ApplicationMixin, commands.Bot):
     """The Bot class.
@@ -625,6 +933,13 @@ class Bot(ApplicationMixin, commands.Bot):
 
         bot = appcommands.Bot(command_prefix="$")
 
+    Attributes
+    ------------
+    interactions_only: :class:`~bool`
+        Whether it was made without ``command_prefix``, messages aren't
+        processed for prefix commands then, see :meth:`interactions_intents`
+
+        .. versionadded:: 2.0
     """
     pass
 
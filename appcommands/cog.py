@@ -155,6 +155,7 @@ class Cog(commands.Cog, metaclass=CogMeta):
                             _subcmd.cog = self
                     else:
                         subcmd.cog = self
+            cmd._compile_tree(bot)
   
             if (
                 isinstance(cmd, SlashCommand)
@@ -195,6 +196,26 @@ class Cog(commands.Cog, metaclass=CogMeta):
         self.__slash_commands__ = tuple(i for i in slashcmds)
         return super()._inject(bot)
         
+    @commands.cog._cog_special_method
+    async def cog_app_command_middleware(self, ctx, call_next):
+        """A special method which runs around the application commands of
+        this cog, an ``around`` :class:`appcommands.Middleware`. It must
+        await ``call_next(ctx)`` to invoke the command.
+
+        .. versionadded:: 2.0
+        """
+        return await call_next(ctx)
+
+    @commands.cog._cog_special_method
+    async def cog_app_command_error(self, ctx, error):
+        """A special method which is called with the context and the
+        error when an application command of this cog raises, before
+        ``on_app_command_error`` is dispatched.
+
+        .. versionadded:: 2.0
+        """
+        pass
+
     def _eject(self, bot):
         for cmd in self.__app_commands__:
             bot.remove_app_command(cmd)
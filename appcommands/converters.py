@@ -0,0 +1,227 @@
+import enum
+import types
+import typing
+import discord
+
+from .enums import OptionType
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+__all__ = (
+    "ChoiceConverter",
+    "get_converter",
+    "OptionConverter",
+    "register_converter"
+)
+
+_UNION_TYPES: Tuple[Any, ...] = (typing.Union,)
+if hasattr(types, "UnionType"):  # 3.10 onwards, int | None
+    _UNION_TYPES += (types.UnionType,)
+
+_NONE_TYPE = type(None)
+# 3.9 onwards
+_ANNOTATED: Any = getattr(typing, "Annotated", None)
+
+
+class OptionConverter(NamedTuple):
+    """How an annotation is turned into an option
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    type: :class:`~appcommands.OptionType`
+        The option type registered for the annotation
+    convert: Optional[Callable[[Any], Any]]
+        Called with the resolved option value before it is passed to
+        the callback, ``None`` passes the value as it is. It raises
+        :exc:`ValueError` for values it rejects
+    choices: Optional[Tuple[Tuple[:class:`~str`, Any], ...]]
+        The ``(name, value)`` choices of the option, if it has fixed ones
+    """
+    type: OptionType
+    convert: Optional[Callable[[Any], Any]] = None
+    choices: Optional[Tuple[Tuple[str, Any], ...]] = None
+
+
+class ChoiceConverter:
+    """Converts the value of an option with choices through a
+    precomputed ``value -> result`` mapping, rejecting any other value
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    mapping: Dict[Any, Any]
+        The accepted values and what they are converted to
+    """
+    __slots__ = ("mapping",)
+
+    def __init__(self, mapping: Dict[Any, Any]) -> None:
+        self.mapping: Dict[Any, Any] = mapping
+
+    def __call__(self, value: Any) -> Any:
+        try:
+            return self.mapping[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not a valid choice") from None
+
+    def __repr__(self) -> str:
+        return f"<ChoiceConverter values={list(self.mapping)!r}>"
+
+
+# annotation -> converter, as registered
+_registry: Dict[Any, OptionConverter] = {}
+# annotation -> converter or None, as resolved, cleared on every registration
+_cache: Dict[Any, Optional[OptionConverter]] = {}
+
+
+def register_converter(annotation: Any, type: OptionType, convert: Optional[Callable[[Any], Any]] = None) -> None:
+    """Registers how an annotation is turned into an option.
+    Subclasses of a registered class use the converter of their
+    nearest registered base, unless they are registered themselves.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    annotation: Any
+        The annotation, usually a class
+    type: :class:`~appcommands.OptionType`
+        The option type to register the annotation as
+    convert: Optional[Callable[[Any], Any]]
+        Called with the resolved option value before it is passed to the
+        callback, (optional)
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        import datetime
+
+        appcommands.register_converter(datetime.date, appcommands.OptionType.STRING, datetime.date.fromisoformat)
+
+        @bot.slashcommand(name="remind", description="Set a reminder")
+        async def remind(ctx, day: datetime.date):
+            ...
+    """
+    _registry[annotation] = OptionConverter(OptionType(type), convert)
+    _cache.clear()
+
+
+def _literal_type(values: Tuple[Any, ...]) -> OptionType:
+    if all(isinstance(v, bool) for v in values):
+        return OptionType.BOOLEAN
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return OptionType.INTEGER
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return OptionType.FLOAT
+    return OptionType.STRING
+
+
+def _resolve(annotation: Any) -> Optional[OptionConverter]:
+    try:
+        return _registry[annotation]
+    except (KeyError, TypeError):
+        pass
+
+    origin = typing.get_origin(annotation)
+    if origin is not None and origin is _ANNOTATED:
+        return get_converter(unwrap_annotated(annotation)[0])
+
+    if origin in _UNION_TYPES:
+        args = tuple(a for a in typing.get_args(annotation) if a is not _NONE_TYPE)
+        if len(args) == 1:
+            return get_converter(args[0])
+
+        found = {c.type for c in map(get_converter, args) if c is not None}
+        if found and found <= {OptionType.USER, OptionType.ROLE, OptionType.MENTIONABLE}:
+            return OptionConverter(OptionType.MENTIONABLE)
+        return None
+
+    if origin is typing.Literal:
+        values = typing.get_args(annotation)
+        return OptionConverter(
+            _literal_type(values),
+            ChoiceConverter({v: v for v in values}),
+            tuple((str(v), v) for v in values)
+        )
+
+    if not isinstance(annotation, type):
+        return None
+
+    if issubclass(annotation, enum.Enum):
+        members = tuple(annotation)
+        return OptionConverter(
+            _literal_type(tuple(m.value for m in members)),
+            ChoiceConverter({m.value: m for m in members}),
+            tuple((m.name, m.value) for m in members)
+        )
+
+    # The nearest registered base wins, so bool is never treated as an int
+    for base in annotation.__mro__[1:]:
+        try:
+            return _registry[base]
+        except KeyError:
+            continue
+    return None
+
+
+def get_converter(annotation: Any) -> Optional[OptionConverter]:
+    """Gets the converter of an annotation, the results are memoized
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    annotation: Any
+        The annotation, like ``int``, ``discord.Member``, ``typing.Optional[str]``,
+        ``typing.Literal["a", "b"]`` or an :class:`enum.Enum`
+
+    Returns
+    ---------
+    Optional[:class:`OptionConverter`]
+        The converter, ``None`` if nothing is registered for the annotation
+    """
+    try:
+        return _cache[annotation]
+    except KeyError:
+        ret = _cache[annotation] = _resolve(annotation)
+        return ret
+    except TypeError:
+        # unhashable annotation
+        return _resolve(annotation)
+
+
+def unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    # Optional[X] and X | None give (X, True), anything else (annotation, False)
+    if typing.get_origin(annotation) in _UNION_TYPES:
+        args = typing.get_args(annotation)
+        if _NONE_TYPE in args:
+            args = tuple(a for a in args if a is not _NONE_TYPE)
+            if len(args) == 1:
+                return args[0], True
+            return typing.Union[args], True
+    return annotation, False
+
+
+def unwrap_annotated(annotation: Any) -> Tuple[Any, Tuple[Any, ...]]:
+    # Annotated[X, a, b] gives (X, (a, b)), anything else (annotation, ())
+    if _ANNOTATED is not None and typing.get_origin(annotation) is _ANNOTATED:
+        return annotation.__origin__, annotation.__metadata__
+    return annotation, ()
+
+
+register_converter(str, OptionType.STRING)
+register_converter(int, OptionType.INTEGER)
+register_converter(bool, OptionType.BOOLEAN)
+register_converter(float, OptionType.FLOAT, float)
+register_converter(discord.abc.User, OptionType.USER)
+register_converter(discord.User, OptionType.USER)
+register_converter(discord.Member, OptionType.USER)
+register_converter(discord.abc.GuildChannel, OptionType.CHANNEL)
+register_converter(discord.Role, OptionType.ROLE)
+register_converter(discord.Object, OptionType.MENTIONABLE)
+register_converter(discord.abc.Snowflake, OptionType.MENTIONABLE)
+register_converter(discord.Attachment, OptionType.ATTACHMENT)
@@ -0,0 +1,194 @@
+import time
+import asyncio
+import discord
+
+from collections import deque
+from discord.ext.commands import BucketType
+from typing import Deque, Dict, Hashable, Optional
+
+__all__ = (
+    "Cooldown",
+    "MaxConcurrency"
+)
+
+_BUCKET_TYPES = (BucketType.default, BucketType.user, BucketType.member, BucketType.guild, BucketType.channel)
+
+
+def bucket_key(type: BucketType, interaction: discord.Interaction) -> Hashable:
+    # from the ids of the interaction, nothing is looked up
+    if type is BucketType.user:
+        return interaction.user.id
+    if type is BucketType.member:
+        return (interaction.guild_id, interaction.user.id)
+    if type is BucketType.guild:
+        # per user in DMs, like discord.ext.commands
+        return interaction.guild_id or interaction.user.id
+    if type is BucketType.channel:
+        return interaction.channel_id
+    return None
+
+
+def _check_type(type: BucketType) -> None:
+    if type not in _BUCKET_TYPES:
+        raise ValueError(f"{type!r} isn't supported for application commands, use default, user, member, guild or channel")
+
+
+class Cooldown:
+    """Limits how often a command can be used, set by :func:`appcommands.cooldown`
+
+    Every bucket is one float, the time at which it's full again, so
+    nothing has to be refilled. Buckets which are full again are dropped
+    when there are more than ``maxsize``, then the least recently used.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    rate: :class:`~int`
+        The number of uses in ``per`` seconds
+    per: :class:`~float`
+        The seconds in which ``rate`` uses are allowed
+    type: :class:`discord.ext.commands.BucketType`
+        Whose uses are counted together, ``default``, ``user``, ``member``,
+        ``guild`` or ``channel``, (default: ``BucketType.default``)
+    maxsize: :class:`~int`
+        The number of buckets which are kept, (default: ``10000``)
+    """
+    __slots__ = ("rate", "per", "type", "maxsize", "_interval", "_tolerance", "_buckets")
+
+    def __init__(self, rate: int, per: float, type: BucketType = BucketType.default, *, maxsize: int = 10000) -> None:
+        _check_type(type)
+        if rate < 1 or per <= 0:
+            raise ValueError("rate must be at least 1 and per larger than 0")
+        self.rate: int = rate
+        self.per: float = per
+        self.type: BucketType = type
+        self.maxsize: int = maxsize
+        self._interval: float = per / rate
+        self._tolerance: float = per - self._interval
+        # key -> when the bucket is full again, least recently used first
+        self._buckets: Dict[Hashable, float] = {}
+
+    def update(self, interaction: discord.Interaction) -> Optional[float]:
+        """Uses the bucket of an interaction
+
+        Returns
+        --------
+        Optional[:class:`~float`]
+            Seconds until it can be used again, ``None`` if it was used
+        """
+        key = bucket_key(self.type, interaction)
+        now = time.monotonic()
+        buckets = self._buckets
+        full_at = max(buckets.pop(key, now), now)
+        if full_at - now > self._tolerance:
+            buckets[key] = full_at
+            return full_at - now - self._tolerance
+
+        buckets[key] = full_at + self._interval
+        if len(buckets) > self.maxsize:
+            self._evict(now)
+        return None
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        for key in [key for key, full_at in buckets.items() if full_at <= now]:
+            del buckets[key]
+        # some room, so it isn't done on every use
+        target = self.maxsize * 3 // 4
+        while len(buckets) > target:
+            del buckets[next(iter(buckets))]
+
+    def reset(self) -> None:
+        """Resets every bucket"""
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __repr__(self) -> str:
+        return f"<Cooldown rate={self.rate} per={self.per} type={self.type!r} buckets={len(self)}>"
+
+
+class MaxConcurrency:
+    """Limits how many invocations of a command run at once,
+    set by :func:`appcommands.max_concurrency`
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    number: :class:`~int`
+        The number of invocations which can run at once
+    per: :class:`discord.ext.commands.BucketType`
+        Whose invocations are counted together, ``default``, ``user``,
+        ``member``, ``guild`` or ``channel``, (default: ``BucketType.default``)
+    wait: :class:`~bool`
+        Whether invocations wait for their turn instead of failing
+    """
+    __slots__ = ("number", "per", "wait", "_counts", "_waiters")
+
+    def __init__(self, number: int, per: BucketType = BucketType.default, *, wait: bool = False) -> None:
+        _check_type(per)
+        if number < 1:
+            raise ValueError("number must be at least 1")
+        self.number: int = number
+        self.per: BucketType = per
+        self.wait: bool = wait
+        # only running buckets are kept
+        self._counts: Dict[Hashable, int] = {}
+        self._waiters: Dict[Hashable, Deque[asyncio.Future]] = {}
+
+    def key(self, interaction: discord.Interaction) -> Hashable:
+        """The bucket of an interaction"""
+        return bucket_key(self.per, interaction)
+
+    async def acquire(self, key: Hashable) -> bool:
+        """|coro|
+
+        Starts an invocation in a bucket, waiting for its turn if
+        :attr:`wait` is set. It must be ended with :meth:`release` if it started
+
+        Returns
+        --------
+        :class:`~bool`
+            Whether it started
+        """
+        count = self._counts.get(key, 0)
+        if count < self.number:
+            self._counts[key] = count + 1
+            return True
+        if not self.wait:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the turn was given just before
+                self.release(key)
+            raise
+        return True
+
+    def release(self, key: Hashable) -> None:
+        """Ends an invocation in a bucket, giving its turn to a waiting one"""
+        waiters = self._waiters.get(key)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                if not waiters:
+                    del self._waiters[key]
+                return
+        self._waiters.pop(key, None)
+
+        count = self._counts[key] - 1
+        if count:
+            self._counts[key] = count
+        else:
+            del self._counts[key]
+
+    def __repr__(self) -> str:
+        return f"<MaxConcurrency number={self.number} per={self.per!r} wait={self.wait} running={sum(self._counts.values())}>"
@@ -1,5 +1,7 @@
 import copy
+import time
 import typing
+import weakref
 import discord
 import asyncio
 import inspect
@@ -7,6 +9,13 @@ import functools
 
 from .utils import *
 from .enums import OptionType, PermissionType
+from .cache import ResponseCache, SingleFlight, TTLCache, response_payload
+from .permissions import CommandPermissions
+from .checks import Check, compile_checks, run_checks
+from .pipeline import Middleware, compile_middleware
+from .serialization import CachedSerialization
+from .errors import CommandNotAllowed, CommandOnCooldown, InvalidOptionValue, MaxConcurrencyReached
+from .converters import ChoiceConverter, get_converter, unwrap_annotated, unwrap_optional
 
 from discord import ui, http
 from aiohttp.client import ClientSession
@@ -16,26 +25,39 @@ from typing import (
     Dict,
     List,
     Union,
+    Iterable,
     Optional,
     Callable,
     Coroutine,
+    FrozenSet,
+    Tuple,
     TYPE_CHECKING
 )
 
 if TYPE_CHECKING:
     from .client import Bot, AutoShardedBot
+    from .followup import FollowupQueue, ResponseBatch
+    from discord.ext import commands
+    from .cooldowns import Cooldown, MaxConcurrency
 
 __all__ = (
     "BaseCommand",
     "blacklist_roles",
+    "cache_response",
+    "check",
     "blacklist_users",
     "Choice",
     "command",
+    "cooldown",
     "InteractionContext",
     "InteractionData",
+    "max_concurrency",
     "MessageCommand",
     "messagecommand",
+    "middleware",
     "Option",
+    "ResponseMessage",
+    "single_flight",
     "SlashCommand",
     "slashcommand",
     "slashgroup",
@@ -46,31 +68,110 @@ __all__ = (
     "whitelist_users"
 )
 
+# The most choices an option can be registered with
+MAX_CHOICES = 25
+
 async def get_ctx_kw(ctx, params) -> dict:
     bot, cmd, kwargs = ctx.bot, ctx.command, {}
-    if cmd is not None and len(ctx.data.options) > 0:
-        for k, _ in params.items():
-            for opt in ctx.data.options:    
-                if k == opt.name:
-                    if opt.type == OptionType.USER:
-                        if ctx.guild:
-                            value = ctx.guild.get_member(opt.value) or await ctx.guild.fetch_member(opt.value)
-                        else:
-                            value = bot.get_user(opt.value) or await bot.fetch_user(opt.value)
-                    elif opt.type == OptionType.CHANNEL:
-                        if ctx.guild:
-                            value = ctx.guild.get_channel(opt.value) or await ctx.guild.fetch_channel(opt.value)
-                        else:
-                            value = bot.get_channel(opt.value) or await bot.fetch_channel(opt.value)
-                    elif opt.type == OptionType.ROLE:
-                        value = ctx.guild.get_role(opt.value)
-                    elif opt.type == OptionType.MENTIONABLE:
-                        value = discord.Object(opt.value)
+    options = ctx.data.raw_options
+    if cmd is not None and len(options) > 0:
+        resolved = ctx.data.resolved
+        options = {opt['name']: opt for opt in options}
+        for k in params:
+            opt = options.get(k)
+            if opt is not None:
+                type, raw = opt['type'], opt.get('value')
+                # Rejected before anything is fetched
+                validator = cmd.validators.get(k)
+                if validator is not None and not validator(raw, resolved):
+                    raise InvalidOptionValue(k, raw)
+
+                if type in (OptionType.USER, OptionType.CHANNEL, OptionType.ROLE, OptionType.MENTIONABLE, OptionType.ATTACHMENT):
+                    raw = int(raw)
+
+                if type == OptionType.USER:
+                    # interactions carry the users and members, so bots
+                    # without the members intent don't fetch them
+                    user = resolved.get("users", {}).get(str(raw))
+                    if ctx.guild:
+                        value = ctx.guild.get_member(raw)
+                        member = resolved.get("members", {}).get(str(raw))
+                        if value is None and user is not None and member is not None:
+                            value = discord.Member(data={**member, "user": user}, guild=ctx.guild, state=ctx._state)
+                        elif value is None:
+                            value = await ctx.guild.fetch_member(raw)
+                    else:
+                        value = bot.get_user(raw)
+                        if value is None and user is not None:
+                            value = discord.User(state=ctx._state, data=user)
+                        elif value is None:
+                            value = await bot.fetch_user(raw)
+                elif type == OptionType.CHANNEL:
+                    if ctx.guild:
+                        value = ctx.guild.get_channel(raw) or await ctx.guild.fetch_channel(raw)
                     else:
-                        value = opt.value
-                    kwargs[k] = value
+                        value = bot.get_channel(raw) or await bot.fetch_channel(raw)
+                elif type == OptionType.ROLE:
+                    value = ctx.guild.get_role(raw)
+                elif type == OptionType.MENTIONABLE:
+                    value = discord.Object(raw)
+                elif type == OptionType.ATTACHMENT:
+                    data = resolved["attachments"][str(raw)]
+                    value = discord.Attachment(data=data, state=ctx._state)
+                else:
+                    value = raw
+                if k in cmd.converters and value is not None:
+                    try:
+                        value = cmd.converters[k](value)
+                    except ValueError as e:
+                        raise InvalidOptionValue(k, value) from e
+                kwargs[k] = value
     return kwargs
 
+def compile_validator(option: 'Option') -> Optional[Callable[[Any, dict], bool]]:
+    # Builds the check of the constraints of an option, called with the raw
+    # value and the resolved data, None if the option has no constraints
+    min_value, max_value = option.min_value, option.max_value
+    min_length, max_length = option.min_length, option.max_length
+    channel_types = frozenset(getattr(t, "value", t) for t in option.channel_types or ())
+
+    if channel_types:
+        def validate(value: Any, resolved: dict) -> bool:
+            channel = resolved.get("channels", {}).get(str(value))
+            return channel is None or channel.get("type") in channel_types
+        return validate
+
+    if min_value is None and max_value is None and min_length is None and max_length is None:
+        return None
+
+    def validate(value: Any, resolved: dict) -> bool:
+        if value is None:
+            return True
+        try:
+            if min_value is not None and value < min_value:
+                return False
+            if max_value is not None and value > max_value:
+                return False
+            if min_length is not None and len(value) < min_length:
+                return False
+            if max_length is not None and len(value) > max_length:
+                return False
+        except TypeError:
+            return False
+        return True
+    return validate
+
+
+def to_choice(obj: Any) -> 'Choice':
+    if isinstance(obj, Choice):
+        return obj
+    if isinstance(obj, dict):
+        return Choice(**obj)
+    if isinstance(obj, tuple):
+        return Choice(*obj)
+    return Choice(str(obj))
+
+
 def unwrap_function(function):
     partial = functools.partial
     while True:
@@ -82,11 +183,52 @@ def unwrap_function(function):
             return function
 
 
+# id(globals) -> (globals, {annotation string: evaluated annotation}),
+# the commands of a module mostly repeat the same few annotations
+_annotation_caches: Dict[int, Tuple[dict, dict]] = {}
+# callback -> {(description, is bound): (params, options)}
+_analyses: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _annotation_cache(globalns: dict) -> dict:
+    entry = _annotation_caches.get(id(globalns))
+    if entry is None or entry[0] is not globalns:
+        entry = _annotation_caches[id(globalns)] = (globalns, {})
+    return entry[1]
+
+
+def evaluate_annotation(annotation: Any, globalns: dict, cache: dict) -> Any:
+    try:
+        return cache[annotation]
+    except (KeyError, TypeError):
+        pass
+
+    if isinstance(annotation, str):
+        evaluated = cache[annotation] = evaluate_annotation(eval(annotation, globalns, globalns), globalns, cache)
+        return evaluated
+
+    # discord.py would replace typing.Annotated[X, Y] by Y, the option
+    # constraints are in Y but X is still needed for its converter
+    original = annotation
+    annotation, optional = unwrap_optional(annotation)
+    annotation, metadata = unwrap_annotated(annotation)
+    annotation = discord.utils.evaluate_annotation(annotation, globalns, globalns, cache)
+    if metadata:
+        annotation = typing.Annotated[(annotation,) + metadata]
+    if optional:
+        annotation = Optional[annotation]
+    try:
+        cache[original] = annotation
+    except TypeError:
+        # unhashable
+        pass
+    return annotation
+
+
 def get_signature_parameters(function, globalns) -> dict:
     signature = inspect.signature(function)
     params = {}
-    cache = {}
-    eval_annotation = discord.utils.evaluate_annotation
+    cache = _annotation_cache(globalns)
     for name, parameter in signature.parameters.items():
         annotation = parameter.annotation
         if annotation is parameter.empty:
@@ -96,69 +238,181 @@ def get_signature_parameters(function, globalns) -> dict:
             params[name] = parameter.replace(annotation=type(None))
             continue
 
-        annotation = eval_annotation(annotation, globalns, globalns, cache)
+        annotation = evaluate_annotation(annotation, globalns, cache)
 
         params[name] = parameter.replace(annotation=annotation)
 
     return params
 
 
+def analyse_callback(callback, description: str = "No description.") -> Tuple[dict, List['Option']]:
+    # The parameters and generated options of a callback, computed once
+    # for every command made from it. The options are copies, they are
+    # changed by the commands
+    func = getattr(callback, "__func__", callback)
+    key = (description, func is not callback)
+    try:
+        analyses = _analyses.setdefault(func, {})
+    except TypeError:
+        # not weak referenceable
+        analyses = {}
+
+    try:
+        params, options = analyses[key]
+    except KeyError:
+        try:
+            globalns = unwrap_function(callback).__globals__
+        except AttributeError:
+            globalns = {}
+        params = get_signature_parameters(callback, globalns)
+        options = _generate_options(params, description)
+        analyses[key] = params, options
+
+    return params, [copy.copy(option) for option in options]
+
+
+def unwrap_annotation(annotation: Any) -> Tuple[Any, bool, Tuple[Any, ...]]:
+    # Optional[Annotated[X, Y]] and Annotated[Optional[X], Y] give (X, True, (Y,))
+    annotation, optional = unwrap_optional(annotation)
+    annotation, metadata = unwrap_annotated(annotation)
+    if metadata:
+        annotation, inner_optional = unwrap_optional(annotation)
+        optional = optional or inner_optional
+    return annotation, optional, metadata
+
+
+def get_converters(params: dict, options: List['Option']) -> Dict[str, Callable[[Any], Any]]:
+    converters = {}
+    for name, param in params.items():
+        annotation, _, _ = unwrap_annotation(param.annotation)
+        converter = get_converter(annotation)
+        if converter is not None and converter.convert is not None:
+            converters[name] = converter.convert
+
+    for option in options:
+        # Values of hand written choices are only validated
+        if option.choices and option.name not in converters:
+            converters[option.name] = ChoiceConverter({c.value: c.value for c in option.choices})
+
+    return converters
+
+
+def get_validators(options: List['Option']) -> Dict[str, Callable[[Any, dict], bool]]:
+    validators = {}
+    for option in options:
+        validator = compile_validator(option)
+        if validator is not None:
+            validators[option.name] = validator
+    return validators
+
+
 def generate_options(function, description: str = "No description.") -> List['Option']:
+    return analyse_callback(function, description)[1]
+
+
+def _generate_options(params: dict, description: str) -> List['Option']:
     options = []
-    params = iter(inspect.signature(function).parameters.values())
+    params = iter(params.values())
     if next(params).name in ("self", "cls"):
         # Skip 1. (+ 2.) parameter, self/cls and ctx
         next(params)
 
     for param in params:
-        required = True
-        if isinstance(param.annotation, str):
-            # if from __future__ import annotations, then annotations are strings and should be converted back to types
-            param = param.replace(
-                annotation=eval(param.annotation, function.__globals__))
-
-        if param.default is not inspect._empty:
-            required = False
-        elif getattr(param.annotation, "__origin__", None) is typing.Union:
-            # Make a command argument optional with typing.Optional[type] or typing.Union[type, None]
-            args = getattr(param.annotation, "__args__", None)
-            if args:
-                param = param.replace(annotation=args[0])
-                required = not isinstance(args[-1], type(None))
-
-        if isinstance(param.annotation, Option):
-            kw=param.annotation.to_dict()
-            kw["name"] = param.name
-            options.append(Option.from_dict(kw))
+        # Make a command argument optional with typing.Optional[type] or typing.Union[type, None],
+        # typing.Annotated[type, Option(...)] adds the constraints of the option
+        annotation, optional, metadata = unwrap_annotation(param.annotation)
+        required = param.default is inspect._empty and not optional
+
+        if isinstance(annotation, Option):
+            option = copy.copy(annotation)
+            option.name = param.name
+            options.append(option)
         else:
-            option_type = (OptionType.from_type(param.annotation)
-                           or OptionType.STRING)
+            converter = get_converter(annotation)
+            option_type = converter.type if converter is not None else OptionType.STRING
+            choices = [Choice(n, v) for n, v in converter.choices] if converter is not None and converter.choices else []
             name = param.name
-            options.append(
-                Option(name, description or "No description", option_type,
-                       required))
+            option = Option(name, description or "No description", option_type,
+                            required, choices=choices)
+            for meta in metadata:
+                if isinstance(meta, Option):
+                    option.constrain(meta)
+            options.append(option)
 
     return options
 
-class BaseCommand:
-    __permissions__: list = []
+# attributes set on callbacks by decorators applied before the command
+# is made -> attributes of the command
+_CALLBACK_ATTRIBUTES = (
+    ("__response_cache__", "response_cache"),
+    ("__single_flight__", "single_flight"),
+    ("__app_cooldown__", "cooldown"),
+    ("__app_max_concurrency__", "max_concurrency"),
+    ("__app_checks__", "checks"),
+    ("__app_permissions__", "permissions"),
+    ("__app_middleware__", "middleware")
+)
+
+# Bumped when the checks or middleware of the bot or of any command
+# change, commands compiled before are compiled again when invoked
+_generation = 0
+
+def _bump() -> None:
+    global _generation
+    _generation += 1
+
+class BaseCommand(CachedSerialization):
+    _serialized_fields: FrozenSet[str] = frozenset(("name", "description", "type"))
     all_guilds: bool = False
+    _permissions: Optional[CommandPermissions] = None
+    # permission objects added one by one, compiled when needed
+    _pending_permissions: Optional[List[dict]] = None
+    cooldown: Optional['Cooldown'] = None
+    max_concurrency: Optional['MaxConcurrency'] = None
+    checks: Tuple['Check', ...] = ()
+    # the generation, the checks and the middleware chain, see _compile
+    _compiled: Optional[Tuple[int, Tuple['Check', ...], Optional[Callable]]] = None
+    middleware: Tuple['Middleware', ...] = ()
     def __repr__(self) -> str:
         return "<appcommands.core.{0.__class__.__name__} name={0.name} description={1}>".format(self, self.description)
 
     def __eq__(self, other: Any) -> bool:
         return self.name == other.name and self.description == other.description
 
+    @property
+    def permissions(self) -> Optional[CommandPermissions]:
+        """Optional[:class:`appcommands.CommandPermissions`]: Who can use this command
+
+        .. versionadded:: 2.0"""
+        pending = self._pending_permissions
+        if pending:
+            self._pending_permissions = None
+            added = CommandPermissions.from_payload(pending)
+            self._permissions = (self._permissions or CommandPermissions()).merge(
+                allowed_roles=added.allowed_roles,
+                allowed_users=added.allowed_users,
+                denied_roles=added.denied_roles,
+                denied_users=added.denied_users
+            )
+        return self._permissions
+
+    @permissions.setter
+    def permissions(self, value: Optional[CommandPermissions]) -> None:
+        self._permissions = value
+        self._pending_permissions = None
+
+    @property
+    def __permissions__(self) -> List[dict]:
+        # the permission objects sent to discord
+        return self.permissions.to_payload() if self.permissions is not None else []
+
     def _update_perms(self, data: Union[list, dict, tuple]) -> None:
-        perms = list(perm for perm in self.__permissions__)
+        # takes permission objects of discord
         if isinstance(data, dict):
-            perms.append(data)
-        elif isinstance(data, list):
-            perms.extend(data)
-        elif isinstance(data, tuple):
-            perms.extend(list(i for i in data))
-
-        self.__permissions__ = list(perm for perm in perms)
+            data = (data,)
+        if self._pending_permissions is None:
+            self._pending_permissions = []
+        self._pending_permissions.extend(data)
 
     def create_permission(self, id: int, type: PermissionType, permission: bool) -> dict:
         d = {"id": str(id), "type": int(type), "permission": permission}
@@ -168,31 +422,103 @@ class BaseCommand:
     def generate_permissions(
         self,
         *,
-        allowed_roles: List[int] = [],
-        allowed_users: List[int] = [],
-        disallowed_roles: List[int] = [],
-        disallowed_users: List[int] = []
+        allowed_roles: Iterable[int] = (),
+        allowed_users: Iterable[int] = (),
+        disallowed_roles: Iterable[int] = (),
+        disallowed_users: Iterable[int] = ()
     ) -> None:
-        permissions = []
+        """Allows or denies users and roles to use this command,
+        adding to its :class:`appcommands.CommandPermissions`
 
-        if allowed_roles:
-            permissions.extend(
-                [self.create_permission(id, PermissionType.ROLE.value, True) for id in set(allowed_roles)]
-            )
-        if allowed_users:
-            permissions.extend(
-                [self.create_permission(id, PermissionType.USER.value, True) for id in set(allowed_users)]
-            )
-        if disallowed_roles:
-            permissions.extend(
-                [self.create_permission(id, PermissionType.ROLE.value, False) for id in set(disallowed_roles)]
-            )
-        if disallowed_users:
-            permissions.extend(
-                [self.create_permission(id, PermissionType.USER.value, False) for id in set(disallowed_users)]
-            )
+        .. versionchanged:: 2.0
+            The permissions are compiled once and checked before invoking
+        """
+        self.permissions = (self.permissions or CommandPermissions()).merge(
+            allowed_roles=allowed_roles,
+            allowed_users=allowed_users,
+            denied_roles=disallowed_roles,
+            denied_users=disallowed_users
+        )
+
+    def add_check(self, predicate: Union['Check', Callable[..., Any]]) -> None:
+        """Adds a check to this command, see :func:`appcommands.check`
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        predicate: Union[:class:`appcommands.Check`, Callable]
+            The check or its predicate
+        """
+        if not isinstance(predicate, Check):
+            predicate = Check(predicate)
+        self.checks = (*self.checks, predicate)
+        _bump()
+
+    def remove_check(self, predicate: Union['Check', Callable[..., Any]]) -> None:
+        """Removes a check of this command, if it has it
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        predicate: Union[:class:`appcommands.Check`, Callable]
+            The check or its predicate
+        """
+        self.checks = tuple(c for c in self.checks if c is not predicate and c.predicate is not predicate)
+        _bump()
+
+    def add_middleware(self, func: Union['Middleware', Callable[..., Any]], *, kind: str = "around") -> None:
+        """Adds a middleware to this command, see :func:`appcommands.middleware`
+
+        .. versionadded:: 2.0
 
-        self._update_perms(permissions)
+        Parameters
+        -----------
+        func: Union[:class:`appcommands.Middleware`, Callable]
+            The middleware or its function
+        kind: :class:`~str`
+            ``before``, ``after`` or ``around``, (default: ``around``)
+        """
+        if not isinstance(func, Middleware):
+            func = Middleware(func, kind=kind)
+        self.middleware = (*self.middleware, func)
+        _bump()
+
+    def remove_middleware(self, func: Union['Middleware', Callable[..., Any]]) -> None:
+        """Removes a middleware of this command, if it has it
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        func: Union[:class:`appcommands.Middleware`, Callable]
+            The middleware or its function
+        """
+        self.middleware = tuple(m for m in self.middleware if m is not func and m.func is not func)
+        _bump()
+
+    def _compile(self, bot: Union['Bot', 'AutoShardedBot']) -> Tuple[int, Tuple['Check', ...], Optional[Callable]]:
+        # the checks and middleware of the bot, the cog and the groups along
+        # with the own ones, when the command is added to the bot and after
+        # they change
+        self._compiled = compiled = (_generation, compile_checks(bot, self), compile_middleware(bot, self))
+        return compiled
+
+    def _compile_tree(self, bot: Union['Bot', 'AutoShardedBot']) -> None:
+        # the commands which can be invoked, groups aren't
+        subcommands = getattr(self, "subcommands", None)
+        if subcommands is None:
+            self._compile(bot)
+            return
+        for subcommand in subcommands:
+            subcommand._compile_tree(bot)
+
+    def _copy_callback_attributes(self, callback: Callable) -> None:
+        for name, attr in _CALLBACK_ATTRIBUTES:
+            value = getattr(callback, name, None)
+            if value is not None:
+                setattr(self, attr, value)
 
     async def __call__(self, *args, **kwargs):
         if not hasattr(self, callback): raise TypeError(f"'{self.__class__.__name__}' object is not callable")
@@ -200,6 +526,97 @@ class BaseCommand:
         return await self.callback(*args, **kwargs)
 
 
+class ResponseMessage:
+    """The message sent by :meth:`InteractionContext.respond`, it is
+    only fetched from discord when it's needed
+
+    Awaiting it or :meth:`fetch` gives the :class:`discord.InteractionMessage`,
+    :meth:`edit` and :meth:`delete` don't need to fetch it. Once fetched,
+    its attributes can be used on this directly.
+
+    .. versionadded:: 2.0
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        msg = await ctx.respond("Counting...")
+        await msg.edit(content="1, 2, 3")  # no fetch needed
+
+        message = await msg  # fetched here
+        print(message.id)
+    """
+    __slots__ = ("_interaction", "_message", "_context")
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        message: Optional[discord.InteractionMessage] = None,
+        context: Optional['InteractionContext'] = None
+    ) -> None:
+        self._interaction = interaction
+        self._message: Optional[discord.InteractionMessage] = message
+        self._context: Optional[InteractionContext] = context
+
+    @property
+    def message(self) -> Optional[discord.InteractionMessage]:
+        """Optional[:class:`discord.InteractionMessage`]: The message if it was fetched or edited"""
+        return self._message
+
+    async def fetch(self) -> discord.InteractionMessage:
+        """|coro|
+
+        Fetches the message, only once
+
+        Returns
+        --------
+        :class:`discord.InteractionMessage`
+        """
+        if self._message is None:
+            self._message = await self._interaction.original_message()
+        return self._message
+
+    def __await__(self):
+        return self.fetch().__await__()
+
+    async def edit(self, *args, **kwargs) -> discord.InteractionMessage:
+        """|coro|
+
+        Edits the message, takes the same arguments as
+        :meth:`InteractionContext.edit`
+
+        Returns
+        --------
+        :class:`discord.InteractionMessage`
+            The edited message
+        """
+        if self._context is not None:
+            self._context._record("edit", args, kwargs)
+        self._message = await self._interaction.edit_original_message(*args, **kwargs)
+        return self._message
+
+    async def delete(self) -> None:
+        """|coro|
+
+        Deletes the message"""
+        if self._context is not None:
+            self._context._record("delete", (), {})
+        await self._interaction.delete_original_message()
+
+    def __getattr__(self, name: str) -> Any:
+        message = self._message
+        if message is None:
+            raise AttributeError(
+                f"{name!r} needs the message, await the ResponseMessage or "
+                "use ctx.respond(..., fetch=True) to fetch it"
+            )
+        return getattr(message, name)
+
+    def __repr__(self) -> str:
+        return f"<ResponseMessage message={self._message!r}>"
+
+
 class InteractionContext:
     """The ctx param given in CMD callbacks
     
@@ -219,6 +636,26 @@ class InteractionContext:
         The user who fired this cmd 
     token: :class:`~str`
         token of this interaction, (valid for 15 mins)
+    invoked_at: Optional[:class:`~float`]
+        :func:`time.perf_counter` when the command was invoked
+
+        .. versionadded:: 2.0
+    resolved_in: Optional[:class:`~float`]
+        Seconds from then until the callback was called, the permissions,
+        checks, cooldowns, middleware and options resolved. ``None`` if
+        it wasn't called
+
+        .. versionadded:: 2.0
+    resolved_by: Optional[:class:`~str`]
+        How the response was made, ``"callback"``, ``"cache"`` for a
+        :func:`cache_response` hit or ``"single_flight"`` for one shared
+        by :func:`single_flight`
+
+        .. versionadded:: 2.0
+    elapsed: Optional[:class:`~float`]
+        Seconds the invocation took, set once it ended, failed or not
+
+        .. versionadded:: 2.0
     """
     def __init__(self, bot: Union['Bot', 'AutoShardedBot'], interaction) -> None:
         self.bot: Union[Bot, AutoShardedBot] = bot
@@ -231,6 +668,14 @@ class InteractionContext:
         self.application_id: int = interaction.application_id
         self.kwargs: dict = {}
         self.interaction = interaction
+        self._batch: Optional[ResponseBatch] = None
+        # the responses made, while they are recorded for a ResponseCache
+        self._responses: Optional[List[Tuple[str, tuple, dict]]] = None
+        self._deferred_by_flight: bool = False
+        self.invoked_at: Optional[float] = None
+        self.resolved_in: Optional[float] = None
+        self.resolved_by: Optional[str] = None
+        self.elapsed: Optional[float] = None
         self.__invoked = False
 
     async def invoke(self, cmd) -> None:
@@ -250,50 +695,110 @@ class InteractionContext:
 
         self.command = cmd
         self.__invoked = True
+        self.invoked_at = time.perf_counter()
+        try:
+            return await self._invoke_command(cmd)
+        finally:
+            self.elapsed = time.perf_counter() - self.invoked_at
+
+    async def _invoke_command(self, cmd) -> Any:
+        # before anything is parsed, a refused use costs only these
+        user = self.interaction.user
+        parent = cmd
+        while parent is not None:
+            permissions = parent.permissions
+            if permissions is not None and not permissions.allows(user.id, getattr(user, "_roles", ())):
+                raise CommandNotAllowed(permissions)
+            parent = getattr(parent, "parent", None)
+
+        compiled = cmd._compiled
+        if compiled is None or compiled[0] != _generation:
+            compiled = cmd._compile(self.bot)
+        await run_checks(self, compiled[1])
+
+        cooldown = cmd.cooldown
+        if cooldown is not None:
+            retry_after = cooldown.update(self.interaction)
+            if retry_after is not None:
+                raise CommandOnCooldown(cooldown, retry_after)
+
+        chain = compiled[2]
+        limit = cmd.max_concurrency
+        if limit is None:
+            return await (self._invoke(cmd) if chain is None else chain(self))
+
+        key = limit.key(self.interaction)
+        if not await limit.acquire(key):
+            raise MaxConcurrencyReached(limit)
+        try:
+            return await (self._invoke(cmd) if chain is None else chain(self))
+        finally:
+            limit.release(key)
+
+    async def _invoke(self, cmd) -> Any:
         if cmd.type == 1:
-            data = self.interaction.data
-            data['bot'] = self.bot
-            self.data: dict = InteractionData.from_dict(data)
-            params = copy.deepcopy(cmd.params)
-            if cmd.cog and str(list(params.keys())[0]) in ("cls", "self"): # cls/self only
-                params.pop(list(params.keys())[0])
-            self.kwargs[str(list(params.keys())[0])] = self
-            params.pop(str(list(params.keys())[0]))
-            self.kwargs = {**self.kwargs, **(await get_ctx_kw(self, params))}
-            if cmd.cog:
-                cog = self.bot.cogs.get(cmd.cog.qualified_name)
-                if cog:
-                    try:
-                        instance = getattr(cog, cmd.callback.__name__)
-                    except:
-                        return await cmd.__func__(**self.kwargs)
-                    else:
-                        return await instance(**self.kwargs)
-
-            return await cmd.callback(**self.kwargs)
+            self.data: InteractionData = InteractionData(self.interaction.data)
+            cache, flight = cmd.response_cache, cmd.single_flight
+            if cache is None and flight is None:
+                return await self._invoke_slash(cmd)
+
+            if cache is not None:
+                payload = cache.get(self)
+                if payload is not MISSING:
+                    self.resolved_by = "cache"
+                    await self.respond(**payload)
+                    return None
+
+            key = None
+            if flight is not None:
+                key, running = flight.join(self)
+                if running is not None:
+                    payload = await self._wait_flight(flight, *running)
+                    if payload is not None:
+                        flight.shared += 1
+                        self.resolved_by = "single_flight"
+                        await self._send(**payload)
+                        return None
+                    # the response can't be shared, this calls the callback too
+                    key = None
+
+            self._responses = []
+            try:
+                ret = await self._invoke_slash(cmd)
+            except Exception as e:
+                self._responses = None
+                if key is not None:
+                    flight.land(key, error=e)
+                raise
+            except BaseException:
+                self._responses = None
+                if key is not None:
+                    flight.land(key)
+                raise
+
+            responses, self._responses = self._responses, None
+            payload = response_payload(responses)
+            if key is not None:
+                flight.land(key, payload)
+            if cache is not None and payload is not None:
+                cache.set(self, payload)
+            return ret
 
         elif cmd.type == 2:
-            if "members" not in self.interaction.data["resolved"]:
-                _data = self.interaction.data["resolved"]["users"]
-                for i, v in _data.items():
-                    v["id"] = int(i)
-                    user = v
+            # copies, the resolved data is left as it is
+            resolved = self.interaction.data["resolved"]
+            user_id, user = next(iter(resolved["users"].items()))
+            user = {**user, "id": int(user_id)}
+            if "members" not in resolved:
                 target = discord.User(state=self.interaction._state, data=user)
             else:
-                _data = self.interaction.data["resolved"]["members"]
-                for i, v in _data.items():
-                    v["id"] = int(i)
-                    member = v
-                _data = self.interaction.data["resolved"]["users"]
-                for i, v in _data.items():
-                    v["id"] = int(i)
-                    user = v
-                    member["user"] = user
+                member = {**next(iter(resolved["members"].values())), "id": int(user_id), "user": user}
                 target = discord.Member(
                     data=member,
-                    guild=self.interaction._state._get_guild(ctx.interaction.guild_id),
+                    guild=self.interaction._state._get_guild(self.interaction.guild_id),
                     state=self.interaction._state,
                 )
+            self._resolved()
             if cmd.cog:
                 cog = self.bot.cogs.get(cmd.cog.qualified_name)
                 if cog:
@@ -307,16 +812,17 @@ class InteractionContext:
             return await cmd.callback(self, target)
 
         else:
-            _data = self.interaction.data["resolved"]["messages"]
-            for i, v in _data.items():
-                v["id"] = int(i)
-                message = v
+            message_id, message = next(iter(self.interaction.data["resolved"]["messages"].items()))
+            message = {**message, "id": int(message_id)}
             channel = self._state.get_channel(int(message["channel_id"]))
+            if channel is None and int(message["channel_id"]) == self.interaction.channel_id:
+                channel = self.interaction.channel
             if channel is None:
                 u = discord.User(state=self._state, data=message['author'])
                 channel = await u._get_channel()
 
             target = discord.Message(state=self.interaction._state, channel=channel, data=message)
+            self._resolved()
             if cmd.cog:
                 cog = self.bot.cogs.get(cmd.cog.qualified_name)
                 if cog:
@@ -329,6 +835,84 @@ class InteractionContext:
 
             return await cmd.callback(self, target)
 
+    async def _wait_flight(self, flight: SingleFlight, future: asyncio.Future, leader: 'InteractionContext') -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), flight.defer_after)
+        except asyncio.TimeoutError:
+            pass
+
+        # deferred like the first invocation, which is still running
+        responses = leader._responses
+        kwargs = responses[0][2] if responses and responses[0][0] == "defer" else {}
+        await self.interaction.response.defer(**kwargs)
+        self._deferred_by_flight = True
+        return await asyncio.shield(future)
+
+    def _resolved(self) -> None:
+        # the callback is called next
+        self.resolved_by = "callback"
+        self.resolved_in = time.perf_counter() - self.invoked_at
+
+    async def _invoke_slash(self, cmd) -> Any:
+        # only the names, the parameters may be shared with other commands
+        names = tuple(cmd.params)
+        if cmd.cog and names[0] in ("cls", "self"): # cls/self only
+            names = names[1:]
+        self.kwargs[names[0]] = self
+        self.kwargs = {**self.kwargs, **(await get_ctx_kw(self, names[1:]))}
+        self._resolved()
+        if cmd.cog:
+            cog = self.bot.cogs.get(cmd.cog.qualified_name)
+            if cog:
+                try:
+                    instance = getattr(cog, cmd.callback.__name__)
+                except:
+                    return await cmd.__func__(**self.kwargs)
+                else:
+                    return await instance(**self.kwargs)
+
+        return await cmd.callback(**self.kwargs)
+
+
+    async def autocomplete(self, cmd) -> None:
+        """|coro|
+
+        This function responds to autocomplete interactions with the
+        choices of the focused option's handler
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        cmd: :class:`~appcommands.SlashCommand`
+            The command whose option is being completed
+        """
+        if self.__invoked:
+            raise TypeError("This context has already been invoked, you can't invoke it again")
+
+        self.command = cmd
+        self.__invoked = True
+        self.data = InteractionData(self.interaction.data)
+
+        focused = self.data.focused
+        entry = getattr(cmd, 'autocompleters', {}).get(focused['name']) if focused else None
+        if entry is None:
+            return await self.interaction.response.autocomplete([])
+
+        handler, cache = entry
+        value = focused.get('value', '')
+        choices = cache.get(value) if cache is not None else MISSING
+        if choices is MISSING:
+            if cmd.cog is not None and inspect.isfunction(handler):
+                result = await handler(cmd.cog, self, value)
+            else:
+                result = await handler(self, value)
+
+            choices = [to_choice(c) for c in result][:25]
+            if cache is not None:
+                cache[value] = choices
+
+        await self.interaction.response.autocomplete(choices)
 
     @cached_property
     def channel(self) -> Union[discord.abc.GuildChannel, discord.DMChannel, None]:
@@ -360,11 +944,14 @@ class InteractionContext:
 
     author = user
 
-    async def respond(self, *args, **kwargs) -> Coroutine:
+    async def respond(self, *args, fetch: bool = False, **kwargs) -> Union[ResponseMessage, discord.InteractionMessage]:
         """|coro|
 
         Responds to this interaction by sending a message.
 
+        .. versionchanged:: 2.0
+            The message isn't fetched unless ``fetch`` is ``True``
+
         Parameters
         -----------
         content: Optional[:class:`str`]
@@ -383,6 +970,10 @@ class InteractionContext:
             Indicates if the message should only be visible to the user who started the interaction.
             If a view is sent with an ephemeral message and it has no timeout set then the timeout
             is set to 15 minutes.
+        fetch: :class:`bool`
+            Whether to fetch the sent message right away, it costs a request.
+
+            .. versionadded:: 2.0
 
         Raises
         -------
@@ -397,11 +988,22 @@ class InteractionContext:
 
         Returns
         --------
-        :class:`discord.InteractionMessage`
-            The newly sent message.
+        Union[:class:`appcommands.ResponseMessage`, :class:`discord.InteractionMessage`]
+            The newly sent message, fetched only if ``fetch`` is ``True``.
         """
-        await self.interaction.response.send_message(*args, **kwargs)
-        return await self.interaction.original_message()
+        if self._deferred_by_flight:
+            # deferred while it waited for a SingleFlight whose response it
+            # couldn't share, the first follow-up takes the place of the
+            # "thinking..." message
+            self._deferred_by_flight = False
+            await self.followups.send(*args, **kwargs)
+        else:
+            await self.interaction.response.send_message(*args, **kwargs)
+        self._record("respond", args, kwargs)
+        message = ResponseMessage(self.interaction, context=self)
+        if fetch:
+            return await message.fetch()
+        return message
 
     def edit(self, *args, **kwargs):
         """|coro|
@@ -445,18 +1047,64 @@ class InteractionContext:
         :class:`discord.InteractionMessage`
             The newly edited message.
         """
+        self._record("edit", args, kwargs)
         return self.interaction.edit_original_message(*args, **kwargs)
 
+    @cached_property
+    def followups(self) -> 'FollowupQueue':
+        """:class:`appcommands.FollowupQueue`: The queue of the follow-up messages of this interaction
+
+        .. versionadded:: 2.0"""
+        from .followup import FollowupQueue
+        return FollowupQueue(self.interaction)
+
     def send(self, *args, **kwargs):
         """|coro|
 
         If interaction is not responded, then this function responds it,
-        or if it is already responded then it sends a message to current channel
+        or if it is already responded then it sends a follow-up message
+
+        .. versionchanged:: 2.0
+            Follow-ups are sent through the webhook of the interaction with
+            :attr:`followups`, instead of to the channel, which is only used
+            once the token expired
         """
-        if not self.response.is_done():
+        if self._batch is not None:
+            return self._batch.send(*args, **kwargs)
+        return self._send(*args, **kwargs)
+
+    def _send(self, *args, **kwargs):
+        if self._deferred_by_flight or not self.response.is_done():
             return self.respond(*args, **kwargs)
 
-        return self.channel.send(*args, **kwargs)
+        self._record("followup", args, kwargs)
+        return self.followups.send(*args, **kwargs)
+
+    def _record(self, kind: str, args: tuple, kwargs: dict) -> None:
+        if self._responses is not None:
+            self._responses.append((kind, args, kwargs))
+
+    def batch(self, *, interval: Optional[float] = None, edit: bool = False) -> 'ResponseBatch':
+        """Buffers the messages sent with :meth:`send` in an ``async with``
+        block, sending them joined into fewer messages
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        interval: Optional[:class:`~float`]
+            Seconds after which buffered messages are sent, they are only
+            sent when full or at the end of the block by default
+        edit: :class:`~bool`
+            Whether to add to the last sent message by editing it, instead
+            of sending another message
+
+        Returns
+        --------
+        :class:`appcommands.ResponseBatch`
+        """
+        from .followup import ResponseBatch
+        return ResponseBatch(self, interval=interval, edit=edit)
 
     @copy_doc(respond)
     def reply(self, *args, **kwargs):
@@ -483,59 +1131,122 @@ class InteractionContext:
         discord.InteractionResponded
             This interaction has already been responded to before.
         """
+        self._record("defer", args, kwargs)
+        if self._deferred_by_flight:
+            # deferred while it waited for a SingleFlight
+            self._deferred_by_flight = False
+            return asyncio.sleep(0)
         return self.interaction.response.defer(*args, **kwargs)
 
 
     def followup(self, *args, **kwargs) -> Coroutine:
         """:class:`discord.Webhook`: Returns the follow up webhook for follow up interactions."""
+        self._record("followup", args, kwargs)
         return self.interaction.followup(*args, **kwargs)
 
 
 class InteractionData:
-    """The data given for slash commands in `ctx.data`
+    """A read-only view of the data of an application command
+    interaction, given as ``ctx.data``. Nothing is copied, the
+    subcommand path and its options are found in one walk when
+    first needed
+
+    .. versionchanged:: 2.0
+        It is a view over the raw data instead of a parsed copy
 
     Attributes
     ------------
-    type: :class:`~int`
-        Type of the command
-    name: :class:`~str`
-        Name of the command
-    id: :class:`~int`
-        Id of the command
-    options: List[:class:`appcommands.Option`]
-        Options passed in command
+    raw: :class:`~dict`
+        The raw data, it must not be changed
     """
-    def __init__(self, type: int, name: str, id: int, options: Optional[List['Option']] = None) -> None:
-        self.type = type
-        self.name = name
-        self.id = int(id)
-        self.options = options
+    __slots__ = ("raw", "_path", "_options", "_parsed_options")
+
+    def __init__(self, data: dict) -> None:
+        self.raw: dict = data
+        self._path: Optional[Tuple[str, ...]] = None
+        self._options: Optional[List[dict]] = None
+        self._parsed_options: Optional[List['Option']] = None
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'InteractionData':
+        return cls(d)
+
+    def _walk(self) -> None:
+        data = self.raw
+        path = [data['name']]
+        options = data.get('options') or []
+        # subcommand groups hold one subcommand, which holds the options
+        while options and options[0].get('type') in (OptionType.SUB_COMMAND, OptionType.SUB_COMMAND_GROUP):
+            data = options[0]
+            path.append(data['name'])
+            options = data.get('options') or []
+        self._path, self._options = tuple(path), options
+
+    @property
+    def type(self) -> int:
+        """:class:`~int`: Type of the command"""
+        return int(self.raw['type'])
+
+    @property
+    def id(self) -> int:
+        """:class:`~int`: Id of the command"""
+        return int(self.raw['id'])
+
+    @property
+    def path(self) -> Tuple[str, ...]:
+        """Tuple[:class:`~str`, ...]: The names from the command to the invoked subcommand
+
+        .. versionadded:: 2.0"""
+        if self._path is None:
+            self._walk()
+        return self._path
+
+    @property
+    def name(self) -> str:
+        """:class:`~str`: Name of the invoked command or subcommand"""
+        return self.path[-1]
+
+    @property
+    def raw_options(self) -> List[dict]:
+        """List[:class:`~dict`]: The raw options of the invoked command or subcommand
+
+        .. versionadded:: 2.0"""
+        if self._options is None:
+            self._walk()
+        return self._options
+
+    @property
+    def options(self) -> List['Option']:
+        """List[:class:`appcommands.Option`]: Options passed in command"""
+        if self._parsed_options is None:
+            self._parsed_options = [Option.from_dict(o) for o in self.raw_options]
+        return self._parsed_options
+
+    @property
+    def focused(self) -> Optional[dict]:
+        """Optional[:class:`~dict`]: The raw option being completed, in autocomplete interactions
+
+        .. versionadded:: 2.0"""
+        for option in self.raw_options:
+            if option.get('focused'):
+                return option
+        return None
+
+    @property
+    def resolved(self) -> dict:
+        """:class:`~dict`: The raw users, members, roles, channels, messages
+        and attachments given in the options
+
+        .. versionadded:: 2.0"""
+        return self.raw.get('resolved', {})
 
     def __repr__(self) -> str:
-        return f"<InteractionData type={self.type} id={self.id} name={self.name} options={self.options}>"
+        return f"<InteractionData type={self.type} id={self.id} name={self.name} options={self.raw_options}>"
 
     def __str__(self) -> str:
         return self.__repr__()
 
-    @classmethod
-    def from_dict(cls, d: dict) -> 'InteractionData':
-        options = []
-        bot=d.pop('bot')
-        if int(d.get('id')) in bot.subcommands:
-            for i in d.get('options'):
-                if i['type'] == 2:
-                    data = i["options"][0]
-                else:
-                    data = i
-        else:
-            data = d
-        if data.get('options'):
-            for i in data.get('options'):
-                options.append(Option.from_dict(i))
-        
-        return cls(d['type'], data['name'], d['id'], options)
-
-class Choice:
+class Choice(CachedSerialization):
     """Choice for the option value 
     
     Parameters 
@@ -544,18 +1255,20 @@ class Choice:
         name of the choice, (required)
     value: Optional[:class:`~str`]
         value of the choice used for backends, (optional)"""
+    _serialized_fields: FrozenSet[str] = frozenset(("name", "value"))
+
     def __init__(self, name: str, value: Optional[str] = None) -> None:
         self.name = name
-        self.value = value or self.name
+        self.value = value if value is not None else self.name
 
-    def to_dict(self) -> Dict[str, str]:
+    def _to_dict(self, children: Tuple[dict, ...]) -> Dict[str, str]:
         return {"name": self.name, "value": self.value}
 
     def __repr__(self) -> str:
         return "<Choice name={0} value={1.value}>".format(self.name, self)
 
 
-class Option:
+class Option(CachedSerialization):
     """Options for slashcommands
     
     Parameters 
@@ -570,15 +1283,62 @@ class Option:
         whether the option is required
     choices: Optional[List[:class:`appcommands.Choice`]]
         The choices for this option
+    autocomplete: Optional[:class:`~bool`]
+        Whether the choices are given while typing, set by
+        :meth:`appcommands.SlashCommand.autocomplete`. Options with more
+        than 25 choices are always registered as autocomplete ones, their
+        commands complete them from a :class:`appcommands.CompletionIndex`
+    min_value: Optional[Union[:class:`~int`, :class:`~float`]]
+        The smallest value of an integer or number option
+
+        .. versionadded:: 2.0
+    max_value: Optional[Union[:class:`~int`, :class:`~float`]]
+        The largest value of an integer or number option
+
+        .. versionadded:: 2.0
+    min_length: Optional[:class:`~int`]
+        The shortest value of a string option
+
+        .. versionadded:: 2.0
+    max_length: Optional[:class:`~int`]
+        The longest value of a string option
+
+        .. versionadded:: 2.0
+    channel_types: Optional[List[:class:`discord.ChannelType`]]
+        The channel types a channel option accepts
+
+        .. versionadded:: 2.0
+
+    The constraints are enforced by discord and checked again before the
+    command is invoked. They can be added to an annotation with
+    :data:`typing.Annotated`, the name of the option isn't needed then
+
+    .. code-block:: python3
+
+        @bot.slashcommand(name="roll", description="Roll a dice")
+        async def roll(ctx, sides: Annotated[int, appcommands.Option(min_value=2, max_value=100)] = 6):
+            ...
     """
+    _constraints: Tuple[str, ...] = ("min_value", "max_value", "min_length", "max_length", "channel_types")
+    _serialized_fields: FrozenSet[str] = frozenset((
+        "name", "description", "type", "choices", "required", "value", "autocomplete", *_constraints
+    ))
+
     def __init__(
         self,
-        name: str,
+        name: str = None,
         description: Optional[str] = "No description.",
         type: Optional[int] = 3,
         required: Optional[bool] = True,
         value: str = None,
-        choices: Optional[List[Choice]] = []
+        choices: Optional[List[Choice]] = [],
+        autocomplete: Optional[bool] = False,
+        *,
+        min_value: Optional[Union[int, float]] = None,
+        max_value: Optional[Union[int, float]] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+        channel_types: Optional[List[discord.ChannelType]] = None
     ) -> None:
         self.name = name
         self.description = description
@@ -586,16 +1346,46 @@ class Option:
         self.choices = choices
         self.value = value
         self.required = required
-
-    def to_dict(self) -> dict:
+        self.autocomplete = autocomplete
+        self.min_value = min_value
+        self.max_value = max_value
+        self.min_length = min_length
+        self.max_length = max_length
+        self.channel_types = channel_types
+
+    def constrain(self, other: 'Option') -> None:
+        # Takes the constraints, description and autocomplete of an option
+        # given in typing.Annotated
+        for attr in self._constraints:
+            value = getattr(other, attr)
+            if value is not None:
+                setattr(self, attr, value)
+        if other.description != "No description.":
+            self.description = other.description
+        self.autocomplete = self.autocomplete or other.autocomplete
+
+    def _serialized_children(self) -> List[Choice]:
+        return self.choices
+
+    def _to_dict(self, children: Tuple[dict, ...]) -> dict:
         ret = {
             "name": self.name,
             "description": self.description,
             "type": self.type,
-            "choices": list(c.to_dict() for c in self.choices),
+            "choices": list(children),
             "required": self.required,
             "value": self.value
         }
+        for attr in self._constraints[:4]:
+            if getattr(self, attr) is not None:
+                ret[attr] = getattr(self, attr)
+        if self.channel_types:
+            ret["channel_types"] = [getattr(t, "value", t) for t in self.channel_types]
+        if self.autocomplete or len(self.choices) > MAX_CHOICES:
+            # discord doesn't accept choices along with autocomplete,
+            # too many choices are served by autocomplete instead
+            ret["autocomplete"] = True
+            ret["choices"] = []
         return ret
 
     @classmethod
@@ -609,10 +1399,18 @@ class Option:
         if data.get("choices"):
             for choice in data.get('choices'):
                 choices.append(Choice(**choice))
-        return cls(name, description, type, required, value, choices)
+        channel_types = [discord.enums.try_enum(discord.ChannelType, t) for t in data.get("channel_types") or ()]
+        return cls(
+            name, description, type, required, value, choices, bool(data.get("autocomplete")),
+            min_value=data.get("min_value"),
+            max_value=data.get("max_value"),
+            min_length=data.get("min_length"),
+            max_length=data.get("max_length"),
+            channel_types=channel_types or None
+        )
 
     def __repr__(self) -> str:
-        return f"<Option name={self.name} description={self.description} type={self.type} required={self.required} value={self.value} choices={self.choices}>"
+        return f"<Option name={self.name} description={self.description} type={self.type} required={self.required} value={self.value} choices={self.choices} autocomplete={self.autocomplete}>"
 
 class SlashCommand(BaseCommand):
     """SlashCmd wrapper class 
@@ -637,6 +1435,8 @@ class SlashCommand(BaseCommand):
     ValueError 
         Name not given when call not given
     """
+    _serialized_fields: FrozenSet[str] = frozenset(("name", "description", "options", "is_subcommand"))
+
     def __new__(cls, *args, **kwargs) -> 'SlashCommand':
         self = super().__new__(cls)
 
@@ -656,19 +1456,21 @@ class SlashCommand(BaseCommand):
         self.type: int = 1
         self.parent=None
         self.is_subcommand = False
+        self.analysis_time: float = 0.0
+        self.converters: Dict[str, Callable[[Any], Any]] = {}
+        self.validators: Dict[str, Callable[[Any, dict], bool]] = {}
+        self.autocompleters: Dict[str, Tuple[Callable[..., Coroutine], Optional[TTLCache]]] = {}
+        self.response_cache: Optional[ResponseCache] = None
+        self.single_flight: Optional[SingleFlight] = None
         if callback:
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or callback.__name__
-            unwrap = unwrap_function(callback)
-            try:
-                globalns = unwrap.__globals__
-            except:
-                globalns = {}
-
-            self.params = get_signature_parameters(callback, globalns)
-            if not options or options == []:
-                self.options = generate_options(callback, description)
+            self._analyse(callback, description)
+            self.converters = get_converters(self.params, self.options)
+            self.validators = get_validators(self.options)
+            self._spill_choices()
+            self._copy_callback_attributes(callback)
             self.callback = callback
         elif (hasattr(self, 'callback') and ( not (self.callback == MISSING))):
             if not callback:
@@ -676,15 +1478,11 @@ class SlashCommand(BaseCommand):
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or self.__class__.__name__
-            unwrap = unwrap_function(callback)
-            try:
-                globalns = unwrap.__globals__
-            except:
-                globalns = {}
-
-            self.params = get_signature_parameters(callback, globalns)
-            if not options:
-                self.options = generate_options(self.callback, description)
+            self._analyse(callback, description)
+            self.converters = get_converters(self.params, self.options)
+            self.validators = get_validators(self.options)
+            self._spill_choices()
+            self._copy_callback_attributes(callback)
         else:
             if not name:
                 raise ValueError("You must specify name when callback is None")
@@ -693,11 +1491,14 @@ class SlashCommand(BaseCommand):
     def __str__(self) -> str:
         return self.__repr__()
 
-    def to_dict(self) -> dict:
+    def _serialized_children(self) -> List[Option]:
+        return self.options
+
+    def _to_dict(self, children: Tuple[dict, ...]) -> dict:
         ret = {
             "name": self.name,
             "description": self.description,
-            "options": list(d.to_dict() for d in self.options)
+            "options": list(children)
         }
         if self.is_subcommand:
             ret["type"] = OptionType.SUB_COMMAND.value
@@ -706,6 +1507,67 @@ class SlashCommand(BaseCommand):
     def __eq__(self, other: BaseCommand):
         return self.name == other.name and self.description == other.description
 
+    def _analyse(self, callback, description: str) -> None:
+        start = time.perf_counter()
+        self.params, options = analyse_callback(callback, description)
+        if not self.options:
+            self.options = options
+        self.analysis_time = time.perf_counter() - start
+
+    def _spill_choices(self) -> None:
+        from .autocomplete import CompletionIndex
+
+        for option in self.options:
+            if len(option.choices) > MAX_CHOICES and option.name not in self.autocompleters:
+                # the values are still validated by the converter of the choices
+                self.autocomplete(option.name)(CompletionIndex(option.choices))
+
+    def autocomplete(self, name: str, *, cache_ttl: Optional[float] = 5.0) -> Callable[[Callable], Callable]:
+        """A decorator which registers the autocomplete handler of an option,
+        it is called with the context and the typed value and returns up to 25
+        :class:`appcommands.Choice`, strings or ``(name, value)`` tuples.
+        A :class:`appcommands.CompletionIndex` can be used as the handler.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        name: :class:`~str`
+            Name of the option
+        cache_ttl: Optional[:class:`~float`]
+            Seconds for which the choices of a same typed value are reused,
+            ``None`` disables it, (default: ``5``)
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            @bot.slashcommand(name="fruit", description="Pick a fruit")
+            async def fruit(ctx, name: str):
+                await ctx.send(name)
+
+            @fruit.autocomplete("name")
+            async def fruit_name(ctx, value):
+                return [f for f in FRUITS if f.startswith(value)][:25]
+
+        Raises
+        --------
+        ValueError
+            The command has no option with that name
+        """
+        option = discord.utils.get(self.options, name=name)
+        if option is None:
+            raise ValueError(f"Command {self.name!r} has no option named {name!r}")
+
+        def wrap(func: Callable) -> Callable:
+            option.autocomplete = True
+            cache = TTLCache(maxsize=1024, ttl=cache_ttl) if cache_ttl else None
+            self.autocompleters[name] = (func, cache)
+            return func
+
+        return wrap
+
     @missing
     async def callback(self, ctx: InteractionContext) -> Any:
         """This function should be a Coroutine.
@@ -735,6 +1597,8 @@ class SubCommandGroup(BaseCommand):
     guild_ids: Optional[List[:class:`~int`]]
         Guild ids for which cmd is to be added
     """
+    _serialized_fields: FrozenSet[str] = frozenset(("name", "description", "subcommands", "parent"))
+
     def __init__(
         self,
         name: str,
@@ -772,7 +1636,7 @@ class SubCommandGroup(BaseCommand):
 
         .. code-block:: python3
 
-            @group.subcommand(name="Hi", description="Hello!")
+            @group.subcommand(name="hi", description="Hello!")
             async def some_func(ctx):
                 await ctx.send("Hello!")
 
@@ -811,11 +1675,14 @@ class SubCommandGroup(BaseCommand):
         self.subcommands.append(sub_command_group)
         return sub_command_group
 
-    def to_dict(self) -> dict:
+    def _serialized_children(self) -> List[Union[SlashCommand, 'SubCommandGroup']]:
+        return self.subcommands
+
+    def _to_dict(self, children: Tuple[dict, ...]) -> dict:
         ret = {
             "name": self.name,
             "description": self.description,
-            "options": [o.to_dict() for o in self.subcommands]
+            "options": list(children)
         }
         if self.parent is not None:
             ret["type"] = OptionType.SUB_COMMAND_GROUP.value
@@ -865,6 +1732,7 @@ class UserCommand(BaseCommand):
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or callback.__name__
+            self._copy_callback_attributes(callback)
             self.callback = callback
         elif (hasattr(self, 'callback') and ( not (self.callback == MISSING))):
             if not callback:
@@ -872,6 +1740,7 @@ class UserCommand(BaseCommand):
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or self.__class__.__name__
+            self._copy_callback_attributes(callback)
         else:
             if not name:
                 raise ValueError("You must specify name when callback is None")
@@ -888,7 +1757,7 @@ class UserCommand(BaseCommand):
     def __repr__(self) -> str:
         return "<UserCommand name={0.name} guild_ids={0.guild_ids}>".format(self)
 
-    def to_dict(self) -> Dict[str, Union[str, int]]:
+    def _to_dict(self, children: Tuple[dict, ...]) -> Dict[str, Union[str, int]]:
         return {"name": self.name, "description": "", "type": self.type}
 
 class MessageCommand(BaseCommand):
@@ -931,6 +1800,7 @@ class MessageCommand(BaseCommand):
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or callback.__name__
+            self._copy_callback_attributes(callback)
             self.callback = callback
         elif (hasattr(self, 'callback') and ( not (self.callback == MISSING))):
             if not callback:
@@ -938,12 +1808,13 @@ class MessageCommand(BaseCommand):
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
             self.name = name or self.__class__.__name__
+            self._copy_callback_attributes(callback)
         else:
             if not name:
                 raise ValueError("You must specify name when callback is None")
             self.name  = name
 
-    def to_dict(self) -> Dict[str, Union[str, int]]:
+    def _to_dict(self, children: Tuple[dict, ...]) -> Dict[str, Union[str, int]]:
         return {"name": self.name, "description": self.description, "type": self.type}
 
     def __repr__(self) -> str:
@@ -957,10 +1828,26 @@ class MessageCommand(BaseCommand):
         """
         raise NotImplementedError
 
+def _add_permissions(func: Union[BaseCommand, Callable], **kwargs: Iterable[int]) -> None:
+    if isinstance(func, BaseCommand):
+        func.generate_permissions(**kwargs)
+    else:
+        # copied to the command when it is made
+        permissions = getattr(func, "__app_permissions__", None) or CommandPermissions()
+        func.__app_permissions__ = permissions.merge(
+            allowed_roles=kwargs.get("allowed_roles", ()),
+            allowed_users=kwargs.get("allowed_users", ()),
+            denied_roles=kwargs.get("disallowed_roles", ()),
+            denied_users=kwargs.get("disallowed_users", ())
+        )
+
 def blacklist_roles(*roles) -> Callable[[Callable], Callable]:
     r"""A decorator which blacklists some roles from
     the command
 
+    .. versionchanged:: 2.0
+        It is enforced before invoking, see :class:`appcommands.CommandPermissions`
+
     Parameters
     -----------
     \*roles
@@ -979,8 +1866,7 @@ def blacklist_roles(*roles) -> Callable[[Callable], Callable]:
             await ctx.send('tested')
     """
     def wrapper(func) -> Callable:
-        if isinstance(func, BaseCommand):
-            func.generate_options(disallowed_roles=roles)
+        _add_permissions(func, disallowed_roles=roles)
         return func
     return wrapper
 
@@ -988,6 +1874,9 @@ def whitelist_roles(*roles) -> Callable[[Callable], Callable]:
     r"""A decorator which whitelists some roles only
     to use the command
 
+    .. versionchanged:: 2.0
+        It is enforced before invoking, see :class:`appcommands.CommandPermissions`
+
     Parameters
     -----------
     \*roles
@@ -1006,8 +1895,7 @@ def whitelist_roles(*roles) -> Callable[[Callable], Callable]:
             await ctx.send('tested')
     """
     def wrapper(func) -> Callable:
-        if isinstance(func, BaseCommand):
-            func.generate_options(allowed_roles=roles)
+        _add_permissions(func, allowed_roles=roles)
         return func
     return wrapper
 
@@ -1015,6 +1903,9 @@ def blacklist_users(*users) -> Callable[[Callable], Callable]:
     r"""A decorator which blacklists some users
     from the command
 
+    .. versionchanged:: 2.0
+        It is enforced before invoking, see :class:`appcommands.CommandPermissions`
+
     Parameters
     -----------
     \*users
@@ -1033,8 +1924,7 @@ def blacklist_users(*users) -> Callable[[Callable], Callable]:
             await ctx.send('tested')
     """
     def wrapper(func) -> Callable:
-        if isinstance(func, BaseCommand):
-            func.generate_options(disallowed_users=users)
+        _add_permissions(func, disallowed_users=users)
         return func
     return wrapper
 
@@ -1042,6 +1932,9 @@ def whitelist_users(*users) -> Callable[[Callable], Callable]:
     r"""A decorator which whitelists some users only
     to use the command
 
+    .. versionchanged:: 2.0
+        It is enforced before invoking, see :class:`appcommands.CommandPermissions`
+
     Parameters
     -----------
     \*users
@@ -1059,9 +1952,239 @@ def whitelist_users(*users) -> Callable[[Callable], Callable]:
         async def hi(ctx):
             await ctx.send('tested')
     """
+    def wrapper(func) -> Callable:
+        _add_permissions(func, allowed_users=users)
+        return func
+    return wrapper
+
+def cache_response(*, ttl: float = 60.0, maxsize: int = 256, scope: str = "global") -> Callable[[Callable], Callable]:
+    """A decorator which caches the responses of a slash command by its
+    option values, the callback isn't called while a response is cached.
+    See :class:`appcommands.ResponseCache` for what is cached, it is set
+    as :attr:`SlashCommand.response_cache`
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    ttl: :class:`~float`
+        Seconds for which a response is reused, (default: ``60``)
+    maxsize: :class:`~int`
+        The maximum number of cached responses, (default: ``256``)
+    scope: :class:`~str`
+        ``"global"``, ``"guild"`` or ``"user"``, (default: ``"global"``)
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        @bot.slashcommand(description="Shows the docs of a function")
+        @appcommands.cache_response(ttl=300)
+        async def docs(ctx, name: str):
+            await ctx.send(embed=await lookup(name))
+    """
+    cache = ResponseCache(ttl=ttl, maxsize=maxsize, scope=scope)
+
+    def wrapper(func) -> Callable:
+        if isinstance(func, SlashCommand):
+            func.response_cache = cache
+        else:
+            func.__response_cache__ = cache
+        return func
+    return wrapper
+
+def check(predicate: Union['Check', Callable[..., Any]], *, cache_ttl: Optional[float] = None) -> Callable[[Callable], Callable]:
+    """A decorator which adds a check to an application command or a
+    :class:`SubCommandGroup`, the command can only be used when it
+    returns ``True``, else :exc:`appcommands.CheckFailure` is raised.
+
+    The checks of the bot, ``cog_check`` of the cog, the checks of the
+    groups and then the checks of the command run in this order, before
+    the options are parsed. The predicate is called with the context and
+    may be a coroutine function.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    predicate: Union[:class:`appcommands.Check`, Callable]
+        The predicate
+    cache_ttl: Optional[:class:`~float`]
+        Seconds for which the result is reused for the same user in the
+        same guild, see :class:`appcommands.Check`
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        async def is_premium(ctx):
+            return await db.is_premium(ctx.author.id)
+
+        @bot.slashcommand(description="A premium command")
+        @appcommands.check(is_premium, cache_ttl=60)
+        async def premium(ctx):
+            await ctx.send("thanks!")
+    """
+    if not isinstance(predicate, Check):
+        predicate = Check(predicate, cache_ttl=cache_ttl)
+
+    def wrapper(func) -> Callable:
+        if isinstance(func, BaseCommand):
+            func.add_check(predicate)
+        else:
+            # the decorators are applied from the bottom, the top runs first
+            func.__app_checks__ = (predicate, *getattr(func, "__app_checks__", ()))
+        return func
+    wrapper.predicate = predicate
+    return wrapper
+
+def middleware(func: Union['Middleware', Callable[..., Any]], *, kind: str = "around") -> Callable[[Callable], Callable]:
+    """A decorator which adds a middleware to an application command or a
+    :class:`SubCommandGroup`, see :class:`appcommands.Middleware`
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    func: Union[:class:`appcommands.Middleware`, Callable]
+        The middleware
+    kind: :class:`~str`
+        ``before``, ``after`` or ``around``, (default: ``around``)
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        async def timed(ctx, call_next):
+            start = time.perf_counter()
+            try:
+                return await call_next(ctx)
+            finally:
+                log.info("%s took %.3fs", ctx.command.name, time.perf_counter() - start)
+
+        @bot.slashcommand(description="A slow command")
+        @appcommands.middleware(timed)
+        async def slow(ctx):
+            await ctx.send("done")
+    """
+    if not isinstance(func, Middleware):
+        func = Middleware(func, kind=kind)
+
+    def wrapper(callback) -> Callable:
+        if isinstance(callback, BaseCommand):
+            callback.add_middleware(func)
+        else:
+            # the decorators are applied from the bottom, the top runs first
+            callback.__app_middleware__ = (func, *getattr(callback, "__app_middleware__", ()))
+        return callback
+    return wrapper
+
+def cooldown(rate: int, per: float, type: 'commands.BucketType' = MISSING, *, maxsize: int = 10000) -> Callable[[Callable], Callable]:
+    """A decorator which limits how often an application command can be
+    used, raising :exc:`appcommands.CommandOnCooldown` before the options
+    are parsed. See :class:`appcommands.Cooldown`, it is set as
+    ``command.cooldown``
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    rate: :class:`~int`
+        The number of uses in ``per`` seconds
+    per: :class:`~float`
+        The seconds in which ``rate`` uses are allowed
+    type: :class:`discord.ext.commands.BucketType`
+        ``default``, ``user``, ``member``, ``guild`` or ``channel``, (default: ``BucketType.default``)
+    maxsize: :class:`~int`
+        The number of buckets which are kept, (default: ``10000``)
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        from discord.ext.commands import BucketType
+
+        @bot.slashcommand(description="Rolls a dice")
+        @appcommands.cooldown(2, 10, BucketType.user)
+        async def roll(ctx):
+            await ctx.send(str(random.randint(1, 6)))
+    """
+    from .cooldowns import BucketType, Cooldown
+
+    limit = Cooldown(rate, per, BucketType.default if type is MISSING else type, maxsize=maxsize)
+
     def wrapper(func) -> Callable:
         if isinstance(func, BaseCommand):
-            func.generate_options(allowed_users=users)
+            func.cooldown = limit
+        else:
+            func.__app_cooldown__ = limit
+        return func
+    return wrapper
+
+def max_concurrency(number: int, per: 'commands.BucketType' = MISSING, *, wait: bool = False) -> Callable[[Callable], Callable]:
+    """A decorator which limits how many invocations of an application
+    command run at once, raising :exc:`appcommands.MaxConcurrencyReached`
+    before the options are parsed. See :class:`appcommands.MaxConcurrency`,
+    it is set as ``command.max_concurrency``
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    number: :class:`~int`
+        The number of invocations which can run at once
+    per: :class:`discord.ext.commands.BucketType`
+        ``default``, ``user``, ``member``, ``guild`` or ``channel``, (default: ``BucketType.default``)
+    wait: :class:`~bool`
+        Whether invocations wait for their turn instead of failing
+    """
+    from .cooldowns import BucketType, MaxConcurrency
+
+    limit = MaxConcurrency(number, BucketType.default if per is MISSING else per, wait=wait)
+
+    def wrapper(func) -> Callable:
+        if isinstance(func, BaseCommand):
+            func.max_concurrency = limit
+        else:
+            func.__app_max_concurrency__ = limit
+        return func
+    return wrapper
+
+def single_flight(*, scope: str = "global") -> Callable[[Callable], Callable]:
+    """A decorator which makes invocations of a slash command with the
+    same option values share one call of the callback while it runs.
+    See :class:`appcommands.SingleFlight`, it is set as
+    :attr:`SlashCommand.single_flight`
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    scope: :class:`~str`
+        ``"global"``, ``"guild"`` or ``"user"``, (default: ``"global"``)
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        @bot.slashcommand(description="Shows the stats of a player")
+        @appcommands.single_flight()
+        async def stats(ctx, player: str):
+            await ctx.defer()
+            await ctx.send(embed=await fetch_stats(player))
+    """
+    flight = SingleFlight(scope=scope)
+
+    def wrapper(func) -> Callable:
+        if isinstance(func, SlashCommand):
+            func.single_flight = flight
+        else:
+            func.__single_flight__ = flight
         return func
     return wrapper
 
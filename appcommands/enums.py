@@ -1,6 +1,3 @@
-import typing
-import discord
-
 from enum import IntEnum
 
 
@@ -19,10 +16,12 @@ class OptionType(IntEnum):
     ROLE = 8
     MENTIONABLE = 9
     FLOAT = 10
+    ATTACHMENT = 11
 
     @classmethod
     def from_type(cls, t: type):
-        """Get a specific OptionType from a type (or object).
+        """Get a specific OptionType from a type (or object),
+        see :func:`appcommands.get_converter`.
 
         Parameters
         -----------
@@ -37,34 +36,11 @@ class OptionType(IntEnum):
             None if not found
         """
 
-        if issubclass(t, str):
-            return cls.STRING
-        if issubclass(t, bool):
-            return cls.BOOLEAN
-        # The check for bool MUST be above the check for integers as booleans subclass integers
-        if issubclass(t, int):
-            return cls.INTEGER
-        if issubclass(t, discord.User) or issubclass(t, discord.Member):
-            return cls.USER
-        if issubclass(t, discord.abc.GuildChannel):
-            return cls.CHANNEL
-        if issubclass(t, discord.Role):
-            return cls.ROLE
-        if hasattr(typing, "_GenericAlias"):  # 3.7 onwards
-            # Easier than imports
-            if hasattr(t, "__origin__"):
-                if t.__origin__ is typing.Union:
-                    # proven in 3.7.8+, 3.8.6+, 3.9+ definitively
-                    return cls.MENTIONABLE
-        if not hasattr(typing, "_GenericAlias"):  # py 3.6
-            if isinstance(t, typing._Union):  # noqa
-                return cls.MENTIONABLE
-
-        if issubclass(t, discord.Object):
-            return cls.MENTIONABLE
+        from .converters import get_converter
 
-        if issubclass(t, float):
-            return cls.FLOAT
+        converter = get_converter(t)
+        if converter is not None:
+            return converter.type
 
 class PermissionType(IntEnum):
     ROLE = 1
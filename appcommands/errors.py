@@ -0,0 +1,150 @@
+import discord
+
+from typing import Any, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .validation import SchemaViolation
+    from .cooldowns import Cooldown, MaxConcurrency
+    from .checks import Check
+    from .permissions import CommandPermissions
+
+__all__ = (
+    "AppCommandError",
+    "CheckFailure",
+    "CommandNotAllowed",
+    "CommandOnCooldown",
+    "CommandSchemaError",
+    "InteractionExpired",
+    "InvalidOptionValue",
+    "MaxConcurrencyReached"
+)
+
+
+class AppCommandError(discord.DiscordException):
+    """The base exception type for errors raised while invoking
+    application commands
+
+    .. versionadded:: 2.0
+    """
+    pass
+
+
+class InvalidOptionValue(AppCommandError, ValueError):
+    """Raised when the value of an option is not one of its choices or
+    can't be converted, before the command callback is called
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    name: :class:`~str`
+        The name of the option
+    value: Any
+        The rejected value
+    """
+    def __init__(self, name: str, value: Any) -> None:
+        self.name: str = name
+        self.value: Any = value
+        super().__init__(f"Invalid value {value!r} for option {name!r}")
+
+
+class CheckFailure(AppCommandError):
+    """Raised when a check of an application command returned ``False``
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    check: Optional[:class:`appcommands.Check`]
+        The check which failed, ``None`` for :exc:`CommandNotAllowed`
+    """
+    def __init__(self, check: Optional['Check']) -> None:
+        self.check: Optional[Check] = check
+        super().__init__("You can't use this command")
+
+
+class CommandNotAllowed(CheckFailure):
+    """Raised when the :class:`appcommands.CommandPermissions` of an
+    application command don't allow the user to use it
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    permissions: :class:`appcommands.CommandPermissions`
+        The permissions which don't allow it
+    """
+    def __init__(self, permissions: 'CommandPermissions') -> None:
+        self.permissions: CommandPermissions = permissions
+        super().__init__(None)
+
+
+class CommandOnCooldown(AppCommandError):
+    """Raised when an application command is used more often than its
+    :class:`appcommands.Cooldown` allows
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    cooldown: :class:`appcommands.Cooldown`
+        The cooldown of the command
+    retry_after: :class:`~float`
+        Seconds until it can be used again
+    """
+    def __init__(self, cooldown: 'Cooldown', retry_after: float) -> None:
+        self.cooldown: Cooldown = cooldown
+        self.retry_after: float = retry_after
+        super().__init__(f"You are on cooldown. Try again in {retry_after:.2f}s")
+
+
+class MaxConcurrencyReached(AppCommandError):
+    """Raised when more invocations of an application command would run
+    at once than its :class:`appcommands.MaxConcurrency` allows
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    number: :class:`~int`
+        The number of invocations which can run at once
+    per: :class:`discord.ext.commands.BucketType`
+        Whose invocations are counted together
+    """
+    def __init__(self, limit: 'MaxConcurrency') -> None:
+        self.number: int = limit.number
+        self.per = limit.per
+        super().__init__(f"Too many people are using this command, it can only be used {limit.number} time(s) at once")
+
+
+class InteractionExpired(AppCommandError):
+    """Raised when a follow-up message can't be sent as the token of
+    the interaction expired, and it can't be sent to the channel either
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    interaction: :class:`discord.Interaction`
+        The interaction
+    """
+    def __init__(self, interaction: discord.Interaction) -> None:
+        self.interaction: discord.Interaction = interaction
+        super().__init__(f"The token of interaction {interaction.id} has expired")
+
+
+class CommandSchemaError(AppCommandError, ValueError):
+    """Raised when commands would be rejected by discord, before they are
+    sent, see :func:`appcommands.validate_commands`
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    violations: List[:class:`appcommands.SchemaViolation`]
+        Everything that is wrong
+    """
+    def __init__(self, violations: List['SchemaViolation']) -> None:
+        self.violations: List['SchemaViolation'] = violations
+        lines = "\n".join(f"  {v}" for v in violations)
+        super().__init__(f"{len(violations)} problem(s) in application commands:\n{lines}")
@@ -0,0 +1,338 @@
+import asyncio
+import discord
+import datetime
+
+from .utils import MISSING
+from .errors import InteractionExpired
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import InteractionContext
+
+__all__ = (
+    "FollowupQueue",
+    "ResponseBatch"
+)
+
+# How long discord accepts follow-ups with the token of an interaction
+TOKEN_LIFETIME = datetime.timedelta(minutes=15)
+MAX_CONTENT = 2000
+UNKNOWN_WEBHOOK = 10015
+
+# Messages sent with only these keywords besides the content can be joined
+_MERGEABLE = frozenset(("ephemeral", "tts", "allowed_mentions", "suppress_embeds"))
+# Keywords of webhooks which channels don't take
+_WEBHOOK_ONLY = ("ephemeral", "username", "avatar_url", "thread", "thread_name", "wait")
+
+
+class FollowupQueue:
+    """Sends the follow-up messages of an interaction through its webhook,
+    one at a time and in order. Used by :meth:`InteractionContext.send`
+    once the interaction is responded to.
+
+    Only one message is in flight at a time, so they arrive in order and
+    the webhook bucket of the token is never raced, discord.py waits out
+    its rate limits. Messages of only text which pile up meanwhile are
+    joined into one while they fit in 2000 characters.
+
+    The token expires 15 minutes after the interaction was created, the
+    messages are sent to the channel after that, except ephemeral ones.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    interaction: :class:`discord.Interaction`
+        The interaction whose follow-ups are sent
+
+    Attributes
+    ------------
+    expires_at: :class:`datetime.datetime`
+        When the token of the interaction expires
+    coalesced: :class:`~int`
+        The number of messages joined into an earlier one
+    """
+    __slots__ = ("interaction", "expires_at", "coalesced", "_pending", "_worker")
+
+    def __init__(self, interaction: discord.Interaction) -> None:
+        self.interaction: discord.Interaction = interaction
+        self.expires_at: datetime.datetime = interaction.created_at + TOKEN_LIFETIME
+        self.coalesced: int = 0
+        self._pending: Deque[Tuple[Any, Dict[str, Any], asyncio.Future]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def expired(self) -> bool:
+        """:class:`~bool`: Whether the token has expired"""
+        return discord.utils.utcnow() >= self.expires_at
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def send(self, content: Any = MISSING, **kwargs: Any) -> discord.Message:
+        """|coro|
+
+        Queues a message, takes the arguments of :meth:`discord.Webhook.send`
+
+        Raises
+        -------
+        discord.HTTPException
+            Sending the message failed.
+        InteractionExpired
+            The token expired and the message can't be sent to the channel.
+
+        Returns
+        --------
+        Union[:class:`discord.WebhookMessage`, :class:`discord.Message`]
+            The sent message, it's shared by the messages joined into it
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((content, kwargs, future))
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    @staticmethod
+    def _mergeable(content: Any, kwargs: Dict[str, Any]) -> bool:
+        return isinstance(content, str) and _MERGEABLE.issuperset(kwargs)
+
+    def _next(self) -> Tuple[Any, Dict[str, Any], List[asyncio.Future]]:
+        # pops the next message, joined with the ones after it when it can
+        content, kwargs, future = self._pending.popleft()
+        futures = [future]
+        if not self._mergeable(content, kwargs):
+            return content, kwargs, futures
+
+        while self._pending:
+            next_content, next_kwargs, next_future = self._pending[0]
+            if next_future.done():
+                # cancelled by the sender
+                self._pending.popleft()
+                continue
+            if (
+                not self._mergeable(next_content, next_kwargs)
+                or next_kwargs != kwargs
+                or len(content) + 1 + len(next_content) > MAX_CONTENT
+            ):
+                break
+
+            self._pending.popleft()
+            content = f"{content}\n{next_content}"
+            futures.append(next_future)
+            self.coalesced += 1
+        return content, kwargs, futures
+
+    async def _run(self) -> None:
+        try:
+            while self._pending:
+                if self._pending[0][2].done():
+                    self._pending.popleft()
+                    continue
+
+                content, kwargs, futures = self._next()
+                try:
+                    message = await self._send(content, kwargs)
+                except Exception as e:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(message)
+        finally:
+            self._worker = None
+
+    async def _send(self, content: Any, kwargs: Dict[str, Any]) -> discord.Message:
+        if content is not MISSING:
+            kwargs = {"content": content, **kwargs}
+
+        if not self.expired:
+            try:
+                return await self.interaction.followup.send(wait=True, **kwargs)
+            except discord.NotFound as e:
+                if e.code != UNKNOWN_WEBHOOK:
+                    raise
+                # the token is gone earlier than expected
+                self.expires_at = discord.utils.utcnow()
+
+        channel = self.interaction.channel
+        if kwargs.get("ephemeral") or channel is None:
+            raise InteractionExpired(self.interaction)
+
+        for key in _WEBHOOK_ONLY:
+            kwargs.pop(key, None)
+        return await channel.send(**kwargs)
+
+
+class ResponseBatch:
+    """Buffers the messages sent with :meth:`InteractionContext.send`
+    and sends them joined, returned by :meth:`InteractionContext.batch`
+
+    Text and embeds are joined into one message while it fits in 2000
+    characters and 10 embeds, it's sent when it's full, when ``interval``
+    passed after the first buffered message or when the block ends.
+    Messages with anything else, like files or views, are sent at once
+    after the buffer, so the order is kept. ``ctx.send`` returns ``None``
+    for buffered messages. If sending them fails after ``interval``, the
+    error is raised by the next ``ctx.send``, :meth:`flush` or the end
+    of the block, unless the block raised itself.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    context: :class:`appcommands.InteractionContext`
+        The context whose messages are buffered
+    interval: Optional[:class:`~float`]
+        Seconds after which buffered messages are sent, they are only
+        sent when full or at the end of the block by default
+    edit: :class:`~bool`
+        Whether to edit the last sent message, adding the new text and
+        embeds to it while they fit, instead of sending another message
+
+    Attributes
+    ------------
+    coalesced: :class:`~int`
+        The number of messages joined into an earlier one
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        async with ctx.batch(interval=1, edit=True):
+            for item in items:
+                await process(item)
+                await ctx.send(f"processed {item}")
+    """
+    __slots__ = (
+        "context", "interval", "edit", "coalesced", "_lines", "_embeds",
+        "_size", "_message", "_sent", "_lock", "_timer", "_previous", "_error"
+    )
+
+    def __init__(self, context: 'InteractionContext', *, interval: Optional[float] = None, edit: bool = False) -> None:
+        self.context: InteractionContext = context
+        self.interval: Optional[float] = interval
+        self.edit: bool = edit
+        self.coalesced: int = 0
+        self._lines: List[str] = []
+        self._embeds: List[discord.Embed] = []
+        self._size: int = -1  # length of the joined lines
+        # the last message and what it has, for edit
+        self._message: Any = None
+        self._sent: Tuple[str, List[discord.Embed]] = ("", [])
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._previous: Optional[ResponseBatch] = None
+        # raised by a timed flush, nobody awaits its task
+        self._error: Optional[Exception] = None
+
+    async def __aenter__(self) -> 'ResponseBatch':
+        self._previous = self.context._batch
+        self.context._batch = self
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.context._batch = self._previous
+        if exc_info[0] is None:
+            await self.flush()
+            return
+
+        # what was buffered is still sent, the error of the block is raised
+        # instead of one of sending it
+        try:
+            await self.flush()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _batchable(args: tuple, kwargs: Dict[str, Any]) -> bool:
+        if len(args) > 1 or not {"content", "embed", "embeds"}.issuperset(kwargs):
+            return False
+        content = args[0] if args else kwargs.get("content")
+        return content is None or len(str(content)) <= MAX_CONTENT
+
+    def _fits(self, content: Optional[str], embeds: List[discord.Embed]) -> bool:
+        size = self._size + (len(content) + 1 if content is not None else 0)
+        return size <= MAX_CONTENT and len(self._embeds) + len(embeds) <= 10
+
+    async def send(self, *args: Any, **kwargs: Any) -> Any:
+        """|coro|
+
+        Buffers a message, or sends it after the buffer if it can't be
+        joined, takes the arguments of :meth:`InteractionContext.send`
+        """
+        self._raise_error()
+        if not self._batchable(args, kwargs):
+            await self.flush()
+            return await self.context._send(*args, **kwargs)
+
+        content = args[0] if args else kwargs.get("content")
+        content = None if content is None else str(content)
+        embeds = kwargs.get("embeds") or ([kwargs["embed"]] if kwargs.get("embed") else [])
+        if not self._fits(content, embeds):
+            await self.flush()
+
+        if self._lines or self._embeds:
+            self.coalesced += 1
+        if content is not None:
+            self._lines.append(content)
+            self._size += len(content) + 1
+        self._embeds.extend(embeds)
+
+        if self.interval is not None and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(self.interval))
+        return None
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            # raised by the next send, flush or the end of the block
+            self._error = e
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    async def flush(self) -> None:
+        """|coro|
+
+        Sends the buffered messages now, raises what sending the ones
+        buffered before failed with when ``interval`` passed"""
+        self._raise_error()
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+
+        async with self._lock:
+            if not self._lines and not self._embeds:
+                return
+            content = "\n".join(self._lines) if self._lines else None
+            embeds = self._embeds
+            self._lines, self._embeds, self._size = [], [], -1
+            await self._deliver(content, embeds)
+
+    async def _deliver(self, content: Optional[str], embeds: List[discord.Embed]) -> None:
+        if self.edit and self._message is not None:
+            sent_content, sent_embeds = self._sent
+            joined = f"{sent_content}\n{content}" if sent_content and content else (sent_content or content or "")
+            if len(joined) <= MAX_CONTENT and len(sent_embeds) + len(embeds) <= 10:
+                self._sent = (joined, sent_embeds + embeds)
+                self.coalesced += 1
+                await self._message.edit(content=joined or None, embeds=self._sent[1])
+                return
+
+        kwargs: Dict[str, Any] = {}
+        if content is not None:
+            kwargs["content"] = content
+        if embeds:
+            kwargs["embeds"] = embeds
+        self._message = await self.context._send(**kwargs)
+        self._sent = (content or "", embeds)
@@ -0,0 +1,116 @@
+from .enums import PermissionType
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+__all__ = (
+    "CommandPermissions",
+)
+
+
+class CommandPermissions:
+    """The users and roles allowed or denied to use a command, set by
+    :func:`appcommands.whitelist_roles` and the like as
+    ``command.permissions``. They are checked before the command is
+    invoked and sent to discord as the permissions of the command.
+
+    A denied user can't use it, an allowed user can. Else a user with a
+    denied role can't, and if any user or role is allowed only users with
+    an allowed role can.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    allowed_roles: FrozenSet[:class:`~int`]
+    allowed_users: FrozenSet[:class:`~int`]
+    denied_roles: FrozenSet[:class:`~int`]
+    denied_users: FrozenSet[:class:`~int`]
+    """
+    __slots__ = ("allowed_roles", "allowed_users", "denied_roles", "denied_users", "_restricted", "_payload")
+
+    def __init__(
+        self,
+        *,
+        allowed_roles: Iterable[Any] = (),
+        allowed_users: Iterable[Any] = (),
+        denied_roles: Iterable[Any] = (),
+        denied_users: Iterable[Any] = ()
+    ) -> None:
+        self.allowed_roles: FrozenSet[int] = frozenset(map(int, allowed_roles))
+        self.allowed_users: FrozenSet[int] = frozenset(map(int, allowed_users))
+        self.denied_roles: FrozenSet[int] = frozenset(map(int, denied_roles))
+        self.denied_users: FrozenSet[int] = frozenset(map(int, denied_users))
+        self._restricted: bool = bool(self.allowed_roles or self.allowed_users)
+        self._payload: Optional[List[Dict[str, Any]]] = None
+
+    def merge(
+        self,
+        *,
+        allowed_roles: Iterable[Any] = (),
+        allowed_users: Iterable[Any] = (),
+        denied_roles: Iterable[Any] = (),
+        denied_users: Iterable[Any] = ()
+    ) -> 'CommandPermissions':
+        """These permissions with more users and roles, as a new object"""
+        return self.__class__(
+            allowed_roles=self.allowed_roles.union(map(int, allowed_roles)),
+            allowed_users=self.allowed_users.union(map(int, allowed_users)),
+            denied_roles=self.denied_roles.union(map(int, denied_roles)),
+            denied_users=self.denied_users.union(map(int, denied_users))
+        )
+
+    @classmethod
+    def from_payload(cls, data: Iterable[Dict[str, Any]]) -> 'CommandPermissions':
+        """Makes permissions from the permission objects of discord"""
+        kwargs: Dict[str, List[int]] = {"allowed_roles": [], "allowed_users": [], "denied_roles": [], "denied_users": []}
+        for perm in data:
+            kind = "roles" if int(perm["type"]) == PermissionType.ROLE else "users"
+            kwargs[f"{'allowed' if perm['permission'] else 'denied'}_{kind}"].append(int(perm["id"]))
+        return cls(**kwargs)
+
+    def allows(self, user_id: int, role_ids: Iterable[int] = ()) -> bool:
+        """Whether a user with some roles can use the command
+
+        Parameters
+        -----------
+        user_id: :class:`~int`
+            The id of the user
+        role_ids: Iterable[:class:`~int`]
+            The ids of their roles in the guild
+        """
+        if user_id in self.denied_users:
+            return False
+        if user_id in self.allowed_users:
+            return True
+        if self.denied_roles and not self.denied_roles.isdisjoint(role_ids):
+            return False
+        return not self._restricted or not self.allowed_roles.isdisjoint(role_ids)
+
+    def to_payload(self) -> List[Dict[str, Any]]:
+        """The permission objects of discord, it is cached and must not be changed"""
+        if self._payload is None:
+            payload = []
+            for ids, type, permission in (
+                (self.allowed_roles, PermissionType.ROLE, True),
+                (self.allowed_users, PermissionType.USER, True),
+                (self.denied_roles, PermissionType.ROLE, False),
+                (self.denied_users, PermissionType.USER, False),
+            ):
+                payload.extend({"id": str(id), "type": type.value, "permission": permission} for id in sorted(ids))
+            self._payload = payload
+        return self._payload
+
+    def __bool__(self) -> bool:
+        return bool(self.allowed_roles or self.allowed_users or self.denied_roles or self.denied_users)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, CommandPermissions) and self.to_payload() == other.to_payload()
+
+    def __hash__(self) -> int:
+        return hash((self.allowed_roles, self.allowed_users, self.denied_roles, self.denied_users))
+
+    def __repr__(self) -> str:
+        return (
+            f"<CommandPermissions allowed_roles={set(self.allowed_roles)} allowed_users={set(self.allowed_users)} "
+            f"denied_roles={set(self.denied_roles)} denied_users={set(self.denied_users)}>"
+        )
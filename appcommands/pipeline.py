@@ -0,0 +1,119 @@
+import inspect
+
+from discord.ext import commands
+from typing import Any, Awaitable, Callable, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import BaseCommand, InteractionContext
+
+__all__ = (
+    "Middleware",
+)
+
+KINDS = ("before", "after", "around")
+
+async def _maybe_await(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class Middleware:
+    """A function which runs around the invocations of application
+    commands, for timing, tracing, database sessions or mapping errors.
+
+    ``around`` middleware is called with the context and the next step
+    of the chain, which it awaits with the context to go on, or not to
+    stop the invocation, after responding itself. ``before`` middleware
+    is called with the context, the invocation stops if it responded
+    to the interaction. ``after`` middleware is called with the context
+    and the exception raised, ``None`` if there was none, it runs after
+    the command in any case and the exception is raised afterwards.
+
+    The middleware run after the permissions, checks and cooldowns, with
+    :attr:`InteractionContext.command` set, the middleware of the bot
+    first, then ``cog_app_command_middleware`` of the cog, of the groups
+    from the outermost one and then of the command. They are composed
+    into one chain per command when it's registered.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    func: Callable
+        The middleware, it may be a coroutine function
+    kind: :class:`~str`
+        ``before``, ``after`` or ``around``, (default: ``around``)
+    """
+    __slots__ = ("func", "kind")
+
+    def __init__(self, func: Callable[..., Any], *, kind: str = "around") -> None:
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {', '.join(KINDS)}, not {kind!r}")
+        self.func: Callable[..., Any] = func
+        self.kind: str = kind
+
+    def wrap(self, call_next: Callable[['InteractionContext'], Awaitable[Any]]) -> Callable[['InteractionContext'], Awaitable[Any]]:
+        """Returns ``call_next`` with this middleware around it"""
+        func = self.func
+        if self.kind == "around":
+            async def around(ctx: 'InteractionContext') -> Any:
+                return await _maybe_await(func(ctx, call_next))
+            return around
+
+        if self.kind == "before":
+            async def before(ctx: 'InteractionContext') -> Any:
+                await _maybe_await(func(ctx))
+                if ctx.interaction.response.is_done():
+                    return None
+                return await call_next(ctx)
+            return before
+
+        async def after(ctx: 'InteractionContext') -> Any:
+            try:
+                ret = await call_next(ctx)
+            except Exception as e:
+                await _maybe_await(func(ctx, e))
+                raise
+            await _maybe_await(func(ctx, None))
+            return ret
+        return after
+
+    def __repr__(self) -> str:
+        return f"<Middleware func={self.func!r} kind={self.kind!r}>"
+
+
+def _chain(bot: Any, cmd: 'BaseCommand') -> Tuple[Middleware, ...]:
+    # from the outermost one
+    chain = list(getattr(bot, "_app_middleware", ()))
+    if cmd.cog is not None:
+        cog_middleware = getattr(cmd.cog, "cog_app_command_middleware", None)
+        if cog_middleware is not None:
+            cog_middleware = commands.Cog._get_overridden_method(cog_middleware)
+        if cog_middleware is not None:
+            chain.append(Middleware(cog_middleware))
+
+    groups = []
+    parent = getattr(cmd, "parent", None)
+    while parent is not None:
+        groups.append(parent)
+        parent = parent.parent
+    for group in reversed(groups):
+        chain.extend(group.middleware)
+    chain.extend(cmd.middleware)
+    return tuple(chain)
+
+
+def compile_middleware(bot: Any, cmd: 'BaseCommand') -> Optional[Callable[['InteractionContext'], Awaitable[Any]]]:
+    # one callable for the whole chain, ending with the invocation,
+    # None without middleware
+    chain = _chain(bot, cmd)
+    call = None
+    if chain:
+        async def invoke(ctx: 'InteractionContext') -> Any:
+            return await ctx._invoke(cmd)
+
+        call = invoke
+        for middleware in reversed(chain):
+            call = middleware.wrap(call)
+    return call
@@ -0,0 +1,321 @@
+import gzip
+import json
+import time
+import hmac
+import asyncio
+import discord
+import hashlib
+import secrets
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import Bot, AutoShardedBot
+
+__all__ = (
+    "InteractionRecorder",
+    "InteractionReplayer",
+    "read_recording"
+)
+
+# keys whose values are snowflakes of users, guilds, channels, etc.
+_SNOWFLAKE_KEYS = frozenset(("id", "guild_id", "channel_id", "user_id", "target_id", "webhook_id", "message_id"))
+# option types whose values are snowflakes, USER, CHANNEL, ROLE and MENTIONABLE
+_SNOWFLAKE_OPTIONS = frozenset((6, 7, 8, 9))
+
+
+def _user_payload(user: discord.abc.User) -> Dict[str, Any]:
+    return {
+        "id": str(user.id),
+        "username": user.name,
+        "discriminator": user.discriminator,
+        "avatar": getattr(user, "_avatar", None),
+        "bot": user.bot,
+        "public_flags": getattr(user, "_public_flags", 0)
+    }
+
+
+def interaction_payload(interaction: discord.Interaction) -> Dict[str, Any]:
+    """Builds the gateway payload of an interaction back from it"""
+    payload = {
+        "id": str(interaction.id),
+        "application_id": str(interaction.application_id),
+        "type": int(interaction.type.value),
+        "token": interaction.token,
+        "version": interaction.version,
+        "data": interaction.data
+    }
+    if interaction.channel_id is not None:
+        payload["channel_id"] = str(interaction.channel_id)
+    if interaction.guild_id is not None:
+        payload["guild_id"] = str(interaction.guild_id)
+
+    user = interaction.user
+    if isinstance(user, discord.Member):
+        payload["member"] = {
+            "user": _user_payload(user),
+            "roles": [str(r) for r in user._roles],
+            "nick": user.nick,
+            "joined_at": user.joined_at.isoformat() if user.joined_at else None,
+            "premium_since": user.premium_since.isoformat() if user.premium_since else None,
+            "avatar": getattr(user, "_avatar", None),
+            "pending": user.pending,
+            "deaf": False,
+            "mute": False,
+            "permissions": str(interaction.permissions.value)
+        }
+    elif user:
+        payload["user"] = _user_payload(user)
+
+    return payload
+
+
+class _Anonymiser:
+    def __init__(self, key: Optional[bytes] = None) -> None:
+        self.key: bytes = key or secrets.token_bytes(16)
+        self.cache: Dict[str, str] = {}
+
+    def __call__(self, value: Union[str, int]) -> str:
+        value = str(value)
+        try:
+            return self.cache[value]
+        except KeyError:
+            digest = hmac.new(self.key, value.encode(), hashlib.blake2b).digest()
+            ret = self.cache[value] = str(int.from_bytes(digest[:8], "big") >> 1)
+            return ret
+
+    def walk(self, obj: Any) -> Any:
+        if isinstance(obj, list):
+            return [self.walk(i) for i in obj]
+        if not isinstance(obj, dict):
+            return obj
+
+        ret = {}
+        snowflake_value = obj.get("type") in _SNOWFLAKE_OPTIONS and "name" in obj and "value" in obj
+        for k, v in obj.items():
+            if k in _SNOWFLAKE_KEYS and isinstance(v, (str, int)) and str(v).isdigit():
+                ret[k] = self(v)
+            elif k == "roles" and isinstance(v, list):
+                ret[k] = [self(r) for r in v]
+            elif k == "value" and snowflake_value:
+                ret[k] = self(v)
+            elif k == "resolved" and isinstance(v, dict):
+                ret[k] = {
+                    kind: {self(id): self.walk(d) for id, d in objects.items()}
+                    for kind, objects in v.items()
+                }
+            else:
+                ret[k] = self.walk(v)
+        return ret
+
+    def anonymise(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data = payload.get("data")
+        ret = self.walk({k: v for k, v in payload.items() if k not in ("data", "application_id")})
+        ret["application_id"] = payload["application_id"]
+        if data is not None:
+            # The command id is kept, it is what the bot dispatches on
+            ret["data"] = self.walk(data)
+            if "id" in data:
+                ret["data"]["id"] = data["id"]
+        return ret
+
+
+class InteractionRecorder:
+    """Records incoming interactions in a gzip compressed JSONL file,
+    one ``{"t": <unix timestamp>, "d": <payload>}`` object per line
+
+    Set it as :attr:`appcommands.Bot.interaction_recorder` or use
+    :meth:`appcommands.Bot.record_interactions`. Recordings can be fed
+    back into a bot with :class:`InteractionReplayer`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    path: :class:`~str`
+        The file to append to, usually ending in ``.jsonl.gz``
+    anonymise: :class:`~bool`
+        Whether to replace the ids of users, guilds, channels, roles,
+        messages and interactions with stable pseudonyms, (default: ``False``)
+    flush_every: :class:`~int`
+        The number of interactions buffered before they are written, (default: ``100``)
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        bot.record_interactions("traffic.jsonl.gz", anonymise=True)
+
+    .. note::
+
+        Interaction tokens are never written, they are replaced by
+        a placeholder.
+    """
+    def __init__(self, path: str, *, anonymise: bool = False, flush_every: int = 100) -> None:
+        self.path: str = path
+        self.flush_every: int = flush_every
+        self.recorded: int = 0
+        self._anonymiser: Optional[_Anonymiser] = _Anonymiser() if anonymise else None
+        self._buffer: List[str] = []
+        self._file = None
+
+    def record(self, interaction: discord.Interaction) -> None:
+        """Records an interaction
+
+        Parameters
+        -----------
+        interaction: :class:`discord.Interaction`
+            The interaction to record
+        """
+        payload = interaction_payload(interaction)
+        payload["token"] = "recorded"
+        if self._anonymiser is not None:
+            payload = self._anonymiser.anonymise(payload)
+
+        self._buffer.append(json.dumps({"t": time.time(), "d": payload}, separators=(",", ":")))
+        self.recorded += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered interactions to the file"""
+        if not self._buffer:
+            return
+
+        if self._file is None:
+            # every session appends a new gzip member, which gzip readers concatenate
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Flushes and closes the file"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """Reads a recording made by :class:`InteractionRecorder`
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: :class:`~str`
+        The recording
+
+    Yields
+    --------
+    Tuple[:class:`~float`, :class:`~dict`]
+        The timestamp and payload of every interaction
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["t"], entry["d"]
+
+
+class InteractionReplayer:
+    """Feeds a recording made by :class:`InteractionRecorder` into a bot
+
+    The bot should be logged in and have its commands registered, usually
+    against a stub of the Discord API, as every command callback will
+    respond for real. Recorded command ids are mapped to the bot's ones
+    by command name and type.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    bot: Union[:class:`appcommands.Bot`, :class:`appcommands.AutoShardedBot`]
+        The bot to feed the interactions to
+    path: :class:`~str`
+        The recording
+    speed: Optional[:class:`~float`]
+        ``1`` replays in real time, ``n`` replays n times faster and
+        ``None`` replays as fast as possible, (default: ``1``)
+
+    Attributes
+    ------------
+    dispatched: :class:`~int`
+        The number of interactions dispatched by the last :meth:`run`
+    errors: List[:class:`Exception`]
+        The exceptions raised while handling them, along with those raised
+        by commands, which the bot handles as usual
+    elapsed: :class:`~float`
+        The wall time of the last :meth:`run`, in seconds
+    """
+    def __init__(self, bot: Union['Bot', 'AutoShardedBot'], path: str, *, speed: Optional[float] = 1.0) -> None:
+        self.bot: Union[Bot, AutoShardedBot] = bot
+        self.path: str = path
+        self.speed: Optional[float] = speed
+        self.dispatched: int = 0
+        self.errors: List[Exception] = []
+        self.elapsed: float = 0.0
+
+    async def _handle(self, interaction: discord.Interaction) -> None:
+        try:
+            await self.bot.interaction_handler(interaction)
+        except Exception as e:
+            self.errors.append(e)
+
+
+    async def run(self) -> 'InteractionReplayer':
+        """|coro|
+
+        Replays the whole recording and waits for every interaction to be handled
+
+        Returns
+        ---------
+        :class:`InteractionReplayer`
+            This replayer, with its stats filled
+        """
+        ids = {(cmd.name, cmd.type): str(id) for id, cmd in self.bot.appcommands.items()}
+        state = self.bot._connection
+        tasks = []
+        self.dispatched, self.errors = 0, []
+        # the errors of commands don't reach _handle, they are taken on their
+        # way to the handlers without adding one, which would silence the
+        # default on_app_command_error
+        bot = self.bot
+        patched = "_dispatch_app_command_error" in vars(bot)
+        dispatch_error = bot._dispatch_app_command_error
+
+        async def record_error(context: Any, error: Exception) -> None:
+            self.errors.append(error)
+            await dispatch_error(context, error)
+
+        bot._dispatch_app_command_error = record_error
+        try:
+            first = None
+            start = time.perf_counter()
+            for timestamp, payload in read_recording(self.path):
+                if first is None:
+                    first = timestamp
+                if self.speed:
+                    delay = (timestamp - first) / self.speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                data = payload.get("data")
+                if data and (data.get("name"), data.get("type", 1)) in ids:
+                    data["id"] = ids[(data["name"], data.get("type", 1))]
+
+                interaction = discord.Interaction(data=payload, state=state)
+                tasks.append(asyncio.create_task(self._handle(interaction)))
+                self.dispatched += 1
+
+            await asyncio.gather(*tasks)
+            self.elapsed = time.perf_counter() - start
+        finally:
+            if patched:
+                bot._dispatch_app_command_error = dispatch_error
+            else:
+                del bot._dispatch_app_command_error
+        return self
@@ -0,0 +1,94 @@
+import json
+
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+__all__ = (
+    "canonical_bytes",
+)
+
+
+def canonical_bytes(data: Any) -> bytes:
+    """Encodes JSON data with sorted keys and without whitespace, so
+    equal data always gives equal bytes. It uses :mod:`orjson` when it
+    is installed, both encodings are the same for the data of commands
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    data: Any
+        The data, like the :meth:`~appcommands.SlashCommand.to_dict` of a command
+
+    Returns
+    ---------
+    :class:`~bytes`
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class CachedSerialization:
+    # Caches to_dict of the nodes of the command tree. Setting one of the
+    # _serialized_fields of a node drops only its cache, its parents keep
+    # the dicts of their children they were made from and notice that one
+    # of them is new, so setting anything else, like the id, drops nothing.
+    # Adding or removing children is noticed the same way, changing a list
+    # in place needs invalidate()
+    _serialized_fields: FrozenSet[str] = frozenset()
+    _dict_cache: Optional[Tuple[Tuple[dict, ...], dict]] = None
+    _bytes_cache: Optional[Tuple[dict, bytes]] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in self._serialized_fields:
+            object.__setattr__(self, "_dict_cache", None)
+
+    def _serialized_children(self) -> Sequence['CachedSerialization']:
+        return ()
+
+    def _to_dict(self, children: Tuple[dict, ...]) -> dict:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The data of this as sent to discord, it is cached
+        and must not be changed"""
+        children = tuple(child.to_dict() for child in self._serialized_children())
+        cache = self._dict_cache
+        if (
+            cache is not None
+            and len(cache[0]) == len(children)
+            and all(a is b for a, b in zip(cache[0], children))
+        ):
+            return cache[1]
+
+        ret = self._to_dict(children)
+        object.__setattr__(self, "_dict_cache", (children, ret))
+        return ret
+
+    def to_bytes(self) -> bytes:
+        """The :func:`appcommands.canonical_bytes` of :meth:`to_dict`, it is cached
+
+        .. versionadded:: 2.0"""
+        data = self.to_dict()
+        cache = self._bytes_cache
+        if cache is not None and cache[0] is data:
+            return cache[1]
+
+        ret = canonical_bytes(data)
+        object.__setattr__(self, "_bytes_cache", (data, ret))
+        return ret
+
+    def invalidate(self) -> None:
+        """Drops the cached :meth:`to_dict`, needed after changing a list
+        like :attr:`~appcommands.Option.channel_types` in place
+
+        .. versionadded:: 2.0"""
+        object.__setattr__(self, "_dict_cache", None)
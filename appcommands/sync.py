@@ -0,0 +1,191 @@
+import os
+import json
+import asyncio
+import discord
+import hashlib
+import traceback
+
+from .serialization import canonical_bytes
+
+from discord.http import Route
+from typing import Any, Dict, List, NamedTuple, Optional
+
+__all__ = (
+    "SyncSummary",
+)
+
+
+class SyncSummary(NamedTuple):
+    """What :meth:`appcommands.Bot.register_commands` did
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    global_commands: :class:`~int`
+        The number of global commands
+    guilds: :class:`~int`
+        The number of guilds whose commands were sent
+    failed_guilds: List[:class:`~int`]
+        The guilds whose commands could not be sent
+    permissions_edited: List[:class:`~int`]
+        The guilds whose command permissions were edited
+    permissions_unchanged: List[:class:`~int`]
+        The guilds whose command permissions were already applied
+    permissions_failed: Dict[:class:`~int`, :class:`Exception`]
+        The guilds whose command permissions could not be edited
+    """
+    global_commands: int
+    guilds: int
+    failed_guilds: List[int]
+    permissions_edited: List[int]
+    permissions_unchanged: List[int]
+    permissions_failed: Dict[int, Exception]
+
+
+def permission_digests(data: List[Dict[str, Any]]) -> Dict[str, bytes]:
+    # command id -> hash of its permissions, in any order they are given,
+    # from the payload sent or the one fetched from discord
+    ret = {}
+    for command in data:
+        permissions = sorted(
+            ({"id": str(p["id"]), "type": int(p["type"]), "permission": bool(p["permission"])} for p in command["permissions"]),
+            key=lambda p: (p["type"], p["id"])
+        )
+        if permissions:
+            ret[str(command["id"])] = hashlib.sha256(canonical_bytes(permissions)).digest()[:16]
+    return ret
+
+
+async def bulk_edit_permissions(http: Any, application_id: int, guild_id: int, data: List[Dict[str, Any]]) -> Any:
+    # the method is gone in later builds of discord.py 2.0, the route is the same
+    bulk_edit = getattr(http, "bulk_edit_guild_application_command_permissions", None)
+    if bulk_edit is not None:
+        return await bulk_edit(application_id, guild_id, data)
+
+    route = Route(
+        'PUT',
+        '/applications/{application_id}/guilds/{guild_id}/commands/permissions',
+        application_id=application_id,
+        guild_id=guild_id
+    )
+    return await http.request(route, json=data)
+
+
+async def get_permissions(http: Any, application_id: int, guild_id: int) -> List[Dict[str, Any]]:
+    get = getattr(http, "get_guild_application_command_permissions", None)
+    if get is not None:
+        return await get(application_id, guild_id)
+
+    route = Route(
+        'GET',
+        '/applications/{application_id}/guilds/{guild_id}/commands/permissions',
+        application_id=application_id,
+        guild_id=guild_id
+    )
+    return await http.request(route)
+
+
+class PermissionSync:
+    # The command permissions applied in each guild, by their hashes, kept
+    # in the JSON file at path if given so restarts don't edit them again.
+    # The permissions of guilds whose state isn't known are fetched first,
+    # a GET costs less than editing them all on every start
+    def __init__(self, limit: int = 5, *, path: Optional[str] = None) -> None:
+        self.limit: int = limit
+        self.path: Optional[str] = path
+        self.applied: Dict[int, Dict[str, bytes]] = {}
+        self._loaded: bool = path is None
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring the command permission state in {self.path}: {e}")
+            return
+
+        for guild_id, digests in state.items():
+            self.applied.setdefault(int(guild_id), {k: bytes.fromhex(v) for k, v in digests.items()})
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        state = {str(g): {k: v.hex() for k, v in d.items()} for g, d in self.applied.items()}
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Failed to save the command permission state to {self.path}: {e}")
+
+    async def _sync_guild(self, bot: Any, guild_id: int, data: List[Dict[str, Any]], semaphore: asyncio.Semaphore) -> bool:
+        # returns whether permissions were edited
+        wanted = permission_digests(data)
+        if self.applied.get(guild_id) == wanted:
+            return False
+
+        async with semaphore:
+            if guild_id not in self.applied:
+                try:
+                    current = permission_digests(await get_permissions(bot.http, bot.user.id, guild_id))
+                except discord.HTTPException:
+                    current = None
+                if current == wanted:
+                    self.applied[guild_id] = wanted
+                    return False
+
+            await bulk_edit_permissions(bot.http, bot.user.id, guild_id, data)
+            self.applied[guild_id] = wanted
+            return True
+
+    async def sync(self, bot: Any, payloads: Dict[int, List[Dict[str, Any]]], summary: Dict[str, Any]) -> None:
+        if not self._loaded:
+            self._load()
+
+        # only guilds with permissions now or when last applied are looked at
+        guilds = [g for g in payloads if payloads[g] or self.applied.get(g)]
+        semaphore = asyncio.Semaphore(self.limit)
+        results = await asyncio.gather(
+            *(self._sync_guild(bot, g, payloads[g], semaphore) for g in guilds),
+            return_exceptions=True
+        )
+        for guild_id, result in zip(guilds, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                print(f"Failed to edit command permissions for guild {guild_id}")
+                traceback.print_exception(type(result), result, result.__traceback__)
+                summary["permissions_failed"][guild_id] = result
+                # discord.py adds the on_ prefix
+                bot.dispatch("guild_permissions_sync_fail", guild_id, result)
+            elif result:
+                summary["permissions_edited"].append(guild_id)
+            else:
+                summary["permissions_unchanged"].append(guild_id)
+        self._save()
+
+    async def edit_command(self, bot: Any, guild_id: int, command_id: int, permissions: List[Dict[str, Any]]) -> bool:
+        # edits the permissions of one command, returns whether it was needed
+        if not self._loaded:
+            self._load()
+
+        wanted = permission_digests([{"id": command_id, "permissions": permissions}]).get(str(command_id))
+        applied = self.applied.get(guild_id)
+        if applied is not None and applied.get(str(command_id)) == wanted:
+            return False
+
+        await bot.http.edit_application_command_permissions(
+            bot.user.id, guild_id, command_id, {"permissions": permissions}
+        )
+        if applied is not None:
+            if wanted is None:
+                applied.pop(str(command_id), None)
+            else:
+                applied[str(command_id)] = wanted
+            self._save()
+        return True
@@ -0,0 +1,501 @@
+"""Helpers to test application commands without connecting to discord
+
+Example
+---------
+
+.. code-block:: python3
+
+    from appcommands.testing import TestClient
+
+    async def test_echo():
+        client = TestClient(bot)
+        result = await client.slash("echo", text="hi")
+        assert result.sent[0].args == ("hi",)
+"""
+
+import discord
+import itertools
+
+from .core import BaseCommand, InteractionContext, MessageCommand, SlashCommand, SubCommandGroup, UserCommand
+from .enums import OptionType
+from .replay import _user_payload
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import Bot, AutoShardedBot
+
+__all__ = (
+    "Call",
+    "RecordingResponse",
+    "TestClient",
+    "TestResult"
+)
+
+_ids = itertools.count(1 << 60)
+
+
+class Call(NamedTuple):
+    """A recorded call made by a command
+
+    Attributes
+    ------------
+    method: :class:`~str`
+        The called method, like ``send_message``, ``defer`` or ``channel.send``
+    args: :class:`~tuple`
+        The positional arguments
+    kwargs: :class:`~dict`
+        The keyword arguments
+    """
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+class _RecordedMessage:
+    def __init__(self, calls: List[Call], id: int, content: Optional[str] = None, **kwargs) -> None:
+        self._calls = calls
+        self.id: int = id
+        self.content: Optional[str] = content
+        self.embeds: List[discord.Embed] = kwargs.get("embeds") or ([kwargs["embed"]] if kwargs.get("embed") else [])
+
+    async def edit(self, *args, **kwargs) -> '_RecordedMessage':
+        self._calls.append(Call("message.edit", args, kwargs))
+        return self
+
+    async def delete(self, *args, **kwargs) -> None:
+        self._calls.append(Call("message.delete", args, kwargs))
+
+    def __repr__(self) -> str:
+        return f"<RecordedMessage id={self.id} content={self.content!r}>"
+
+
+class RecordingResponse:
+    """Stands in for :class:`discord.InteractionResponse`,
+    recording every call instead of sending it
+
+    Attributes
+    ------------
+    calls: List[:class:`Call`]
+        Every call made on the interaction, shared with :class:`TestResult`
+    """
+    def __init__(self, calls: List[Call]) -> None:
+        self.calls: List[Call] = calls
+        self._done: bool = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _respond(self, method: str, args: tuple, kwargs: dict) -> None:
+        if self._done:
+            raise discord.InteractionResponded(None)
+        self._done = True
+        self.calls.append(Call(method, args, kwargs))
+
+    async def send_message(self, *args, **kwargs) -> None:
+        self._respond("send_message", args, kwargs)
+
+    async def defer(self, *args, **kwargs) -> None:
+        self._respond("defer", args, kwargs)
+
+    async def edit_message(self, *args, **kwargs) -> None:
+        self._respond("edit_message", args, kwargs)
+
+    async def send_modal(self, *args, **kwargs) -> None:
+        self._respond("send_modal", args, kwargs)
+
+    async def pong(self) -> None:
+        self._respond("pong", (), {})
+
+    async def autocomplete(self, choices: list) -> None:
+        self._respond("autocomplete", (choices,), {})
+
+
+class _RecordingMessageable:
+    def __init__(self, calls: List[Call], name: str, id: int) -> None:
+        self._calls = calls
+        self._name = name
+        self.id: int = id
+
+    async def send(self, *args, **kwargs) -> _RecordedMessage:
+        self._calls.append(Call(f"{self._name}.send", args, kwargs))
+        return _RecordedMessage(self._calls, next(_ids), *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Recording{self._name.title()} id={self.id}>"
+
+
+class _TestGuild:
+    # serves the objects passed as options, falls back to the real guild
+    def __init__(self, id: int, guild: Optional[discord.Guild], objects: Dict[int, Any]) -> None:
+        self.id: int = id
+        self._guild = guild
+        self._objects = objects
+
+    def _get(self, id: int, name: str) -> Any:
+        try:
+            return self._objects[id]
+        except KeyError:
+            if self._guild is not None:
+                return getattr(self._guild, name)(id)
+
+    def get_member(self, id: int) -> Any:
+        return self._get(id, "get_member")
+
+    def get_channel(self, id: int) -> Any:
+        return self._get(id, "get_channel")
+
+    def get_role(self, id: int) -> Any:
+        return self._get(id, "get_role")
+
+    async def fetch_member(self, id: int) -> Any:
+        return self.get_member(id) or discord.Object(id)
+
+    async def fetch_channel(self, id: int) -> Any:
+        return self.get_channel(id) or discord.Object(id)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._guild is None:
+            raise AttributeError(name)
+        return getattr(self._guild, name)
+
+
+class _FakeInteraction:
+    def __init__(self, client: 'TestClient', type: discord.InteractionType, data: dict, objects: Dict[int, Any]) -> None:
+        self.calls: List[Call] = []
+        self.id: int = next(_ids)
+        self.version: int = 1
+        self.created_at = discord.utils.utcnow()
+        self.type: discord.InteractionType = type
+        self.token: str = "test"
+        self.application_id: int = client.application_id
+        self.data: dict = data
+        self.user = client.author
+        self.guild_id: Optional[int] = client.guild_id
+        self.channel_id: int = client.channel_id
+        self.guild: Optional[_TestGuild] = None
+        if client.guild_id is not None:
+            self.guild = _TestGuild(client.guild_id, client.bot.get_guild(client.guild_id), objects)
+        self.channel = _RecordingMessageable(self.calls, "channel", client.channel_id)
+        self.followup = _RecordingMessageable(self.calls, "followup", client.application_id)
+        self.response = RecordingResponse(self.calls)
+        self._state = client.bot._connection
+        self._original_message: Optional[_RecordedMessage] = None
+
+    def _get_original_message(self) -> _RecordedMessage:
+        if self._original_message is None:
+            sent = next((c for c in self.calls if c.method == "send_message"), None)
+            args, kwargs = (sent.args, sent.kwargs) if sent else ((), {})
+            self._original_message = _RecordedMessage(self.calls, self.id, *args, **kwargs)
+        return self._original_message
+
+    async def original_message(self) -> _RecordedMessage:
+        self.calls.append(Call("original_message", (), {}))
+        return self._get_original_message()
+
+    async def edit_original_message(self, *args, **kwargs) -> _RecordedMessage:
+        # discord returns the edited message, it isn't fetched
+        self.calls.append(Call("edit_original_message", args, kwargs))
+        return self._get_original_message()
+
+    async def delete_original_message(self) -> None:
+        self.calls.append(Call("delete_original_message", (), {}))
+
+
+class TestResult:
+    """The outcome of a command invoked by :class:`TestClient`
+
+    Attributes
+    ------------
+    context: :class:`appcommands.InteractionContext`
+        The context the command was invoked with
+    value: Any
+        What the callback returned
+    calls: List[:class:`Call`]
+        Every call made on the interaction, in order
+    """
+    __test__ = False
+
+    def __init__(self, context: InteractionContext, value: Any) -> None:
+        self.context: InteractionContext = context
+        self.value: Any = value
+        self.calls: List[Call] = context.interaction.calls
+
+    @property
+    def sent(self) -> List[Call]:
+        """List[:class:`Call`]: The calls which sent a message, the response included"""
+        return [c for c in self.calls if c.method in ("send_message", "channel.send", "followup.send")]
+
+    @property
+    def deferred(self) -> bool:
+        """:class:`~bool`: Whether the interaction was deferred"""
+        return any(c.method == "defer" for c in self.calls)
+
+    def __repr__(self) -> str:
+        return f"<TestResult value={self.value!r} calls={self.calls!r}>"
+
+
+class TestClient:
+    """Invokes application commands of a bot through
+    :meth:`appcommands.InteractionContext.invoke` with a fake interaction,
+    recording the responses instead of sending them
+
+    The bot doesn't need to be logged in. Subcommand groups which are not
+    registered yet are indexed in the bot under a fake id.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    bot: Union[:class:`appcommands.Bot`, :class:`appcommands.AutoShardedBot`]
+        The bot whose commands are tested
+    author: Optional[Union[:class:`discord.User`, :class:`discord.Member`]]
+        The invoking user, a fake one by default
+    guild_id: Optional[:class:`~int`]
+        The guild the commands are invoked in, ``None`` for DMs
+    channel_id: Optional[:class:`~int`]
+        The channel the commands are invoked in
+    """
+    __test__ = False
+
+    def __init__(
+        self,
+        bot: Union['Bot', 'AutoShardedBot'],
+        *,
+        author: Optional[Union[discord.User, discord.Member]] = None,
+        guild_id: Optional[int] = 1,
+        channel_id: int = 2
+    ) -> None:
+        self.bot: Union[Bot, AutoShardedBot] = bot
+        self.application_id: int = bot.application_id or 3
+        self.guild_id: Optional[int] = guild_id
+        self.channel_id: int = channel_id
+        self.author: Union[discord.User, discord.Member] = author or discord.User(
+            state=bot._connection,
+            data={"id": "4", "username": "tester", "discriminator": "0000", "avatar": None}
+        )
+        self._root_ids: Dict[int, int] = {}
+
+    def _commands(self) -> List[BaseCommand]:
+        cmds = list(self.bot.to_register) + list(self.bot.appcommands.values())
+        for cog in self.bot.cogs.values():
+            cmds.extend(getattr(cog, "__app_commands__", ()))
+
+        ret = []
+        for cmd in cmds:
+            ret.append(cmd)
+            for sub in getattr(cmd, "subcommands", ()):
+                ret.append(sub)
+                ret.extend(getattr(sub, "subcommands", ()))
+        return ret
+
+    def get_command(self, name: str, type: int = 1) -> BaseCommand:
+        """Finds a command of the bot by its full name
+
+        Parameters
+        -----------
+        name: :class:`~str`
+            The full name, like ``"group sub"`` for subcommands
+        type: :class:`~int`
+            The command type, ``1`` for slash, ``2`` for user and ``3`` for message commands
+
+        Raises
+        --------
+        LookupError
+            The command was not found
+        """
+        for cmd in self._commands():
+            if isinstance(cmd, SubCommandGroup):
+                continue
+            if cmd.type == type and getattr(cmd, "full_name", cmd.name) == name:
+                return cmd
+        raise LookupError(f"No application command named {name!r} of type {type}")
+
+    def _root_id(self, root: BaseCommand) -> int:
+        for command_id, cmd in self.bot.appcommands.items():
+            if cmd is root:
+                return command_id
+        # a made up id for commands not registered, the bot isn't told about
+        # it as the commands are invoked directly
+        try:
+            return self._root_ids[id(root)]
+        except KeyError:
+            ret = self._root_ids[id(root)] = next(_ids)
+            return ret
+
+    def _option(self, cmd: SlashCommand, name: str, value: Any, objects: Dict[int, Any], resolved: dict) -> dict:
+        option = next((o for o in cmd.options if o.name == name), None)
+        if option is None:
+            raise TypeError(f"{cmd.full_name!r} has no option named {name!r}")
+
+        type = int(option.type)
+        if type in (OptionType.USER, OptionType.CHANNEL, OptionType.ROLE, OptionType.MENTIONABLE) and hasattr(value, "id"):
+            objects[value.id] = value
+            if isinstance(value, discord.abc.User):
+                resolved.setdefault("users", {})[str(value.id)] = _user_payload(value)
+                if isinstance(value, discord.Member):
+                    resolved.setdefault("members", {})[str(value.id)] = {"roles": [str(r) for r in value._roles], "nick": value.nick}
+            elif isinstance(value, discord.Role):
+                resolved.setdefault("roles", {})[str(value.id)] = {"id": str(value.id), "name": value.name, "permissions": str(value.permissions.value)}
+            elif isinstance(value, discord.abc.GuildChannel):
+                resolved.setdefault("channels", {})[str(value.id)] = {"id": str(value.id), "name": value.name, "type": value.type.value}
+            value = value.id
+
+        return {"name": name, "type": type, "value": value}
+
+    async def _invoke(self, cmd: BaseCommand, data: dict, objects: Dict[int, Any], autocomplete: bool = False) -> TestResult:
+        type = discord.InteractionType.autocomplete if autocomplete else discord.InteractionType.application_command
+        interaction = _FakeInteraction(self, type, data, objects)
+        context = self.bot.get_interaction_context(interaction)
+        if autocomplete:
+            value = await context.autocomplete(cmd)
+        else:
+            value = await context.invoke(cmd)
+        return TestResult(context, value)
+
+    async def slash(self, command: Union[str, SlashCommand], **options: Any) -> TestResult:
+        r"""|coro|
+
+        Invokes a slash command or subcommand
+
+        Parameters
+        -----------
+        command: Union[:class:`~str`, :class:`appcommands.SlashCommand`]
+            The command or its full name
+        \*\*options
+            The option values, users, members, channels and roles are
+            passed as objects
+
+        Returns
+        ---------
+        :class:`TestResult`
+        """
+        return await self._slash(command, options, None)
+
+    async def autocomplete(self, command: Union[str, SlashCommand], option: str, value: str, **options: Any) -> TestResult:
+        r"""|coro|
+
+        Sends an autocomplete interaction for an option of a slash command,
+        the choices are the first argument of the ``autocomplete`` call
+
+        Parameters
+        -----------
+        command: Union[:class:`~str`, :class:`appcommands.SlashCommand`]
+            The command or its full name
+        option: :class:`~str`
+            The focused option
+        value: :class:`~str`
+            What the user typed in it
+        \*\*options
+            The values of the other options
+
+        Returns
+        ---------
+        :class:`TestResult`
+        """
+        options[option] = value
+        return await self._slash(command, options, option)
+
+    async def _slash(self, command: Union[str, SlashCommand], options: Dict[str, Any], focused: Optional[str]) -> TestResult:
+        cmd = command if isinstance(command, SlashCommand) else self.get_command(command, 1)
+        objects, resolved = {}, {}
+        options = [self._option(cmd, k, v, objects, resolved) for k, v in options.items()]
+        for option in options:
+            if option["name"] == focused:
+                option["focused"] = True
+
+        root = cmd
+        if cmd.parent is not None:
+            payload = {"name": cmd.name, "type": OptionType.SUB_COMMAND.value, "options": options}
+            root = cmd.parent
+            if root.parent is not None:
+                payload = {"name": root.name, "type": OptionType.SUB_COMMAND_GROUP.value, "options": [payload]}
+                root = root.parent
+            options = [payload]
+
+        data = {"id": str(self._root_id(root)), "name": root.name, "type": 1, "options": options}
+        if resolved:
+            data["resolved"] = resolved
+
+        return await self._invoke(cmd, data, objects, focused is not None)
+
+    async def user(self, command: Union[str, UserCommand], target: Union[discord.User, discord.Member]) -> TestResult:
+        """|coro|
+
+        Invokes a user command
+
+        Parameters
+        -----------
+        command: Union[:class:`~str`, :class:`appcommands.UserCommand`]
+            The command or its name
+        target: Union[:class:`discord.User`, :class:`discord.Member`]
+            The targeted user
+
+        Returns
+        ---------
+        :class:`TestResult`
+        """
+        cmd = command if isinstance(command, UserCommand) else self.get_command(command, 2)
+        resolved = {"users": {str(target.id): _user_payload(target)}}
+        if isinstance(target, discord.Member):
+            resolved["members"] = {str(target.id): {
+                "roles": [str(r) for r in target._roles],
+                "nick": target.nick,
+                "joined_at": target.joined_at.isoformat() if target.joined_at else None,
+                "deaf": False,
+                "mute": False
+            }}
+
+        data = {"id": str(next(_ids)), "name": cmd.name, "type": 2, "target_id": str(target.id), "resolved": resolved}
+        return await self._invoke(cmd, data, {target.id: target})
+
+    async def message(
+        self,
+        command: Union[str, MessageCommand],
+        content: str = "",
+        *,
+        author: Optional[discord.abc.User] = None,
+        message_id: Optional[int] = None
+    ) -> TestResult:
+        """|coro|
+
+        Invokes a message command
+
+        Parameters
+        -----------
+        command: Union[:class:`~str`, :class:`appcommands.MessageCommand`]
+            The command or its name
+        content: :class:`~str`
+            Content of the targeted message
+        author: Optional[:class:`discord.abc.User`]
+            Author of the targeted message, the invoking user by default
+        message_id: Optional[:class:`~int`]
+            Id of the targeted message
+
+        Returns
+        ---------
+        :class:`TestResult`
+        """
+        cmd = command if isinstance(command, MessageCommand) else self.get_command(command, 3)
+        message_id = message_id or next(_ids)
+        message = {
+            "id": str(message_id),
+            "channel_id": str(self.channel_id),
+            "author": _user_payload(author or self.author),
+            "content": content,
+            "timestamp": "2021-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0
+        }
+        if self.guild_id is not None:
+            message["guild_id"] = str(self.guild_id)
+
+        data = {"id": str(next(_ids)), "name": cmd.name, "type": 3, "target_id": str(message_id), "resolved": {"messages": {str(message_id): message}}}
+        return await self._invoke(cmd, data, {})
@@ -1,5 +1,8 @@
 import discord
 
+if not discord.__version__.startswith("2.0"):
+  raise RuntimeError(f"This module requires dpy v2.0 not {discord.__version__}")
+
 __all__ = (
     "MISSING",
     "missing",
@@ -0,0 +1,259 @@
+import re
+
+from .enums import OptionType
+from .utils import ALL_GUILDS
+from .errors import CommandSchemaError
+from .core import (
+    BaseCommand,
+    MessageCommand,
+    Option,
+    SlashCommand,
+    SubCommandGroup,
+    UserCommand
+)
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+__all__ = (
+    "SchemaViolation",
+    "validate_command",
+    "validate_commands"
+)
+
+# The limits of discord
+MAX_NAME = 32
+MAX_DESCRIPTION = 100
+MAX_OPTIONS = 25
+MAX_CHOICE_NAME = 100
+MAX_CHOICE_VALUE = 100
+MAX_LENGTH = 6000
+MAX_COMMAND_CHARACTERS = 4000
+MAX_COMMANDS = {1: 100, 2: 5, 3: 5}
+
+_SLASH_NAME = re.compile(r"^[-_\w]{1,32}$")
+_CHOICE_TYPES = {
+    OptionType.STRING: (str,),
+    OptionType.INTEGER: (int,),
+    OptionType.FLOAT: (int, float),
+}
+
+
+class SchemaViolation(NamedTuple):
+    """Something in a command which discord would reject
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    path: :class:`~str`
+        Where it is, like ``"tag edit"`` or ``"tag edit:name"`` for an option
+    message: :class:`~str`
+        What is wrong
+    """
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+def _check_slash_name(name: Any, path: str, out: List[SchemaViolation]) -> None:
+    if not isinstance(name, str) or not _SLASH_NAME.match(name):
+        out.append(SchemaViolation(path, f"name {name!r} must be 1-32 letters, numbers, '-' or '_'"))
+    elif name != name.lower():
+        out.append(SchemaViolation(path, f"name {name!r} must be lowercase"))
+
+
+def _check_description(description: Any, path: str, out: List[SchemaViolation]) -> None:
+    if not isinstance(description, str) or not 1 <= len(description) <= MAX_DESCRIPTION:
+        out.append(SchemaViolation(path, f"description must be 1-{MAX_DESCRIPTION} characters"))
+
+
+def _check_option(option: Option, path: str, out: List[SchemaViolation]) -> int:
+    # returns the characters it counts towards the limit of the command
+    _check_slash_name(option.name, path, out)
+    _check_description(option.description, path, out)
+
+    try:
+        type = OptionType(option.type)
+    except ValueError:
+        out.append(SchemaViolation(path, f"unknown option type {option.type!r}"))
+        return 0
+    if type in (OptionType.SUB_COMMAND, OptionType.SUB_COMMAND_GROUP):
+        out.append(SchemaViolation(path, "options can't be subcommands, use a SubCommandGroup"))
+
+    characters = len(str(option.name)) + len(str(option.description))
+    if option.choices:
+        accepted = _CHOICE_TYPES.get(type)
+        if accepted is None:
+            out.append(SchemaViolation(path, f"{type.name} options can't have choices"))
+        for i, choice in enumerate(option.choices):
+            choice_path = f"{path}:choice {i}"
+            if not isinstance(choice.name, str) or not 1 <= len(choice.name) <= MAX_CHOICE_NAME:
+                out.append(SchemaViolation(choice_path, f"name must be 1-{MAX_CHOICE_NAME} characters"))
+            value = choice.value
+            if accepted is not None and (isinstance(value, bool) or not isinstance(value, accepted)):
+                out.append(SchemaViolation(choice_path, f"value {value!r} doesn't match the {type.name} option"))
+            elif isinstance(value, str) and len(value) > MAX_CHOICE_VALUE:
+                out.append(SchemaViolation(choice_path, f"value must be at most {MAX_CHOICE_VALUE} characters"))
+            characters += len(str(choice.name)) + len(str(value))
+
+    if option.autocomplete and type not in _CHOICE_TYPES:
+        out.append(SchemaViolation(path, f"{type.name} options can't autocomplete"))
+
+    if option.min_value is not None or option.max_value is not None:
+        if type not in (OptionType.INTEGER, OptionType.FLOAT):
+            out.append(SchemaViolation(path, "min_value and max_value are only for INTEGER and FLOAT options"))
+        elif option.min_value is not None and option.max_value is not None and option.min_value > option.max_value:
+            out.append(SchemaViolation(path, "min_value is larger than max_value"))
+
+    if option.min_length is not None or option.max_length is not None:
+        if type is not OptionType.STRING:
+            out.append(SchemaViolation(path, "min_length and max_length are only for STRING options"))
+        if option.min_length is not None and not 0 <= option.min_length <= MAX_LENGTH:
+            out.append(SchemaViolation(path, f"min_length must be 0-{MAX_LENGTH}"))
+        if option.max_length is not None and not 1 <= option.max_length <= MAX_LENGTH:
+            out.append(SchemaViolation(path, f"max_length must be 1-{MAX_LENGTH}"))
+        if option.min_length is not None and option.max_length is not None and option.min_length > option.max_length:
+            out.append(SchemaViolation(path, "min_length is larger than max_length"))
+
+    if option.channel_types and type is not OptionType.CHANNEL:
+        out.append(SchemaViolation(path, "channel_types are only for CHANNEL options"))
+
+    return characters
+
+
+def _check_children(names: Iterable[str], kind: str, path: str, out: List[SchemaViolation]) -> None:
+    seen = set()
+    count = 0
+    for name in names:
+        count += 1
+        if name in seen:
+            out.append(SchemaViolation(path, f"{kind} {name!r} is defined more than once"))
+        seen.add(name)
+    if count > MAX_OPTIONS:
+        out.append(SchemaViolation(path, f"has {count} {kind}s, at most {MAX_OPTIONS} are allowed"))
+
+
+def _check_slash(command: SlashCommand, path: str, out: List[SchemaViolation]) -> int:
+    _check_slash_name(command.name, path, out)
+    _check_description(command.description, path, out)
+    _check_children((o.name for o in command.options), "option", path, out)
+
+    characters = len(str(command.name)) + len(str(command.description))
+    optional = None
+    for option in command.options:
+        option_path = f"{path}:{option.name}"
+        if option.required and optional is not None:
+            out.append(SchemaViolation(option_path, f"required option after the optional option {optional!r}"))
+        elif not option.required and optional is None:
+            optional = option.name
+        characters += _check_option(option, option_path, out)
+    return characters
+
+
+def _check_group(group: SubCommandGroup, path: str, depth: int, out: List[SchemaViolation]) -> int:
+    _check_slash_name(group.name, path, out)
+    _check_description(group.description, path, out)
+    _check_children((c.name for c in group.subcommands), "subcommand", path, out)
+
+    characters = len(str(group.name)) + len(str(group.description))
+    for subcommand in group.subcommands:
+        sub_path = f"{path} {subcommand.name}"
+        if isinstance(subcommand, SubCommandGroup):
+            if depth >= 1:
+                out.append(SchemaViolation(sub_path, "groups can only be nested once"))
+            characters += _check_group(subcommand, sub_path, depth + 1, out)
+        else:
+            characters += _check_slash(subcommand, sub_path, out)
+    return characters
+
+
+def validate_command(command: BaseCommand) -> List[SchemaViolation]:
+    """Checks a command against the limits of discord,
+    without any request
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    command: :class:`appcommands.BaseCommand`
+        The command, subcommands and options are checked as well
+
+    Returns
+    ---------
+    List[:class:`SchemaViolation`]
+        Every violation found, empty if the command is valid
+    """
+    out: List[SchemaViolation] = []
+    path = str(command.name)
+
+    if isinstance(command, (UserCommand, MessageCommand)):
+        if not isinstance(command.name, str) or not 1 <= len(command.name) <= MAX_NAME:
+            out.append(SchemaViolation(path, f"name must be 1-{MAX_NAME} characters"))
+        return out
+
+    if isinstance(command, SubCommandGroup):
+        characters = _check_group(command, path, 0, out)
+    elif isinstance(command, SlashCommand):
+        characters = _check_slash(command, path, out)
+    else:
+        out.append(SchemaViolation(path, f"unknown command type {command.__class__.__name__}"))
+        return out
+
+    if characters > MAX_COMMAND_CHARACTERS:
+        out.append(SchemaViolation(path, f"has {characters} characters in names, descriptions and choices, at most {MAX_COMMAND_CHARACTERS} are allowed"))
+    return out
+
+
+def validate_commands(commands: Iterable[BaseCommand]) -> List[SchemaViolation]:
+    """Checks commands with :func:`validate_command`, and that no
+    name is used twice and not too many commands are registered
+    where they are registered
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    commands: Iterable[:class:`appcommands.BaseCommand`]
+        The top level commands
+
+    Returns
+    ---------
+    List[:class:`SchemaViolation`]
+        Every violation found, empty if the commands are valid
+    """
+    out: List[SchemaViolation] = []
+    # (scope, type) -> names
+    scopes: Dict[Tuple[Any, int], List[str]] = {}
+    seen_commands = set()
+    for command in commands:
+        if id(command) in seen_commands:
+            continue
+        seen_commands.add(id(command))
+        out.extend(validate_command(command))
+
+        if command.guild_ids is ALL_GUILDS or getattr(command, "all_guilds", False):
+            guilds: Iterable[Any] = ("every guild",)
+        else:
+            guilds = command.guild_ids or ("global",)
+        for guild in guilds:
+            scopes.setdefault((guild, command.type), []).append(command.name)
+
+    for (scope, type), names in scopes.items():
+        path = scope if isinstance(scope, str) else f"guild {scope}"
+        seen = set()
+        for name in names:
+            if name in seen:
+                out.append(SchemaViolation(path, f"command {name!r} is defined more than once"))
+            seen.add(name)
+        if len(names) > MAX_COMMANDS[type]:
+            out.append(SchemaViolation(path, f"has {len(names)} commands of type {type}, at most {MAX_COMMANDS[type]} are allowed"))
+    return out
+
+
+def check_commands(commands: Iterable[BaseCommand]) -> None:
+    # raises CommandSchemaError with every violation, if there is any
+    violations = validate_commands(commands)
+    if violations:
+        raise CommandSchemaError(violations)
@@ -0,0 +1,85 @@
+"""Measures the import time of the package and the command line tools with ``-X importtime``
+
+Every case runs in a fresh interpreter a few times, the best run is
+reported with the slowest modules it imported. ``--max-ms`` makes it
+exit with an error when a case is slower, to catch regressions like an
+eager import of discord.py in the command line tools.
+
+Usage::
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 10 --max-ms 150
+"""
+
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> (arguments of the interpreter, whether --max-ms applies)
+CASES: Dict[str, Tuple[List[str], bool]] = {
+    "import appcommands": (["-c", "import appcommands"], True),
+    "appcommands --version": (["-m", "appcommands", "--version"], True),
+    "appcommands newcog": (["-m", "appcommands", "newcog", "bench_cog", "{tmp}"], True),
+    # for reference, it imports discord.py
+    "appcommands.Bot": (["-c", "import appcommands; appcommands.Bot"], False),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(args: List[str], tmp: str) -> Tuple[int, List[Tuple[int, str]]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (str(ROOT), os.environ.get("PYTHONPATH")))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *(a.format(tmp=tmp) for a in args)],
+        env=env, cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+
+    total, modules = 0, []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append((int(cumulative_us), name))
+        if len(indent) == 1:
+            # top level import, its cumulative time includes everything below it
+            total += int(cumulative_us)
+    return total, modules
+
+
+def run(args: argparse.Namespace) -> int:
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (case, checked) in CASES.items():
+            best, best_modules = None, []
+            for _ in range(args.runs):
+                total, modules = measure(case, tmp)
+                if best is None or total < best:
+                    best, best_modules = total, modules
+
+            slow = checked and args.max_ms is not None and best / 1000 > args.max_ms
+            failed += slow
+            print(f"{name:<26} {best / 1000:8.1f}ms{'  SLOWER THAN ' + str(args.max_ms) + 'ms' if slow else ''}")
+            for cumulative_us, module in sorted(best_modules, reverse=True)[:args.top]:
+                print(f"  {cumulative_us / 1000:8.1f}ms {module}")
+    return 1 if failed else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure the import time of appcommands")
+    parser.add_argument("--runs", type=int, default=5, help="runs per case, the best is kept (default: 5)")
+    parser.add_argument("--top", type=int, default=5, help="slowest modules shown per case (default: 5)")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when a case not importing discord.py takes longer")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
@@ -0,0 +1,124 @@
+"""Load test for :meth:`appcommands.Bot.register_commands`
+
+Runs a full command sync against :class:`fake_discord.FakeDiscord`
+and reports the wall time, the number of REST requests and the peak
+memory allocated while syncing, and the requests of a second sync
+without changes.
+
+Usage::
+
+    python benchmarks/bench_registration.py
+    python benchmarks/bench_registration.py --guilds 10 1000 --latency 0.005 --rate-limit-every 50
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import discord
+import appcommands
+
+from fake_discord import FakeDiscord
+
+
+def make_bot(global_commands: int, guild_commands: int, bot_role_id: int = 1) -> appcommands.Bot:
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+    for i in range(global_commands):
+        @bot.slashcommand(name=f"global{i}", description=f"Global command {i}")
+        async def _global(ctx, member: discord.Member, reason: str = None, days: int = 0):
+            pass
+
+    for i in range(guild_commands):
+        @bot.slashcommand(name=f"guild{i}", description=f"Guild command {i}", guild_ids=appcommands.ALL_GUILDS)
+        async def _guild(ctx, role: discord.Role, flag: bool = False):
+            pass
+
+        if i == 0:
+            # exercises the permissions sync as well
+            _guild.generate_permissions(allowed_roles=[bot_role_id], disallowed_users=[bot_role_id + 1])
+
+    group = bot.slashgroup(name="admin", description="Admin commands")
+    group.guild_ids = appcommands.ALL_GUILDS
+
+    @group.subcommand(name="kick", description="Kick a member")
+    async def _kick(ctx, member: discord.Member, reason: str = None):
+        pass
+
+    @bot.usercommand(name="info", guild_ids=appcommands.ALL_GUILDS)
+    async def _info(ctx, user):
+        pass
+
+    @bot.messagecommand(name="quote")
+    async def _quote(ctx, message):
+        pass
+
+    return bot
+
+
+async def run(guilds: int, args: argparse.Namespace) -> dict:
+    server = FakeDiscord(
+        guild_count=guilds,
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after
+    )
+    async with server:
+        discord.http.Route.BASE = server.base
+        bot = make_bot(args.global_commands, args.guild_commands)
+        try:
+            await bot.login("fake-token")
+            server.reset_stats()
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            await bot.register_commands()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # nothing changed, the permissions aren't sent again
+            requests = server.requests
+            await bot.register_commands()
+            resync_requests = server.requests - requests
+        finally:
+            await bot.close()
+
+    return {
+        "guilds": guilds,
+        "seconds": elapsed,
+        "requests": requests,
+        "resync_requests": resync_requests,
+        "rate_limited": server.rate_limited,
+        "peak_kib": peak / 1024
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark appcommands command registration")
+    parser.add_argument("--guilds", type=int, nargs="+", default=[10, 1000, 10000], help="guild counts to sync (default: 10 1000 10000)")
+    parser.add_argument("--global-commands", type=int, default=20, help="global slash commands (default: 20)")
+    parser.add_argument("--guild-commands", type=int, default=10, help="slash commands in every guild (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of latency per request (default: 0)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every n-th request with a 429 (default: never)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="retry_after of the 429 responses (default: 0.05)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'guilds':>8} {'seconds':>10} {'requests':>10} {'resync':>8} {'429s':>6} {'peak KiB':>10}")
+    for guilds in args.guilds:
+        result = asyncio.run(run(guilds, args))
+        print("{guilds:>8} {seconds:>10.3f} {requests:>10} {resync_requests:>8} {rate_limited:>6} {peak_kib:>10.1f}".format(**result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Replays recorded interaction traffic into a bot against :class:`fake_discord.FakeDiscord`
+
+Recordings are made with :meth:`appcommands.Bot.record_interactions`.
+The bot is given as ``module:attribute`` and can be a bot or a
+callable returning one, so two versions of a bot can be compared on
+the same command mix.
+
+Usage::
+
+    python benchmarks/bench_replay.py traffic.jsonl.gz mybot:bot --speed 0
+    python benchmarks/bench_replay.py traffic.jsonl.gz mybot:make_bot --speed 10
+"""
+
+import sys
+import asyncio
+import argparse
+import importlib
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import discord
+import appcommands
+
+from fake_discord import FakeDiscord
+
+
+def load_bot(target: str) -> appcommands.Bot:
+    module, _, attribute = target.partition(":")
+    sys.path.insert(0, str(Path.cwd()))
+    obj = getattr(importlib.import_module(module), attribute or "bot")
+    if not isinstance(obj, discord.Client):
+        obj = obj()
+    return obj
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = FakeDiscord(guild_count=args.guilds, latency=args.latency)
+    async with server:
+        discord.http.Route.BASE = server.base
+        bot = load_bot(args.bot)
+        try:
+            await bot.login("fake-token")
+            await bot.register_commands()
+            server.reset_stats()
+
+            replayer = appcommands.InteractionReplayer(bot, args.recording, speed=args.speed or None)
+            await replayer.run()
+        finally:
+            await bot.close()
+
+    rate = replayer.dispatched / replayer.elapsed if replayer.elapsed else 0
+    print(f"interactions: {replayer.dispatched}")
+    print(f"errors:       {len(replayer.errors)}")
+    print(f"seconds:      {replayer.elapsed:.3f} ({rate:.1f}/s)")
+    print(f"requests:     {server.requests} ({server.requests / max(replayer.dispatched, 1):.2f} per interaction)")
+    for (method, route), count in server.routes.most_common():
+        print(f"  {count:>8} {method} {route}")
+    for error in replayer.errors[:5]:
+        print(f"error: {error!r}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded interactions into a bot")
+    parser.add_argument("recording", help="the .jsonl.gz recording")
+    parser.add_argument("bot", help="the bot, or a factory of it, as module:attribute")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier, 0 for as fast as possible (default: 1)")
+    parser.add_argument("--guilds", type=int, default=10, help="guilds of the fake API (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of latency per request (default: 0)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
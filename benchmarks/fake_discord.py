@@ -0,0 +1,394 @@
+"""An in-process stand-in for the Discord REST API.
+
+Only the routes touched by :meth:`appcommands.Bot.register_commands`
+are implemented, that is the application commands routes (global and
+guild), their permissions routes, and the few ``/users/@me`` and
+``/oauth2`` routes needed for :meth:`discord.Client.login`, plus the
+interaction response, webhook and channel message routes used by
+command callbacks.
+
+Example
+---------
+
+.. code-block:: python3
+
+    server = FakeDiscord(guild_count=1000, latency=0.01)
+    async with server:
+        discord.http.Route.BASE = server.base
+        ...
+"""
+
+import json
+import asyncio
+import itertools
+import collections
+
+from aiohttp import web
+from typing import Any, Dict, List, Optional
+
+
+__all__ = (
+    "FakeDiscord",
+)
+
+
+def _json_response(data: Any, *, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json,
+    # aiohttp's json_response appends a charset to it
+    headers = dict(headers or {})
+    headers["Content-Type"] = "application/json"
+    return web.Response(body=json.dumps(data).encode("utf-8"), status=status, headers=headers)
+
+
+class FakeDiscord:
+    """A fake application-commands REST server
+
+    Parameters
+    ------------
+    application_id: :class:`~int`
+        The id of the fake application (and its bot user)
+    guild_count: :class:`~int`
+        The number of guilds the bot is in
+    latency: :class:`~float`
+        Seconds slept before answering every request
+    rate_limit_every: :class:`~int`
+        Answer every n-th request with a ``429``, ``0`` disables it
+    retry_after: :class:`~float`
+        The ``retry_after`` sent with the ``429`` responses
+    global_rate_limit: :class:`~bool`
+        Whether the ``429`` responses are global ones
+    bucket_limit: :class:`~int`
+        The ``X-RateLimit-Limit`` advertised for every route
+
+    Attributes
+    ------------
+    requests: :class:`~int`
+        The number of requests served, rate limited ones included
+    rate_limited: :class:`~int`
+        The number of requests answered with a ``429``
+    routes: :class:`collections.Counter`
+        The number of requests per ``(method, route)``
+    """
+    def __init__(
+        self,
+        *,
+        application_id: int = 100000000000000000,
+        guild_count: int = 10,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.05,
+        global_rate_limit: bool = False,
+        bucket_limit: int = 1000,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ) -> None:
+        self.application_id: int = application_id
+        self.latency: float = latency
+        self.rate_limit_every: int = rate_limit_every
+        self.retry_after: float = retry_after
+        self.global_rate_limit: bool = global_rate_limit
+        self.bucket_limit: int = bucket_limit
+        self.host: str = host
+        self.port: int = port
+
+        self.requests: int = 0
+        self.rate_limited: int = 0
+        self.routes: collections.Counter = collections.Counter()
+
+        self.guild_ids: List[int] = [application_id + 1 + i for i in range(guild_count)]
+        self.global_commands: Dict[str, dict] = {}
+        self.guild_commands: Dict[int, Dict[str, dict]] = {}
+        self.permissions: Dict[int, Dict[str, dict]] = {}
+
+        self._ids = itertools.count(application_id * 2)
+        self._runner: Optional[web.AppRunner] = None
+
+        app = web.Application(middlewares=[self._middleware])
+        prefix = "/api/{version}"
+        app.router.add_get(prefix + "/users/@me", self.get_me)
+        app.router.add_get(prefix + "/users/@me/guilds", self.get_guilds)
+        app.router.add_get(prefix + "/oauth2/applications/@me", self.get_application)
+        app.router.add_get(prefix + "/applications/{app_id}/commands", self.get_global_commands)
+        app.router.add_put(prefix + "/applications/{app_id}/commands", self.bulk_upsert_global_commands)
+        app.router.add_get(prefix + "/applications/{app_id}/guilds/{guild_id}/commands", self.get_guild_commands)
+        app.router.add_put(prefix + "/applications/{app_id}/guilds/{guild_id}/commands", self.bulk_upsert_guild_commands)
+        app.router.add_get(prefix + "/applications/{app_id}/guilds/{guild_id}/commands/permissions", self.get_permissions)
+        app.router.add_put(prefix + "/applications/{app_id}/guilds/{guild_id}/commands/permissions", self.bulk_edit_permissions)
+        app.router.add_get(prefix + "/applications/{app_id}/guilds/{guild_id}/commands/{command_id}/permissions", self.get_command_permissions)
+        app.router.add_put(prefix + "/applications/{app_id}/guilds/{guild_id}/commands/{command_id}/permissions", self.edit_command_permissions)
+        app.router.add_post(prefix + "/interactions/{interaction_id}/{token}/callback", self.interaction_callback)
+        app.router.add_post(prefix + "/webhooks/{app_id}/{token}", self.create_message)
+        app.router.add_route("*", prefix + "/webhooks/{app_id}/{token}/messages/{message_id}", self.webhook_message)
+        app.router.add_post(prefix + "/channels/{channel_id}/messages", self.create_message)
+        app.router.add_get(prefix + "/users/{user_id:\\d+}", self.get_user)
+        app.router.add_get(prefix + "/guilds/{guild_id}/members/{user_id}", self.get_member)
+        self.app: web.Application = app
+
+    @property
+    def base(self) -> str:
+        """:class:`~str`: The value to use for :attr:`discord.http.Route.BASE`"""
+        return f"http://{self.host}:{self.port}/api/v10"
+
+    async def start(self) -> str:
+        """|coro|
+
+        Starts the server and returns its :attr:`base`"""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.base
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the server"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'FakeDiscord':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def reset_stats(self) -> None:
+        """Resets the request counters"""
+        self.requests = 0
+        self.rate_limited = 0
+        self.routes.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.Response:
+        self.requests += 1
+        route = request.match_info.route.resource
+        route = route.canonical if route else request.path
+        self.routes[(request.method, route)] += 1
+        bucket = f"{request.method}:{route}"
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.bucket_limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset-After": str(self.retry_after),
+                "X-RateLimit-Bucket": bucket,
+                "Retry-After": str(self.retry_after),
+                # discord.py treats a 429 without this header as a Cloudflare ban
+                "Via": "1.1 google"
+            }
+            if self.global_rate_limit:
+                headers["X-RateLimit-Global"] = "true"
+            else:
+                headers["X-RateLimit-Scope"] = "user"
+
+            return _json_response(
+                {"message": "You are being rate limited.", "retry_after": self.retry_after, "global": self.global_rate_limit},
+                status=429,
+                headers=headers
+            )
+
+        response = await handler(request)
+        response.headers["X-RateLimit-Limit"] = str(self.bucket_limit)
+        response.headers["X-RateLimit-Remaining"] = str(self.bucket_limit - 1)
+        response.headers["X-RateLimit-Reset-After"] = "1"
+        response.headers["X-RateLimit-Bucket"] = bucket
+        return response
+
+    def _user(self) -> Dict[str, Any]:
+        return {
+            "id": str(self.application_id),
+            "username": "fake-bot",
+            "discriminator": "0000",
+            "avatar": None,
+            "bot": True,
+            "flags": 0,
+            "verified": True,
+            "mfa_enabled": False
+        }
+
+    def _upsert(self, current: Dict[str, dict], payload: List[dict], guild_id: Optional[int] = None) -> List[dict]:
+        # Discord replaces the whole list, keeping ids of commands with a same (name, type)
+        new = {}
+        for data in payload:
+            type = data.get("type", 1)
+            key = f"{type}:{data['name']}"
+            old = current.get(key)
+            command = {
+                "id": str(data.get("id") or (old["id"] if old else next(self._ids))),
+                "application_id": str(self.application_id),
+                "version": str(next(self._ids)),
+                "default_permission": data.get("default_permission", True),
+                "type": type,
+                "name": data["name"],
+                "description": data.get("description", ""),
+                "options": data.get("options", [])
+            }
+            if guild_id is not None:
+                command["guild_id"] = str(guild_id)
+            new[key] = command
+
+        current.clear()
+        current.update(new)
+        return list(new.values())
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return _json_response(self._user())
+
+    async def get_application(self, request: web.Request) -> web.Response:
+        return _json_response({
+            "id": str(self.application_id),
+            "name": "fake-application",
+            "icon": None,
+            "description": "",
+            "rpc_origins": [],
+            "bot_public": True,
+            "bot_require_code_grant": False,
+            "owner": self._user(),
+            "summary": "",
+            "verify_key": "0" * 64,
+            "flags": 0
+        })
+
+    async def get_guilds(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get("limit", 200))
+        ids = self.guild_ids
+        if "before" in request.query:
+            before = int(request.query["before"])
+            ids = [i for i in ids if i < before][-limit:]
+        else:
+            after = int(request.query.get("after", 0))
+            ids = [i for i in ids if i > after][:limit]
+
+        return _json_response([
+            {"id": str(i), "name": f"guild-{i}", "icon": None, "owner": False, "permissions": "0", "features": []}
+            for i in ids
+        ])
+
+    async def get_global_commands(self, request: web.Request) -> web.Response:
+        return _json_response(list(self.global_commands.values()))
+
+    async def bulk_upsert_global_commands(self, request: web.Request) -> web.Response:
+        payload = await request.json(loads=json.loads)
+        return _json_response(self._upsert(self.global_commands, payload))
+
+    def _guild(self, request: web.Request) -> int:
+        guild_id = int(request.match_info["guild_id"])
+        if guild_id not in self.guild_ids:
+            raise web.HTTPForbidden(
+                body=json.dumps({"message": "Missing Access", "code": 50001}).encode("utf-8"),
+                headers={"Content-Type": "application/json"}
+            )
+        return guild_id
+
+    async def get_guild_commands(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        return _json_response(list(self.guild_commands.get(guild_id, {}).values()))
+
+    async def bulk_upsert_guild_commands(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        payload = await request.json(loads=json.loads)
+        current = self.guild_commands.setdefault(guild_id, {})
+        return _json_response(self._upsert(current, payload, guild_id))
+
+    def _permissions(self, guild_id: int, command_id: str, permissions: List[dict]) -> dict:
+        return {
+            "id": command_id,
+            "application_id": str(self.application_id),
+            "guild_id": str(guild_id),
+            "permissions": permissions
+        }
+
+    async def get_permissions(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        return _json_response(list(self.permissions.get(guild_id, {}).values()))
+
+    async def bulk_edit_permissions(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        payload = await request.json(loads=json.loads)
+        current = self.permissions[guild_id] = {}
+        for data in payload:
+            current[str(data["id"])] = self._permissions(guild_id, str(data["id"]), data["permissions"])
+
+        return _json_response(list(current.values()))
+
+    async def get_command_permissions(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        command_id = request.match_info["command_id"]
+        data = self.permissions.get(guild_id, {}).get(command_id)
+        if data is None:
+            raise web.HTTPNotFound(
+                body=json.dumps({"message": "Unknown application command permissions", "code": 10066}).encode("utf-8"),
+                headers={"Content-Type": "application/json"}
+            )
+        return _json_response(data)
+
+    async def edit_command_permissions(self, request: web.Request) -> web.Response:
+        guild_id = self._guild(request)
+        command_id = request.match_info["command_id"]
+        payload = await request.json(loads=json.loads)
+        data = self._permissions(guild_id, command_id, payload["permissions"])
+        self.permissions.setdefault(guild_id, {})[command_id] = data
+        return _json_response(data)
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        user_id = request.match_info["user_id"]
+        return _json_response({"id": user_id, "username": f"user-{user_id}", "discriminator": "0000", "avatar": None})
+
+    async def get_member(self, request: web.Request) -> web.Response:
+        user_id = request.match_info["user_id"]
+        return _json_response({
+            "user": {"id": user_id, "username": f"user-{user_id}", "discriminator": "0000", "avatar": None},
+            "roles": [],
+            "joined_at": "2021-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False
+        })
+
+    def _message(self, request: web.Request, payload: Optional[dict] = None) -> dict:
+        payload = payload or {}
+        return {
+            "id": str(next(self._ids)),
+            "channel_id": request.match_info.get("channel_id", str(self.application_id)),
+            "author": self._user(),
+            "content": payload.get("content") or "",
+            "timestamp": "2021-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "pinned": False,
+            "type": 0,
+            "flags": payload.get("flags", 0)
+        }
+
+    async def _payload(self, request: web.Request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json(loads=json.loads)
+        if request.content_type == "multipart/form-data":
+            async for part in await request.multipart():
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+        return {}
+
+    async def interaction_callback(self, request: web.Request) -> web.Response:
+        await self._payload(request)
+        return web.Response(status=204)
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        return _json_response(self._message(request, await self._payload(request)))
+
+    async def webhook_message(self, request: web.Request) -> web.Response:
+        if request.method == "DELETE":
+            return web.Response(status=204)
+        payload = await self._payload(request) if request.method == "PATCH" else {}
+        return _json_response(self._message(request, payload))
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+from appcommands import Choice, CompletionIndex
+
+
+def test_prefix_matches_first():
+    index = CompletionIndex(["banana", "Apple", "apricot", "grape"])
+    names = [c.name for c in index.complete("ap")]
+    assert names[:2] == ["Apple", "apricot"]
+
+
+def test_fuzzy_matches_typos():
+    index = CompletionIndex(["strawberry", "blueberry", "cherry"])
+    assert index.complete("strawbery")[0].name == "strawberry"
+
+
+def test_contains_by_name():
+    index = CompletionIndex(["Apple", Choice("Pear", "p")])
+    assert "apple" in index
+    assert "PEAR" in index
+    assert "p" not in index
+    assert "plum" not in index
+
+
+def test_refresh_builds_in_executor():
+    threads = []
+    index = CompletionIndex(["old"], refresh=lambda: ["new", "newer"])
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        real = loop.run_in_executor
+
+        def run_in_executor(executor, func, *args):
+            threads.append(func)
+            return real(executor, func, *args)
+
+        loop.run_in_executor = run_in_executor
+        return await index(None, "ne")
+
+    assert [c.name for c in asyncio.run(main())] == ["new", "newer"]
+    from appcommands.autocomplete import _build
+    assert _build in threads
+    assert "old" not in index
+
+
+def test_slow_refresh_doesnt_delay_first_completion(monkeypatch):
+    monkeypatch.setattr("appcommands.autocomplete.FIRST_REFRESH_TIMEOUT", 0.05)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return ["fresh"]
+
+    index = CompletionIndex(["stale"], refresh=slow)
+
+    async def main():
+        first = await index(None, "st")
+        release.set()
+        await index._task
+        return first, await index(None, "fr")
+
+    first, later = asyncio.run(main())
+    assert [c.name for c in first] == ["stale"]
+    assert [c.name for c in later] == ["fresh"]
+
+
+def test_failed_refresh_keeps_candidates():
+    def broken():
+        raise RuntimeError("down")
+
+    index = CompletionIndex(["kept"], refresh=broken)
+    assert [c.name for c in asyncio.run(index(None, "ke"))] == ["kept"]
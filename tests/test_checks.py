@@ -0,0 +1,67 @@
+import asyncio
+
+import discord
+import pytest
+
+import appcommands
+from appcommands.testing import TestClient
+
+
+@pytest.fixture
+def bot():
+    return appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def test_compiled_when_added(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    @appcommands.check(lambda ctx: True)
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    assert ping._compiled is not None
+    assert ping._compiled[1] == ping.checks
+
+
+def test_chain_order(bot):
+    order = []
+    bot.add_check(lambda ctx: order.append("bot") or True)
+    group = bot.slashgroup(name="group", description="A group")
+    group.add_check(lambda ctx: order.append("group") or True)
+
+    @group.subcommand(name="sub", description="A subcommand")
+    @appcommands.check(lambda ctx: order.append("command") or True)
+    async def sub(ctx):
+        await ctx.send("ok")
+
+    asyncio.run(TestClient(bot).slash("group sub"))
+    assert order == ["bot", "group", "command"]
+
+
+def test_recompiled_after_add_check(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    client = TestClient(bot)
+    asyncio.run(client.slash("ping"))
+    bot.add_check(lambda ctx: False)
+    with pytest.raises(appcommands.CheckFailure):
+        asyncio.run(client.slash("ping"))
+
+
+def test_cached_check(bot):
+    calls = []
+
+    async def predicate(ctx):
+        calls.append(ctx.author.id)
+        return True
+
+    @bot.slashcommand(name="ping", description="Pong")
+    @appcommands.check(predicate, cache_ttl=60)
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    client = TestClient(bot)
+    for _ in range(3):
+        asyncio.run(client.slash("ping"))
+    assert len(calls) == 1
@@ -0,0 +1,63 @@
+import asyncio
+import types
+
+import discord
+import pytest
+
+import appcommands
+from appcommands.core import get_ctx_kw
+from appcommands.enums import OptionType
+
+
+@pytest.mark.parametrize("prefix", [None, ""])
+def test_interactions_only_positional_prefix(prefix):
+    bot = appcommands.Bot(prefix)
+    assert bot.interactions_only
+    assert bot.intents == appcommands.Bot.interactions_intents()
+
+
+def test_prefix_kept():
+    bot = appcommands.Bot("!", intents=discord.Intents.none())
+    assert not bot.interactions_only
+    assert bot.command_prefix == "!"
+
+
+def context(bot, guild, resolved):
+    async def fail(*args):
+        raise AssertionError("fetched over REST")
+
+    if guild is not None:
+        guild.get_member = lambda id: None
+        guild.fetch_member = fail
+    bot.fetch_user = fail
+    return types.SimpleNamespace(
+        bot=bot,
+        command=types.SimpleNamespace(validators={}, converters={}),
+        data=types.SimpleNamespace(
+            raw_options=[{"name": "user", "type": OptionType.USER.value, "value": "5"}],
+            resolved=resolved
+        ),
+        guild=guild,
+        _state=bot._connection
+    )
+
+
+USER = {"id": "5", "username": "someone", "discriminator": "0001", "avatar": None}
+
+
+def test_member_from_resolved():
+    bot = appcommands.Bot(None)
+    guild = types.SimpleNamespace(id=1)
+    resolved = {"users": {"5": USER}, "members": {"5": {"roles": [], "nick": "nick", "joined_at": None}}}
+
+    value = asyncio.run(get_ctx_kw(context(bot, guild, resolved), ["user"]))["user"]
+    assert isinstance(value, discord.Member)
+    assert (value.id, value.nick, value.guild) == (5, "nick", guild)
+
+
+def test_user_from_resolved():
+    bot = appcommands.Bot(None)
+
+    value = asyncio.run(get_ctx_kw(context(bot, None, {"users": {"5": USER}}), ["user"]))["user"]
+    assert isinstance(value, discord.User)
+    assert value.name == "someone"
@@ -0,0 +1,144 @@
+import asyncio
+import enum
+from typing import Literal, Optional, Union
+
+import discord
+import pytest
+
+import appcommands
+from appcommands import converters
+from appcommands.enums import OptionType
+from appcommands.testing import TestClient
+
+try:
+    from typing import Annotated
+except ImportError:  # 3.8
+    Annotated = None
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Color(enum.Enum):
+    red = "r"
+    blue = "b"
+
+
+@pytest.fixture
+def bot():
+    return appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def options(cmd):
+    return {o["name"]: o for o in cmd.to_dict()["options"]}
+
+
+@pytest.mark.parametrize("annotation, type", [
+    (str, OptionType.STRING),
+    (int, OptionType.INTEGER),
+    (bool, OptionType.BOOLEAN),
+    (float, OptionType.FLOAT),
+    (Optional[int], OptionType.INTEGER),
+    (discord.Member, OptionType.USER),
+    (discord.TextChannel, OptionType.CHANNEL),
+    (discord.Attachment, OptionType.ATTACHMENT),
+    (Union[discord.Member, discord.Role], OptionType.MENTIONABLE),
+])
+def test_option_types(annotation, type):
+    assert converters.get_converter(annotation).type is type
+
+
+def test_memoized():
+    assert converters.get_converter(Optional[str]) is converters.get_converter(Optional[str])
+    assert converters.get_converter(object) is None
+
+
+def test_register_converter(bot):
+    class Day(str):
+        pass
+
+    appcommands.register_converter(Day, OptionType.STRING, lambda value: Day(value.upper()))
+    try:
+        @bot.slashcommand(name="remind", description="Sets a reminder")
+        async def remind(ctx, day: Day):
+            await ctx.send(day)
+
+        assert options(remind)["day"]["type"] == OptionType.STRING
+        result = run(TestClient(bot).slash("remind", day="mon"))
+        assert result.context.kwargs["day"] == "MON"
+    finally:
+        converters._registry.pop(Day)
+        converters._cache.clear()
+
+
+def test_enum_choices(bot):
+    @bot.slashcommand(name="paint", description="Paints")
+    async def paint(ctx, color: Color):
+        await ctx.send(color.name)
+
+    option = options(paint)["color"]
+    assert option["type"] == OptionType.STRING
+    assert option["choices"] == [{"name": "red", "value": "r"}, {"name": "blue", "value": "b"}]
+
+    result = run(TestClient(bot).slash("paint", color="b"))
+    assert result.context.kwargs["color"] is Color.blue
+    with pytest.raises(appcommands.InvalidOptionValue):
+        run(TestClient(bot).slash("paint", color="green"))
+
+
+def test_literal_choices(bot):
+    @bot.slashcommand(name="roll", description="Rolls dice")
+    async def roll(ctx, sides: Literal[4, 6, 20] = 6):
+        await ctx.send(str(sides))
+
+    option = options(roll)["sides"]
+    assert option["type"] == OptionType.INTEGER
+    assert [c["value"] for c in option["choices"]] == [4, 6, 20]
+
+    assert run(TestClient(bot).slash("roll", sides=20)).context.kwargs["sides"] == 20
+    with pytest.raises(appcommands.InvalidOptionValue):
+        run(TestClient(bot).slash("roll", sides=7))
+
+
+@pytest.mark.skipif(Annotated is None, reason="typing.Annotated needs python 3.9")
+def test_constraints(bot):
+    @bot.slashcommand(name="buy", description="Buys things")
+    async def buy(
+        ctx,
+        amount: Annotated[int, appcommands.Option(min_value=1, max_value=10)],
+        code: Annotated[str, appcommands.Option(min_length=2, max_length=4)] = "ab"
+    ):
+        await ctx.send("ok")
+
+    amount, code = options(buy)["amount"], options(buy)["code"]
+    assert (amount["min_value"], amount["max_value"]) == (1, 10)
+    assert (code["min_length"], code["max_length"]) == (2, 4)
+    assert "min_length" not in amount
+
+    client = TestClient(bot)
+    assert run(client.slash("buy", amount=10, code="abcd")).sent
+    for values in ({"amount": 0}, {"amount": 11}, {"amount": 5, "code": "a"}, {"amount": 5, "code": "abcde"}):
+        with pytest.raises(appcommands.InvalidOptionValue):
+            run(client.slash("buy", **values))
+
+
+def test_choices_spill_into_autocomplete(bot):
+    names = tuple(f"item{i:02}" for i in range(30))
+
+    @bot.slashcommand(name="pick", description="Picks an item")
+    async def pick(ctx, item: Literal[names]):
+        await ctx.send(item)
+
+    option = options(pick)["item"]
+    assert option["autocomplete"] is True
+    assert option["choices"] == []
+
+    client = TestClient(bot)
+    result = run(client.autocomplete("pick", "item", "item2"))
+    # prefix matches first, then the fuzzy ones
+    assert [c.name for c in result.calls[0].args[0]][:10] == [f"item2{i}" for i in range(10)]
+
+    assert run(client.slash("pick", item="item29")).context.kwargs["item"] == "item29"
+    with pytest.raises(appcommands.InvalidOptionValue):
+        run(client.slash("pick", item="item30"))
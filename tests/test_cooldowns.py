@@ -0,0 +1,118 @@
+import asyncio
+import types
+
+import pytest
+from discord.ext.commands import BucketType
+
+from appcommands import Cooldown, MaxConcurrency
+from appcommands import cooldowns
+
+
+def interaction(user=1, guild=None, channel=2):
+    return types.SimpleNamespace(user=types.SimpleNamespace(id=user), guild_id=guild, channel_id=channel)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cooldowns.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_keys():
+    i = interaction(user=1, guild=3, channel=2)
+    assert cooldowns.bucket_key(BucketType.default, i) is None
+    assert cooldowns.bucket_key(BucketType.user, i) == 1
+    assert cooldowns.bucket_key(BucketType.member, i) == (3, 1)
+    assert cooldowns.bucket_key(BucketType.guild, i) == 3
+    assert cooldowns.bucket_key(BucketType.guild, interaction(user=1)) == 1
+    assert cooldowns.bucket_key(BucketType.channel, i) == 2
+    with pytest.raises(ValueError):
+        Cooldown(1, 1, BucketType.role)
+
+
+def test_refill(clock):
+    cooldown = Cooldown(2, 10, BucketType.user)
+    assert cooldown.update(interaction()) is None
+    assert cooldown.update(interaction()) is None
+    assert cooldown.update(interaction()) == pytest.approx(5)
+    # other buckets aren't touched
+    assert cooldown.update(interaction(user=2)) is None
+
+    # one use comes back every per / rate seconds
+    clock[0] += 5
+    assert cooldown.update(interaction()) is None
+    assert cooldown.update(interaction()) == pytest.approx(5)
+
+    clock[0] += 20
+    assert cooldown.update(interaction()) is None
+    assert cooldown.update(interaction()) is None
+    assert cooldown.update(interaction()) is not None
+
+
+def test_least_recently_used_evicted(clock):
+    cooldown = Cooldown(1, 60, BucketType.user, maxsize=4)
+    for user in range(4):
+        cooldown.update(interaction(user=user))
+    # used again, so it's the most recently used
+    cooldown.update(interaction(user=0))
+    cooldown.update(interaction(user=4))
+    assert list(cooldown._buckets) == [3, 0, 4]
+
+
+def test_full_buckets_evicted_first(clock):
+    cooldown = Cooldown(1, 10, BucketType.user, maxsize=4)
+    for user in range(3):
+        cooldown.update(interaction(user=user))
+    clock[0] += 20
+    cooldown.update(interaction(user=3))
+    cooldown.update(interaction(user=4))
+    assert list(cooldown._buckets) == [3, 4]
+
+
+def test_max_concurrency_refuses():
+    limit = MaxConcurrency(1, BucketType.user)
+
+    async def main():
+        assert await limit.acquire(1)
+        assert not await limit.acquire(1)
+        assert await limit.acquire(2)
+        limit.release(1)
+        limit.release(2)
+
+    asyncio.run(main())
+    assert limit._counts == {} and limit._waiters == {}
+
+
+def test_max_concurrency_wakes_waiters_in_order():
+    limit = MaxConcurrency(1, wait=True)
+    order = []
+
+    async def run(name):
+        await limit.acquire(None)
+        order.append(name)
+        await asyncio.sleep(0)
+        limit.release(None)
+
+    async def main():
+        await asyncio.gather(run("a"), run("b"), run("c"))
+
+    asyncio.run(main())
+    assert order == ["a", "b", "c"]
+    assert limit._counts == {} and limit._waiters == {}
+
+
+def test_max_concurrency_cancelled_waiter():
+    limit = MaxConcurrency(1, wait=True)
+
+    async def main():
+        await limit.acquire(None)
+        waiter = asyncio.create_task(limit.acquire(None))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limit.release(None)
+
+    asyncio.run(main())
+    assert limit._counts == {} and limit._waiters == {}
@@ -0,0 +1,115 @@
+import asyncio
+import copy
+
+import discord
+import pytest
+
+import appcommands
+from appcommands import InteractionData
+from appcommands.enums import OptionType
+from appcommands.testing import TestClient
+
+
+GROUP_DATA = {
+    "id": "7",
+    "name": "tag",
+    "type": 1,
+    "options": [{
+        "name": "manage",
+        "type": OptionType.SUB_COMMAND_GROUP.value,
+        "options": [{
+            "name": "edit",
+            "type": OptionType.SUB_COMMAND.value,
+            "options": [
+                {"name": "name", "type": OptionType.STRING.value, "value": "faq"},
+                {"name": "owner", "type": OptionType.USER.value, "value": "5", "focused": True},
+            ]
+        }]
+    }],
+    "resolved": {"users": {"5": {"id": "5", "username": "someone", "discriminator": "0001", "avatar": None}}}
+}
+
+
+def test_path_and_options():
+    data = InteractionData(GROUP_DATA)
+    assert (data.id, data.type) == (7, 1)
+    assert data.path == ("tag", "manage", "edit")
+    assert data.name == "edit"
+    assert [o["name"] for o in data.raw_options] == ["name", "owner"]
+    assert [(o.name, o.value) for o in data.options] == [("name", "faq"), ("owner", "5")]
+
+
+def test_focused_and_resolved():
+    data = InteractionData(GROUP_DATA)
+    assert data.focused["name"] == "owner"
+    assert data.resolved["users"]["5"]["username"] == "someone"
+
+    plain = InteractionData({"id": "1", "name": "ping", "type": 1})
+    assert plain.path == ("ping",)
+    assert plain.raw_options == []
+    assert plain.focused is None
+    assert plain.resolved == {}
+
+
+def test_raw_data_not_mutated():
+    raw = copy.deepcopy(GROUP_DATA)
+    data = InteractionData(raw)
+    data.path, data.options, data.focused
+    assert raw == GROUP_DATA
+    assert data.raw is raw
+
+
+def test_invocation_leaves_interaction_data():
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+    group = bot.slashgroup(name="tag", description="Tags")
+
+    @group.subcommand(name="show", description="Shows a tag")
+    async def show(ctx, name: str):
+        await ctx.send(name)
+
+    result = asyncio.run(TestClient(bot).slash("tag show", name="faq"))
+    raw = result.context.interaction.data
+    assert result.context.data.raw is raw
+    assert "bot" not in raw
+    assert result.context.data.path == ("tag", "show")
+
+
+@pytest.fixture
+def bot():
+    return appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def test_respond_does_not_fetch(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    async def ping(ctx):
+        message = await ctx.respond("pong")
+        assert isinstance(message, appcommands.ResponseMessage)
+        assert message.message is None
+        with pytest.raises(AttributeError, match="await the ResponseMessage"):
+            message.content
+        await message.edit(content="pong!")
+
+    result = asyncio.run(TestClient(bot).slash("ping"))
+    assert [c.method for c in result.calls] == ["send_message", "edit_original_message"]
+
+
+def test_fetched_once(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    async def ping(ctx):
+        message = await ctx.respond("pong")
+        fetched = await message
+        assert await message.fetch() is fetched
+        assert message.content == "pong"
+
+    result = asyncio.run(TestClient(bot).slash("ping"))
+    assert [c.method for c in result.calls] == ["send_message", "original_message"]
+
+
+def test_fetch_opt_in(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    async def ping(ctx):
+        message = await ctx.respond("pong", fetch=True)
+        assert message.content == "pong"
+
+    result = asyncio.run(TestClient(bot).slash("ping"))
+    assert [c.method for c in result.calls] == ["send_message", "original_message"]
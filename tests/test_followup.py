@@ -0,0 +1,178 @@
+import asyncio
+import datetime
+import types
+
+import discord
+import pytest
+
+import appcommands
+from appcommands import FollowupQueue
+from appcommands.testing import TestClient
+
+
+@pytest.fixture
+def bot():
+    return appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def test_batch_joins_messages(bot):
+    @bot.slashcommand(name="lines", description="Sends lines")
+    async def lines(ctx):
+        async with ctx.batch() as batch:
+            for i in range(5):
+                await ctx.send(f"line {i}")
+        ctx.kwargs["coalesced"] = batch.coalesced
+
+    result = asyncio.run(TestClient(bot).slash("lines"))
+    assert [c.kwargs["content"] for c in result.sent] == ["line 0\nline 1\nline 2\nline 3\nline 4"]
+    assert result.context.kwargs["coalesced"] == 4
+
+
+def test_timed_flush_error_is_raised(bot):
+    @bot.slashcommand(name="broken", description="Fails to send")
+    async def broken(ctx):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("send failed")
+
+        ctx._send = fail
+        async with ctx.batch(interval=0.01):
+            await ctx.send("lost")
+            await asyncio.sleep(0.05)
+            with pytest.raises(RuntimeError, match="send failed"):
+                await ctx.send("next")
+            del ctx._send
+            await ctx.send("again")
+
+    result = asyncio.run(TestClient(bot).slash("broken"))
+    assert [c.kwargs["content"] for c in result.sent] == ["again"]
+
+
+def test_timed_flush_error_is_raised_at_the_end(bot):
+    @bot.slashcommand(name="broken", description="Fails to send")
+    async def broken(ctx):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("send failed")
+
+        ctx._send = fail
+        async with ctx.batch(interval=0.01):
+            await ctx.send("lost")
+            await asyncio.sleep(0.05)
+
+    with pytest.raises(RuntimeError, match="send failed"):
+        asyncio.run(TestClient(bot).slash("broken"))
+
+
+def test_block_error_kept_when_flush_fails(bot):
+    @bot.slashcommand(name="broken", description="Fails twice")
+    async def broken(ctx):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("send failed")
+
+        ctx._send = fail
+        async with ctx.batch():
+            await ctx.send("buffered")
+            raise ValueError("block failed")
+
+    with pytest.raises(ValueError, match="block failed"):
+        asyncio.run(TestClient(bot).slash("broken"))
+
+
+def test_buffer_sent_when_block_fails(bot):
+    @bot.slashcommand(name="partial", description="Fails after sending")
+    async def partial(ctx):
+        with pytest.raises(ValueError):
+            async with ctx.batch():
+                await ctx.send("done so far")
+                raise ValueError("block failed")
+
+    result = asyncio.run(TestClient(bot).slash("partial"))
+    assert [c.kwargs["content"] for c in result.sent] == ["done so far"]
+
+
+class Sender:
+    def __init__(self, name, calls, error=None):
+        self.name, self.calls, self.error = name, calls, error
+
+    async def send(self, **kwargs):
+        self.calls.append((self.name, kwargs))
+        if self.error is not None:
+            raise self.error
+        return types.SimpleNamespace(content=kwargs.get("content"))
+
+
+def interaction(webhook_error=None, age=datetime.timedelta()):
+    calls = []
+    return types.SimpleNamespace(
+        id=1,
+        created_at=discord.utils.utcnow() - age,
+        followup=Sender("followup", calls, webhook_error),
+        channel=Sender("channel", calls),
+        calls=calls
+    )
+
+
+def not_found(code):
+    return discord.NotFound(types.SimpleNamespace(status=404, reason="Not Found"), {"code": code, "message": "Unknown"})
+
+
+def test_queue_joins_text():
+    fake = interaction()
+    queue = FollowupQueue(fake)
+
+    async def main():
+        return await asyncio.gather(
+            queue.send("a"), queue.send("b"), queue.send("c", ephemeral=True), queue.send(embed=discord.Embed())
+        )
+
+    messages = asyncio.run(main())
+    assert [kwargs.get("content") for _, kwargs in fake.calls] == ["a\nb", "c", None]
+    assert all(kwargs["wait"] for _, kwargs in fake.calls)
+    assert messages[0] is messages[1]
+    assert queue.coalesced == 1
+
+
+def test_queue_keeps_long_messages_apart():
+    fake = interaction()
+    queue = FollowupQueue(fake)
+
+    async def main():
+        await asyncio.gather(queue.send("a" * 1500), queue.send("b" * 1500))
+
+    asyncio.run(main())
+    assert len(fake.calls) == 2 and queue.coalesced == 0
+
+
+def test_expired_token_uses_channel():
+    fake = interaction(age=datetime.timedelta(minutes=16))
+    queue = FollowupQueue(fake)
+    assert queue.expired
+
+    asyncio.run(queue.send("late", username="bot"))
+    assert fake.calls == [("channel", {"content": "late"})]
+
+
+def test_unknown_webhook_uses_channel():
+    fake = interaction(webhook_error=not_found(10015))
+    queue = FollowupQueue(fake)
+
+    async def main():
+        await queue.send("first")
+        await queue.send("second")
+
+    asyncio.run(main())
+    assert [name for name, _ in fake.calls] == ["followup", "channel", "channel"]
+    assert queue.expired
+
+
+def test_other_not_found_raised():
+    fake = interaction(webhook_error=not_found(10008))
+    with pytest.raises(discord.NotFound):
+        asyncio.run(FollowupQueue(fake).send("gone"))
+    assert [name for name, _ in fake.calls] == ["followup"]
+
+
+def test_expired_ephemeral_raises():
+    fake = interaction(age=datetime.timedelta(minutes=16))
+    with pytest.raises(appcommands.InteractionExpired):
+        asyncio.run(FollowupQueue(fake).send("secret", ephemeral=True))
+    assert fake.calls == []
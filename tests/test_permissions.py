@@ -0,0 +1,65 @@
+import asyncio
+
+import discord
+import pytest
+
+import appcommands
+from appcommands import CommandPermissions
+from appcommands.testing import TestClient
+
+
+def test_merge():
+    permissions = CommandPermissions(allowed_roles=[1])
+    merged = permissions.merge(allowed_roles=["2"], denied_users=[3])
+    assert merged.allowed_roles == {1, 2}
+    assert merged.denied_users == {3}
+    # a new object, the first one is left as it is
+    assert permissions.allowed_roles == {1} and not permissions.denied_users
+
+
+def test_payload_round_trip():
+    permissions = CommandPermissions(allowed_roles=[2, 1], allowed_users=[5], denied_roles=[3], denied_users=[4])
+    payload = permissions.to_payload()
+    assert payload == [
+        {"id": "1", "type": 1, "permission": True},
+        {"id": "2", "type": 1, "permission": True},
+        {"id": "5", "type": 2, "permission": True},
+        {"id": "3", "type": 1, "permission": False},
+        {"id": "4", "type": 2, "permission": False},
+    ]
+    assert permissions.to_payload() is payload
+    assert CommandPermissions.from_payload(payload) == permissions
+
+
+@pytest.mark.parametrize("permissions, user, roles, allowed", [
+    (CommandPermissions(), 1, (), True),
+    (CommandPermissions(denied_users=[1]), 1, (), False),
+    (CommandPermissions(denied_users=[1], allowed_users=[1]), 1, (), False),
+    (CommandPermissions(allowed_users=[1], denied_roles=[10]), 1, (10,), True),
+    (CommandPermissions(denied_roles=[10]), 1, (10, 11), False),
+    (CommandPermissions(denied_roles=[10]), 1, (11,), True),
+    (CommandPermissions(allowed_roles=[10]), 1, (11,), False),
+    (CommandPermissions(allowed_roles=[10]), 1, (10,), True),
+    (CommandPermissions(allowed_users=[2]), 1, (), False),
+])
+def test_allows(permissions, user, roles, allowed):
+    assert permissions.allows(user, roles) is allowed
+
+
+def test_enforced_before_invoking():
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+    calls = []
+
+    @bot.slashcommand(name="admin", description="Admins only")
+    @appcommands.whitelist_users(1)
+    @appcommands.blacklist_users(2)
+    async def admin(ctx):
+        calls.append(ctx.author.id)
+        await ctx.send("ok")
+
+    assert admin.permissions == CommandPermissions(allowed_users=[1], denied_users=[2])
+    asyncio.run(TestClient(bot, author=discord.Object(1)).slash("admin"))
+    for user in (2, 3):
+        with pytest.raises(appcommands.CommandNotAllowed):
+            asyncio.run(TestClient(bot, author=discord.Object(user)).slash("admin"))
+    assert calls == [1]
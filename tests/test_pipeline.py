@@ -0,0 +1,93 @@
+import asyncio
+
+import discord
+import pytest
+
+import appcommands
+from appcommands.testing import TestClient
+
+
+@pytest.fixture
+def bot():
+    return appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def test_compiled_when_added(bot):
+    @bot.slashcommand(name="ping", description="Pong")
+    @appcommands.middleware(lambda ctx: None, kind="before")
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    @bot.slashcommand(name="plain", description="No middleware")
+    async def plain(ctx):
+        await ctx.send("ok")
+
+    assert ping._compiled[2] is not None
+    assert plain._compiled[2] is None
+
+
+def test_chain_order(bot):
+    order = []
+
+    @bot.app_middleware()
+    async def outer(ctx, call_next):
+        order.append("bot")
+        return await call_next(ctx)
+
+    group = bot.slashgroup(name="group", description="A group")
+    group.add_middleware(lambda ctx: order.append("group"), kind="before")
+
+    @group.subcommand(name="sub", description="A subcommand")
+    @appcommands.middleware(lambda ctx, error: order.append(("after", error)), kind="after")
+    async def sub(ctx):
+        order.append("command")
+        await ctx.send("ok")
+
+    asyncio.run(TestClient(bot).slash("group sub"))
+    assert order == ["bot", "group", "command", ("after", None)]
+
+
+def test_before_short_circuits(bot):
+    async def gate(ctx):
+        await ctx.send("nope")
+
+    @bot.slashcommand(name="ping", description="Pong")
+    @appcommands.middleware(gate, kind="before")
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    result = asyncio.run(TestClient(bot).slash("ping"))
+    assert [c.args for c in result.sent] == [("nope",)]
+
+
+def test_after_gets_error(bot):
+    errors = []
+
+    @bot.slashcommand(name="boom", description="Fails")
+    @appcommands.middleware(lambda ctx, error: errors.append(error), kind="after")
+    async def boom(ctx):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(TestClient(bot).slash("boom"))
+    assert [type(e) for e in errors] == [ValueError]
+
+
+def test_recompiled_after_remove(bot):
+    order = []
+
+    def before(ctx):
+        order.append("before")
+
+    bot.add_app_middleware(before, kind="before")
+
+    @bot.slashcommand(name="ping", description="Pong")
+    async def ping(ctx):
+        await ctx.send("pong")
+
+    client = TestClient(bot)
+    asyncio.run(client.slash("ping"))
+    bot.remove_app_middleware(before)
+    asyncio.run(client.slash("ping"))
+    assert order == ["before"]
+    assert ping._compiled[2] is None
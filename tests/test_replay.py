@@ -0,0 +1,65 @@
+import asyncio
+import gzip
+import json
+
+import discord
+import pytest
+
+import appcommands
+
+
+def interaction(name, id):
+    return {
+        "id": str(id),
+        "application_id": "9",
+        "type": 2,
+        "token": "token",
+        "version": 1,
+        "channel_id": "3",
+        "user": {"id": "2", "username": "user", "discriminator": "0001", "avatar": None},
+        "data": {"id": "0", "name": name, "type": 1},
+    }
+
+
+@pytest.fixture
+def replay(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as fp:
+        for i, name in enumerate(["ok", "boom", "ok", "boom"]):
+            fp.write(json.dumps({"t": i, "d": interaction(name, i + 1)}) + "\n")
+
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+    @bot.slashcommand(name="ok", description="Succeeds")
+    async def ok(ctx):
+        pass
+
+    @bot.slashcommand(name="boom", description="Fails on purpose")
+    async def boom(ctx):
+        raise ValueError("boom")
+
+    async def main():
+        await bot._async_setup_hook()
+        bot._store_app_command(1, ok)
+        bot._store_app_command(2, boom)
+        replayer = await appcommands.InteractionReplayer(bot, path, speed=None).run()
+        # lets the default error handler run
+        await asyncio.sleep(0)
+        return replayer
+
+    return bot, main
+
+
+def test_errors_counted(replay):
+    bot, main = replay
+    replayer = asyncio.run(main())
+    assert replayer.dispatched == 4
+    assert [type(e) for e in replayer.errors] == [ValueError, ValueError]
+    assert not bot.extra_events.get("on_app_command_error")
+    assert "_dispatch_app_command_error" not in vars(bot)
+
+
+def test_tracebacks_still_printed(replay, capsys):
+    bot, main = replay
+    asyncio.run(main())
+    assert capsys.readouterr().err.count("ValueError: boom") == 2
@@ -0,0 +1,63 @@
+import discord
+
+import appcommands
+
+
+async def _callback(ctx, text: str, channel: discord.abc.GuildChannel = None):
+    pass
+
+
+def make(name):
+    return appcommands.slashcommand(name=name, description="A command")(_callback)
+
+
+def test_cached_until_changed():
+    cmd = make("a")
+    data = cmd.to_dict()
+    assert cmd.to_dict() is data
+    assert cmd.to_bytes() is cmd.to_bytes()
+
+
+def test_id_doesnt_invalidate():
+    cmd = make("a")
+    data = cmd.to_dict()
+    cmd.id = 1234
+    assert cmd.to_dict() is data
+
+
+def test_option_change_reaches_only_its_command():
+    first, second = make("a"), make("b")
+    first_data, second_data = first.to_dict(), second.to_dict()
+
+    first.options[0].description = "Changed"
+    assert first.to_dict() is not first_data
+    assert first.to_dict()["options"][0]["description"] == "Changed"
+    assert second.to_dict() is second_data
+
+
+def test_new_subcommand_is_noticed():
+    group = appcommands.slashgroup(name="group", description="A group")
+
+    @group.subcommand(name="one", description="First")
+    async def one(ctx):
+        pass
+
+    data = group.to_dict()
+    assert len(data["options"]) == 1
+
+    @group.subcommand(name="two", description="Second")
+    async def two(ctx):
+        pass
+
+    assert [o["name"] for o in group.to_dict()["options"]] == ["one", "two"]
+
+
+def test_in_place_change_needs_invalidate():
+    cmd = make("a")
+    option = cmd.options[1]
+    option.channel_types = [discord.ChannelType.text]
+    cmd.to_dict()
+
+    option.channel_types.append(discord.ChannelType.voice)
+    option.invalidate()
+    assert cmd.to_dict()["options"][1]["channel_types"] == [0, 2]
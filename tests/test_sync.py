@@ -0,0 +1,146 @@
+import asyncio
+import json
+import types
+
+import discord
+
+import appcommands
+from appcommands.sync import PermissionSync
+
+
+PAYLOAD = [{"id": "5", "permissions": [{"id": "1", "type": 1, "permission": True}]}]
+
+
+class FakeHTTP:
+    def __init__(self, current=None, failing=()):
+        self.current = current or {}
+        self.failing = failing
+        self.calls = []
+
+    async def get_guild_application_command_permissions(self, application_id, guild_id):
+        self.calls.append(("get", guild_id))
+        return self.current.get(guild_id, [])
+
+    async def bulk_edit_guild_application_command_permissions(self, application_id, guild_id, data):
+        if guild_id in self.failing:
+            raise RuntimeError("boom")
+        self.calls.append(("put", guild_id))
+        self.current[guild_id] = data
+
+
+def fake_bot(http):
+    dispatched = []
+    bot = types.SimpleNamespace(
+        http=http,
+        user=types.SimpleNamespace(id=9),
+        dispatch=lambda event, *args: dispatched.append((event, *args))
+    )
+    return bot, dispatched
+
+
+def sync(permission_sync, bot, payloads):
+    summary = {"permissions_edited": [], "permissions_unchanged": [], "permissions_failed": {}}
+    asyncio.run(permission_sync.sync(bot, payloads, summary))
+    return summary
+
+
+def test_unchanged_after_restart(tmp_path):
+    path = str(tmp_path / "permissions.json")
+    http = FakeHTTP()
+    bot, _ = fake_bot(http)
+
+    assert sync(PermissionSync(path=path), bot, {1: PAYLOAD})["permissions_edited"] == [1]
+    http.calls.clear()
+
+    # a new instance, as after a restart
+    summary = sync(PermissionSync(path=path), bot, {1: PAYLOAD})
+    assert summary["permissions_unchanged"] == [1]
+    assert http.calls == []
+
+
+def test_matching_permissions_fetched_not_edited():
+    http = FakeHTTP(current={1: PAYLOAD})
+    bot, _ = fake_bot(http)
+
+    summary = sync(PermissionSync(), bot, {1: PAYLOAD})
+    assert summary["permissions_unchanged"] == [1]
+    assert http.calls == [("get", 1)]
+
+
+def test_changed_permissions_edited(tmp_path):
+    path = str(tmp_path / "permissions.json")
+    http = FakeHTTP()
+    bot, _ = fake_bot(http)
+    sync(PermissionSync(path=path), bot, {1: PAYLOAD})
+    http.calls.clear()
+
+    changed = [{"id": "5", "permissions": [{"id": "1", "type": 1, "permission": False}]}]
+    summary = sync(PermissionSync(path=path), bot, {1: changed})
+    assert summary["permissions_edited"] == [1]
+    assert http.calls == [("put", 1)]
+
+
+def test_failure_dispatched(capsys):
+    http = FakeHTTP(failing=(3,))
+    bot, dispatched = fake_bot(http)
+
+    summary = sync(PermissionSync(), bot, {3: PAYLOAD})
+    assert list(summary["permissions_failed"]) == [3]
+    assert [(event, guild_id) for event, guild_id, _ in dispatched] == [("guild_permissions_sync_fail", 3)]
+
+
+def test_broken_state_ignored(tmp_path, capsys):
+    path = tmp_path / "permissions.json"
+    path.write_text("{not json")
+    http = FakeHTTP()
+    bot, _ = fake_bot(http)
+
+    assert sync(PermissionSync(path=str(path)), bot, {1: PAYLOAD})["permissions_edited"] == [1]
+    assert "1" in json.loads(path.read_text())
+
+
+def test_bot_permission_state(tmp_path):
+    path = str(tmp_path / "permissions.json")
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none(), permission_state=path)
+    assert bot._permission_sync.path == path
+
+
+def test_failed_upsert_keeps_permissions(tmp_path, capsys):
+    path = tmp_path / "permissions.json"
+    state = {"1": {"5": "00" * 16}}
+    path.write_text(json.dumps(state))
+
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none(), permission_state=str(path))
+    http = FakeHTTP()
+
+    async def get_global_commands(application_id):
+        return []
+
+    async def bulk_upsert_guild_commands(application_id, guild_id, payload):
+        raise RuntimeError("boom")
+
+    async def bulk_upsert_global_commands(application_id, payload):
+        return []
+
+    async def fetch_guilds(limit=None):
+        yield types.SimpleNamespace(id=1)
+
+    http.get_global_commands = get_global_commands
+    http.bulk_upsert_guild_commands = bulk_upsert_guild_commands
+    http.bulk_upsert_global_commands = bulk_upsert_global_commands
+    bot.http = http
+    bot.fetch_guilds = fetch_guilds
+    bot._connection.user = types.SimpleNamespace(id=9)
+    dispatched = []
+    bot.dispatch = lambda event, *args: dispatched.append(event)
+
+    @bot.slashcommand(name="ping", description="Pong", guild_ids=[1])
+    async def ping(ctx):
+        pass
+
+    summary = asyncio.run(bot.register_commands())
+    assert summary.failed_guilds == [1]
+    assert summary.permissions_edited == summary.permissions_unchanged == []
+    assert http.calls == []
+    assert json.loads(path.read_text()) == state
+    assert dispatched == ["guild_command_register_fail"]
@@ -0,0 +1,173 @@
+import asyncio
+
+import discord
+import pytest
+from discord.ext.commands import BucketType
+
+import appcommands
+from appcommands.testing import TestClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def content(call):
+    return call.args[0] if call.args else call.kwargs.get("content")
+
+
+@pytest.fixture
+def bot():
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+    @bot.slashcommand(name="repeat", description="Repeats a text")
+    @appcommands.check(lambda ctx: ctx.author.id != 1)
+    @appcommands.cooldown(2, 60, BucketType.user)
+    async def repeat(ctx, text: str, times: int = 1):
+        await ctx.send(" ".join([text] * times))
+
+    return bot
+
+
+def test_options_are_converted(bot):
+    result = run(TestClient(bot).slash("repeat", text="hi", times=3))
+    assert [c.method for c in result.sent] == ["send_message"]
+    assert result.sent[0].args == ("hi hi hi",)
+    assert result.context.kwargs["times"] == 3
+
+
+def test_default_option(bot):
+    result = run(TestClient(bot).slash("repeat", text="hi"))
+    assert result.sent[0].args == ("hi",)
+
+
+def test_check_failure(bot):
+    client = TestClient(bot, author=discord.Object(1))
+    with pytest.raises(appcommands.CheckFailure):
+        run(client.slash("repeat", text="hi"))
+
+
+def test_cooldown(bot):
+    client = TestClient(bot)
+
+    async def main():
+        await client.slash("repeat", text="a")
+        await client.slash("repeat", text="b")
+        with pytest.raises(appcommands.CommandOnCooldown) as exc:
+            await client.slash("repeat", text="c")
+        return exc.value
+
+    error = run(main())
+    assert 0 < error.retry_after <= 30
+
+
+def test_unknown_command(bot):
+    with pytest.raises(LookupError):
+        run(TestClient(bot).slash("missing"))
+
+
+def test_bot_left_untouched(bot):
+    group = bot.slashgroup(name="group", description="A group")
+
+    @group.subcommand(name="sub", description="A subcommand")
+    async def sub(ctx):
+        await ctx.send("ok")
+
+    client = TestClient(bot)
+    run(client.slash("repeat", text="hi"))
+    result = run(client.slash("group sub"))
+    assert result.sent[0].args == ("ok",)
+    assert dict(bot.appcommands) == {}
+
+
+def test_cache_response(bot):
+    calls = []
+
+    @bot.slashcommand(name="docs", description="Shows docs")
+    @appcommands.cache_response(ttl=60)
+    async def docs(ctx, name: str):
+        calls.append(name)
+        await ctx.send(f"docs of {name}")
+
+    client = TestClient(bot)
+    results = [run(client.slash("docs", name=n)) for n in ("a", "a", "b")]
+    assert calls == ["a", "b"]
+    assert [content(r.sent[0]) for r in results] == ["docs of a", "docs of a", "docs of b"]
+    assert results[1].context.resolved_by == "cache"
+
+
+def flight_command(bot, callback):
+    @bot.slashcommand(name="stats", description="Shows stats")
+    @appcommands.single_flight()
+    async def stats(ctx, player: str):
+        return await callback(ctx, player)
+
+    return stats
+
+
+def test_single_flight_waiters_share(bot):
+    calls = []
+
+    async def callback(ctx, player):
+        calls.append(player)
+        await asyncio.sleep(0.01)
+        await ctx.send(f"stats of {player}")
+
+    stats = flight_command(bot, callback)
+    client = TestClient(bot)
+
+    async def main():
+        return await asyncio.gather(*(client.slash("stats", player="a") for _ in range(3)))
+
+    results = run(main())
+    assert calls == ["a"]
+    assert [content(r.sent[0]) for r in results] == ["stats of a"] * 3
+    assert [r.context.resolved_by for r in results[1:]] == ["single_flight"] * 2
+    assert stats.single_flight.shared == 2
+    assert len(stats.single_flight) == 0
+
+
+def test_single_flight_leader_failure(bot):
+    calls = []
+
+    async def callback(ctx, player):
+        calls.append(player)
+        await asyncio.sleep(0.01)
+        raise ValueError("down")
+
+    stats = flight_command(bot, callback)
+    client = TestClient(bot)
+
+    async def main():
+        return await asyncio.gather(*(client.slash("stats", player="a") for _ in range(3)), return_exceptions=True)
+
+    results = run(main())
+    assert calls == ["a"]
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert len(stats.single_flight) == 0
+
+
+def test_single_flight_fallback_after_defer(bot):
+    calls = []
+
+    async def callback(ctx, player):
+        calls.append(player)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            # a view can't be shared with the waiters
+            await ctx.respond("leader", view=None)
+        else:
+            await ctx.respond("waiter")
+
+    stats = flight_command(bot, callback)
+    stats.single_flight.defer_after = 0.01
+    client = TestClient(bot)
+
+    async def main():
+        return await asyncio.gather(client.slash("stats", player="a"), client.slash("stats", player="a"))
+
+    leader, waiter = run(main())
+    assert calls == ["a", "a"]
+    assert [c.method for c in leader.sent] == ["send_message"]
+    assert [c.method for c in waiter.calls] == ["defer", "followup.send"]
+    assert content(waiter.sent[0]) == "waiter"
@@ -0,0 +1,76 @@
+import discord
+import pytest
+
+import appcommands
+from appcommands import Option, SlashCommand, SubCommandGroup
+from appcommands.enums import OptionType
+
+
+async def callback(ctx):
+    pass
+
+
+def slash(name="ping", description="Pong", options=(), guild_ids=None):
+    return SlashCommand(name=name, description=description, options=list(options), guild_ids=guild_ids, callback=callback)
+
+
+def messages(command):
+    return [(v.path, v.message) for v in appcommands.validate_command(command)]
+
+
+def test_valid():
+    assert appcommands.validate_command(slash(options=[Option("text", "Some text")])) == []
+
+
+def test_names_and_descriptions():
+    found = messages(slash(name="Ping", description="x" * 101))
+    assert ("Ping", "name 'Ping' must be lowercase") in found
+    assert ("Ping", "description must be 1-100 characters") in found
+    assert messages(slash(name="no spaces"))[0][1].startswith("name 'no spaces' must be")
+
+
+def test_options():
+    options = [
+        Option("optional", "Optional", required=False),
+        Option("required", "Required"),
+        Option("flag", "A flag", type=OptionType.BOOLEAN, choices=[appcommands.Choice("yes", True)]),
+        Option("count", "A count", type=OptionType.STRING, min_value=1),
+        Option("word", "A word", min_length=5, max_length=2),
+    ]
+    found = messages(slash(options=options))
+    assert ("ping:required", "required option after the optional option 'optional'") in found
+    assert ("ping:flag", "BOOLEAN options can't have choices") in found
+    assert ("ping:count", "min_value and max_value are only for INTEGER and FLOAT options") in found
+    assert ("ping:word", "min_length is larger than max_length") in found
+
+
+def test_too_many_options():
+    found = messages(slash(options=[Option(f"o{i}", "An option") for i in range(26)]))
+    assert ("ping", "has 26 options, at most 25 are allowed") in found
+
+
+def test_nested_groups():
+    group = SubCommandGroup("top", "Top")
+    middle = group.subcommandgroup("middle", "Middle")
+    # subcommandgroup refuses it, it can still be built by hand
+    bottom = SubCommandGroup("bottom", "Bottom", parent=middle)
+    middle.subcommands.append(bottom)
+    bottom.subcommand(name="leaf", description="Leaf")(callback)
+
+    assert ("top middle bottom", "groups can only be nested once") in messages(group)
+
+
+def test_duplicates():
+    found = appcommands.validate_commands([slash(), slash(), slash(guild_ids=[1])])
+    assert [(v.path, v.message) for v in found] == [("global", "command 'ping' is defined more than once")]
+
+
+def test_add_app_command_raises():
+    bot = appcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+    with pytest.raises(appcommands.CommandSchemaError) as exc:
+        @bot.slashcommand(name="Bad", description="Bad")
+        async def bad(ctx):
+            pass
+
+    assert [str(v) for v in exc.value.violations] == ["Bad: name 'Bad' must be lowercase"]
+    assert not bot.to_register